@@ -0,0 +1,5 @@
+"""
+Benchmark suite for redistypes.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
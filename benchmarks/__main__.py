@@ -0,0 +1,80 @@
+"""
+Command line interface of the benchmark suite.
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+"""
+
+import argparse
+import fnmatch
+import json
+import sys
+
+from .backend import redis_server
+from .cases import CASES, KEY_PREFIX, delete_keys
+from .runner import compare, run
+
+
+def _run(args):
+    """Run benchmarks and write JSON results."""
+    names = [name for name in CASES if fnmatch.fnmatch(name, args.filter)]
+    with redis_server(args.url) as (backend, redis_connection):
+        results = run(redis_connection, backend, names, args.size, args.repeat, args.number)
+        delete_keys(redis_connection)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+    else:
+        sys.stdout.write(output + '\n')
+    for name, result in results['results'].items():
+        sys.stderr.write('{0:<32} {1:>12.2f}us {2:>6} round trips {3:>8.1f} blocks/item\n'.format(
+            name, result['median'] * 1e6, result['round_trips'], result['blocks_per_item'],
+        ))
+    return 0
+
+
+def _compare(args):
+    """Print the comparison of two JSON results, return 1 if anything regressed."""
+    with open(args.baseline) as baseline, open(args.current) as current:
+        rows = compare(json.load(baseline), json.load(current), args.threshold)
+    for name, previous, median, ratio, regressed in rows:
+        sys.stdout.write('{0:<32} {1:>12.2f}us {2:>12.2f}us {3:>7.2f}x {4}\n'.format(
+            name, previous * 1e6, median * 1e6, ratio, 'REGRESSED' if regressed else '',
+        ))
+    return int(any(row[-1] for row in rows))
+
+
+def main(argv=None):
+    """Parse arguments and run the command."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='run benchmarks')
+    run_parser.add_argument(
+        '--url',
+        help=(
+            'Redis or memory://?latency=<s> URL, redis-server or memory by default; '
+            'only keys starting with {0!r} are written and deleted'.format(KEY_PREFIX)
+        ),
+    )
+    run_parser.add_argument('--filter', default='*', help='glob pattern of case names')
+    run_parser.add_argument('--size', type=int, default=1000, help='collection size')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--number', type=int, default=20, help='calls per repeat')
+    run_parser.add_argument('--output', help='JSON file, stdout by default')
+    run_parser.set_defaults(handler=_run)
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    compare_parser.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
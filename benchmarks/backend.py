@@ -0,0 +1,123 @@
+"""
+Redis backends for benchmarks.
+
+Spawns a local redis-server when the binary is available, otherwise falls back to the
+in-memory FakeRedis of the package. Connections count round trips and bytes sent to the
+server. FakeRedis is also used by 'memory://' URLs, e.g. 'memory://?latency=0.0005'
+simulating a round trip of half a millisecond.
+"""
+
+import shutil
+import socket
+import subprocess
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlparse
+
+import redis
+
+from redistypes.fake import FakeRedis
+
+
+class Counter(object):
+    """Number of round trips and bytes sent to the server."""
+
+    round_trips = 0
+    bytes_sent = 0
+
+    @classmethod
+    def snapshot(cls):
+        """Return current counter values."""
+        return cls.round_trips, cls.bytes_sent
+
+
+def _count_packed_command(send_packed_command):
+    """Wrap ``Connection.send_packed_command``: one call is one round trip."""
+    def wrapper(connection, command, *args, **kwargs):
+        Counter.round_trips += 1
+        if isinstance(command, (bytes, str)):
+            command = [command]
+        Counter.bytes_sent += sum(map(len, command))
+        return send_packed_command(connection, command, *args, **kwargs)
+    return wrapper
+
+
+def counting(client):
+    """Make connections of the ``client`` pool count round trips."""
+    pool = client.connection_pool
+    connection_class = pool.connection_class
+    pool.connection_class = type(
+        'Counting{0}'.format(connection_class.__name__),
+        (connection_class,),
+        {'send_packed_command': _count_packed_command(connection_class.send_packed_command)},
+    )
+    pool.disconnect()
+    return client
+
+
+class CountingFakeRedis(FakeRedis):
+    """FakeRedis adding its round trips to the Counter."""
+
+    def round_trip(self, *commands):
+        """Count the round trip by the Counter too."""
+        round_trips, bytes_sent = self.round_trips, self.bytes_sent
+        super(CountingFakeRedis, self).round_trip(*commands)
+        Counter.round_trips += self.round_trips - round_trips
+        Counter.bytes_sent += self.bytes_sent - bytes_sent
+
+
+def _memory_client(url):
+    """Return CountingFakeRedis with the latency given by the 'memory://' URL."""
+    query = parse_qs(urlparse(url).query)
+    return CountingFakeRedis(latency=float(query.get('latency', ['0'])[0]))
+
+
+def _free_port():
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(client, timeout=5):
+    """Wait until the server responds to PING."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return client.ping()
+        except redis.ConnectionError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@contextmanager
+def redis_server(url=None):
+    """
+    Yield a pair of the backend name and the counting Redis client.
+
+    Connects to ``url`` if given, spawns redis-server if it is installed, otherwise uses
+    FakeRedis.
+    """
+    if url is not None and url.startswith('memory://'):
+        yield 'memory', _memory_client(url)
+        return
+    if url is not None:
+        yield url, counting(redis.Redis.from_url(url))
+        return
+    binary = shutil.which('redis-server')
+    if binary is None:
+        yield 'memory', CountingFakeRedis()
+        return
+    port = _free_port()
+    process = subprocess.Popen(
+        [binary, '--port', str(port), '--save', '', '--appendonly', 'no'],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        client = counting(redis.Redis(port=port))
+        _wait_for(client)
+        yield 'redis-server', client
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,325 @@
+"""
+Benchmark cases.
+
+Each case is a setup function that accepts the Redis client and the collection size,
+prepares the data, and returns the operation to be timed with the argument to call it with.
+Cases only write keys starting with ``KEY_PREFIX``, which ``delete_keys`` removes, so other
+data of the database the benchmarks run against is left intact.
+"""
+
+import collections
+import subprocess
+import sys
+
+from redistypes import (
+    IRedisField,
+    IRedisListField,
+    NumericCodec,
+    RedisDict,
+    RedisList,
+    RedisPackedList,
+)
+from redistypes.pickling import dumps, dumps_many, loads, loads_many
+
+KEY_PREFIX = 'redistypes-benchmark:'
+KEY_NAME = KEY_PREFIX + 'key'
+OTHER_KEY_NAME = KEY_PREFIX + 'other'
+ITEM = 'benchmark item'
+PAYLOAD_SIZES = (16, 1024, 65536)
+
+CASES = collections.OrderedDict()
+
+
+def case(name):
+    """Register the decorated setup function as a benchmark case."""
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+def delete_keys(redis_connection):
+    """Delete the keys written by the cases."""
+    key_names = list(redis_connection.scan_iter(match=KEY_PREFIX + '*'))
+    if key_names:
+        redis_connection.delete(*key_names)
+
+
+def _items(size):
+    """Return a list of ``size`` distinct items."""
+    return ['{0}:{1}'.format(ITEM, index) for index in range(size)]
+
+
+@case('package.import')
+def package_import(redis_connection, size):
+    """Import the package in a new interpreter, which must not import redis-py."""
+    command = [sys.executable, '-c', 'import redistypes, sys; assert "redis" not in sys.modules']
+    return lambda _: subprocess.check_call(command), None
+
+
+@case('list.append')
+def list_append(redis_connection, size):
+    """Append an item to the list."""
+    return RedisList(redis_connection, KEY_NAME, []).append, ITEM
+
+
+@case('list.extend')
+def list_extend(redis_connection, size):
+    """Extend the list by ``size`` items."""
+    return RedisList(redis_connection, KEY_NAME, []).extend, _items(size)
+
+
+@case('list.iter')
+def list_iter(redis_connection, size):
+    """Iterate over the list of ``size`` items."""
+    return list, RedisList(redis_connection, KEY_NAME, _items(size))
+
+
+@case('list.filter')
+def list_filter(redis_connection, size):
+    """Select one item of the raw list of ``size`` items in Redis."""
+    redis_list = RedisList(redis_connection, KEY_NAME, _items(size), pickling=False)
+    return lambda item: redis_list.filter(prefix=item), _items(1)[0]
+
+
+@case('list.iter_prefetch')
+def list_iter_prefetch(redis_connection, size):
+    """Iterate over the list of ``size`` items, prefetching chunks."""
+    redis_list = RedisList(redis_connection, KEY_NAME, _items(size))
+    return lambda chunk_size: list(redis_list.iter_prefetch(chunk_size)), max(size // 10, 1)
+
+
+@case('list.getitem')
+def list_getitem(redis_connection, size):
+    """Get the middle item of the list."""
+    redis_list = RedisList(redis_connection, KEY_NAME, _items(size))
+    return redis_list.__getitem__, size // 2
+
+
+@case('list.slice')
+def list_slice(redis_connection, size):
+    """Get a slice of ten items from the middle of the list."""
+    redis_list = RedisList(redis_connection, KEY_NAME, _items(size))
+    return redis_list.__getitem__, slice(size // 2, size // 2 + 10)
+
+
+@case('list.contains')
+def list_contains(redis_connection, size):
+    """Look for the last item of the list."""
+    items = _items(size)
+    return RedisList(redis_connection, KEY_NAME, items).__contains__, items[-1]
+
+
+@case('packed.append')
+def packed_append(redis_connection, size):
+    """Append an item to the packed list."""
+    return RedisPackedList(redis_connection, KEY_NAME, []).append, ITEM
+
+
+@case('packed.iter')
+def packed_iter(redis_connection, size):
+    """Iterate over the packed list of ``size`` items."""
+    return list, RedisPackedList(redis_connection, KEY_NAME, _items(size))
+
+
+@case('packed.getitem')
+def packed_getitem(redis_connection, size):
+    """Get the middle item of the packed list."""
+    packed_list = RedisPackedList(redis_connection, KEY_NAME, _items(size))
+    return packed_list.__getitem__, size // 2
+
+
+@case('list.eq')
+def list_eq(redis_connection, size):
+    """Compare two equal lists of ``size`` items."""
+    items = _items(size)
+    return RedisList(redis_connection, KEY_NAME, items).__eq__, RedisList(
+        redis_connection, OTHER_KEY_NAME, items,
+    )
+
+
+@case('list.iter_floats')
+def list_iter_floats(redis_connection, size):
+    """Iterate over the list of ``size`` pickled floats."""
+    return list, RedisList(redis_connection, KEY_NAME, [float(index) for index in range(size)])
+
+
+@case('list.to_array')
+def list_to_array(redis_connection, size):
+    """Get the list of ``size`` packed floats as array."""
+    redis_list = RedisList(
+        redis_connection, KEY_NAME, [float(index) for index in range(size)], NumericCodec(),
+    )
+    return lambda _: redis_list.to_array(), None
+
+
+@case('dict.getitem')
+def dict_getitem(redis_connection, size):
+    """Get an item of the hash."""
+    redis_dict = RedisDict(redis_connection, KEY_NAME, dict.fromkeys(_items(size), ITEM))
+    return redis_dict.__getitem__, _items(1)[0]
+
+
+@case('dict.setitem')
+def dict_setitem(redis_connection, size):
+    """Set an item of the hash."""
+    redis_dict = RedisDict(redis_connection, KEY_NAME, {})
+    return lambda key: redis_dict.__setitem__(key, ITEM), ITEM
+
+
+@case('dict.copy')
+def dict_copy(redis_connection, size):
+    """Copy the hash with ``size`` items."""
+    redis_dict = RedisDict(redis_connection, KEY_NAME, dict.fromkeys(_items(size), ITEM))
+    return lambda _: redis_dict.copy(), None
+
+
+@case('dict.items')
+def dict_items(redis_connection, size):
+    """Iterate over the items view of the hash with ``size`` items."""
+    redis_dict = RedisDict(redis_connection, KEY_NAME, dict.fromkeys(_items(size), ITEM))
+    return lambda _: list(redis_dict.items()), None
+
+
+@case('dict.iter_items')
+def dict_iter_items(redis_connection, size):
+    """Iterate over the items view of the hash with ``size`` items, without getting its length."""
+    redis_dict = RedisDict(redis_connection, KEY_NAME, dict.fromkeys(_items(size), ITEM))
+    return lambda _: sum(1 for _ in redis_dict.items()), None
+
+
+@case('dict.eq')
+def dict_eq(redis_connection, size):
+    """Compare two equal hashes of ``size`` items."""
+    mapping = dict.fromkeys(_items(size), ITEM)
+    return RedisDict(redis_connection, KEY_NAME, mapping).__eq__, RedisDict(
+        redis_connection, OTHER_KEY_NAME, mapping,
+    )
+
+
+@case('dict.update')
+def dict_update(redis_connection, size):
+    """Update the hash with ``size`` items."""
+    return RedisDict(redis_connection, KEY_NAME, {}).update, dict.fromkeys(_items(size), ITEM)
+
+
+class _Field(IRedisField):
+    """IRedisField keeping the value under the benchmark key."""
+
+    def get_key_name(self, instance):
+        """Return the benchmark key name."""
+        return KEY_NAME
+
+
+class _ListField(_Field, IRedisListField):
+    """IRedisListField keeping the value under the benchmark key."""
+
+
+def _model(redis_connection):
+    """Return an instance of the model with benchmark descriptors."""
+    class Model(object):
+        field = _Field(redis_connection)
+        list_field = _ListField(redis_connection)
+
+    return Model()
+
+
+@case('descriptor.get')
+def descriptor_get(redis_connection, size):
+    """Get the value of the field."""
+    instance = _model(redis_connection)
+    instance.field = ITEM
+    return lambda _: instance.field, None
+
+
+def _key_template_case(cache_key_name):
+    """Register the case getting the value of the field named by the key template."""
+    def setup(redis_connection, size):
+        class Model(object):
+            field = IRedisField(
+                redis_connection,
+                key_template=KEY_PREFIX + '{cls}:{pk}:{field}',
+                cache_key_name=cache_key_name,
+            )
+
+        instance = Model()
+        instance.pk = 1
+        instance.field = ITEM
+        return lambda _: instance.field, None
+    case('descriptor.get[{0}]'.format('cached_key' if cache_key_name else 'template'))(setup)
+
+
+_key_template_case(cache_key_name=False)
+_key_template_case(cache_key_name=True)
+
+
+@case('descriptor.set')
+def descriptor_set(redis_connection, size):
+    """Set the value of the field."""
+    instance = _model(redis_connection)
+    return lambda value: setattr(instance, 'field', value), ITEM
+
+
+@case('descriptor.list_get')
+def descriptor_list_get(redis_connection, size):
+    """Get the list binding of a new model instance."""
+    return lambda _: _model(redis_connection).list_field, None
+
+
+@case('memory.list_bindings')
+def memory_list_bindings(redis_connection, size):
+    """Create ``size`` list bindings, to measure the memory per binding."""
+    key_names = _items(size)
+    return lambda _: [
+        RedisList(redis_connection, key_name, validate=False) for key_name in key_names
+    ], None
+
+
+def _memory_field_case(cache):
+    """Register the case accessing the list field of ``size`` model instances."""
+    def setup(redis_connection, size):
+        class Model(object):
+            list_field = _ListField(redis_connection, cache=cache)
+
+        def access(_):
+            instances = [Model() for _ in range(size)]
+            for instance in instances:
+                instance.list_field
+            return instances
+
+        return access, None
+    case('memory.list_field[{0}]'.format('cached' if cache else 'uncached'))(setup)
+
+
+_memory_field_case(cache=True)
+_memory_field_case(cache=False)
+
+
+def _pickling_case(payload_size):
+    """Register dumps and loads cases of the payload of ``payload_size`` bytes."""
+    payload = 'x' * payload_size
+    case('pickling.dumps[{0}]'.format(payload_size))(lambda *args: (dumps, payload))
+    case('pickling.loads[{0}]'.format(payload_size))(lambda *args: (loads, dumps(payload)))
+
+
+for _payload_size in PAYLOAD_SIZES:
+    _pickling_case(_payload_size)
+
+
+def _batch_pickling_case(kind, make_values):
+    """Register cases pickling and unpickling ``size`` values one by one and by batches."""
+    def register(name, fn, encode):
+        def setup(redis_connection, size):
+            values = make_values(size)
+            return fn, encode(values)
+        case('pickling.{0}[{1}]'.format(name, kind))(setup)
+
+    register('map_dumps', lambda values: list(map(dumps, values)), list)
+    register('dumps_many', dumps_many, list)
+    register('map_loads', lambda values: list(map(loads, values)), dumps_many)
+    register('loads_many', loads_many, dumps_many)
+
+
+_batch_pickling_case('float', lambda size: [index / 3 for index in range(size)])
+_batch_pickling_case('str', _items)
+_batch_pickling_case('int', lambda size: list(range(size)))
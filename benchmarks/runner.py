@@ -0,0 +1,103 @@
+"""Running benchmark cases and comparing their results."""
+
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from .backend import Counter
+from .cases import CASES, delete_keys
+
+
+def _commit():
+    """Return the current git commit hash or None."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case(setup, redis_connection, size, repeat, number):
+    """
+    Run the case ``repeat`` times by ``number`` calls.
+
+    Returns the dictionary with the best and the median time per call in seconds, the
+    number of round trips and bytes sent per call, and the allocations of a call per item.
+    Keys left by the previous case are deleted first.
+    """
+    delete_keys(redis_connection)
+    operation, argument = setup(redis_connection, size)
+    round_trips, bytes_sent = Counter.snapshot()
+    operation(argument)
+    round_trips, bytes_sent = Counter.round_trips - round_trips, Counter.bytes_sent - bytes_sent
+    blocks, peak = _allocations(operation, argument)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            operation(argument)
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        'best': min(timings),
+        'median': statistics.median(timings),
+        'round_trips': round_trips,
+        'bytes_sent': bytes_sent,
+        'blocks_per_item': blocks / max(size, 1),
+        'peak_bytes_per_item': peak / max(size, 1),
+    }
+
+
+def _allocations(operation, argument):
+    """
+    Return the memory blocks allocated by a call and alive with its result, and the peak size.
+
+    Allocations are traced by tracemalloc, which counts blocks allocated by Python only.
+    """
+    tracemalloc.start()
+    try:
+        result = operation(argument)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return sum(stat.count for stat in snapshot.statistics('filename')), peak
+
+
+def run(redis_connection, backend, names, size, repeat, number):
+    """Run the cases by ``names`` and return the results with the environment description."""
+    results = {}
+    for name in names:
+        results[name] = run_case(CASES[name], redis_connection, size, repeat, number)
+    return {
+        'meta': {
+            'commit': _commit(),
+            'backend': backend,
+            'python': platform.python_version(),
+            'size': size,
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Compare median timings and round trips of two runs.
+
+    Returns the list of rows (name, baseline median, current median, ratio, regressed).
+    A case regresses if it got slower by more than ``threshold`` (0.1 is 10%) or makes
+    more round trips.
+    """
+    rows = []
+    for name, result in sorted(current['results'].items()):
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        ratio = result['median'] / previous['median']
+        regressed = ratio > 1 + threshold or result['round_trips'] > previous['round_trips']
+        rows.append((name, previous['median'], result['median'], ratio, regressed))
+    return rows
@@ -2,16 +2,59 @@
 Redis native types for Python.
 
 Redis bindings is an attempt to bring Redis types into Python as native ones. It
-is based on redis-py and includes RedisList, IRedisField and IRedisListField.
+is based on redis-py and includes RedisList, RedisDict, RedisObject and their descriptors.
+
+Classes are imported lazily on the first access, so importing the package alone does not
+import redis-py or any optional backend.
 """
 
-from .bindings import RedisDict, RedisList
-from .descriptors import IRedisDictField, IRedisField, IRedisListField
+import sys
+from importlib import import_module
+
+# Modules defining the public names
+_MODULES = {
+    'RedisList': 'bindings',
+    'RedisDict': 'bindings',
+    'RedisObject': 'bindings',
+    'RedisPackedList': 'packed',
+    'IRedisField': 'descriptors',
+    'IRedisListField': 'descriptors',
+    'IRedisDictField': 'descriptors',
+    'IRedisObjectField': 'descriptors',
+    'NumericCodec': 'numeric',
+    'FakeRedis': 'fake',
+    'redis_memoize': 'memoize',
+    'TransformConflictError': 'transactions',
+    'TransformResult': 'transactions',
+}
 
 __all__ = [
     'RedisList',
     'RedisDict',
+    'RedisObject',
+    'RedisPackedList',
     'IRedisField',
     'IRedisListField',
     'IRedisDictField',
+    'IRedisObjectField',
+    'NumericCodec',
+    'FakeRedis',
+    'redis_memoize',
+    'TransformConflictError',
+    'TransformResult',
 ]
+
+
+def __getattr__(name):
+    """Import the module defining the public name, keep the name in the package."""
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    attribute = getattr(import_module('.' + module_name, __name__), name)
+    setattr(sys.modules[__name__], name, attribute)
+    return attribute
+
+
+def __dir__():
+    """Return names of the package including the ones not imported yet."""
+    return sorted(set(sys.modules[__name__].__dict__) | set(__all__))
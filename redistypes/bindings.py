@@ -1,71 +1,244 @@
-"""Provides RedisDict class."""
+"""Provides RedisList, RedisDict and RedisObject classes."""
 
-import collections
+from collections.abc import Iterable, Mapping, MutableMapping, MutableSequence
+from dataclasses import fields, is_dataclass
+from functools import partial
+from itertools import chain, repeat, zip_longest
+from uuid import uuid4
 
 from redis import ResponseError
 
-from .pickling import dumps, loads
+from .instrumentation import instrumented, instrumented_init, recorded
+from .pickling import decode_many, decode_mapping, encode_many, encode_mapping, get_codec
+from .prefetch import DEFAULT_DEPTH, prefetch
+from .scripting import DEFAULT_SCRIPT_CHUNK_SIZE, filter_hash, filter_list
+from .snapshots import (
+    DEFAULT_CHUNK_SIZE,
+    RedisDictSnapshot,
+    RedisListSnapshot,
+    iter_hash_chunks,
+    iter_list_chunks,
+)
+from .transactions import DEFAULT_BACKOFF, DEFAULT_RETRIES, TransformSteps, watch_transform
+from .views import RedisDictItemsView, RedisDictKeysView, RedisDictValuesView
 
 REDIS_TYPE_LIST = b'list'
 REDIS_TYPE_HASH = b'hash'
 REDIS_TYPE_NONE = b'none'
 
 UNDEFINED = object()
+MISSING = object()
 
+TOMBSTONE_PREFIX = b'redistypes:tombstone:'
+INDEX_ERRORS = ('index out of range', 'no such key')
+UNKNOWN_COMMAND = 'unknown command'
 
-class RedisList(object):
+
+class RedisList(MutableSequence):
     """
     Python binding to the Redis list type.
 
     Visit https://redis.io/commands#list to have better understanding.
 
+    Registered as ``MutableSequence``, but all its mixin methods are overridden by ones
+    making a single round trip (``insert`` in the middle of the list makes two), rather
+    than looping over items one by one.
+
     WARNING!
     The value returned by the index lookup is a *copy* of what is in Redis. As such,
     mutating a value in place *will not* be saved back to redis.
     """
 
-    def __init__(self, redis_connection, key_name, iterable=None, pickling=True):
+    __slots__ = ('redis', 'key_name', 'pickling', 'codec', 'maxlen')
+
+    @instrumented_init
+    def __init__(
+        self,
+        redis_connection,
+        key_name,
+        iterable=None,
+        pickling=True,
+        validate=True,
+        maxlen=None,
+    ):
         """
         Initialize RedisList.
 
         Bind to value in Redis by the given key name. Validates if the value stored in Redis
         is a list or None (empty). If ``iterable`` is given, replace stored in Redis value with
         the iterable.
+
+        Items are pickled if ``pickling`` is True, stored as they are if it is False, or
+        encoded by ``pickling`` itself if it is a codec object with ``dumps`` and ``loads``.
+
+        If ``validate`` is False, the type of the stored value is not checked, which saves a
+        round trip when the type is known, e.g. from SCAN with the TYPE option.
+
+        If ``maxlen`` is given, the list is capped: pushing items trims it to ``maxlen`` last
+        items (first ones for ``appendleft``) in the same round trip, as ``deque`` does.
         """
+        if maxlen is not None and maxlen < 1:
+            raise ValueError('maxlen must be positive')
         self.redis = redis_connection
+        self.pickling = pickling
+        self.codec = get_codec(pickling)
+        self.maxlen = maxlen
         if iterable is not None:
-            if not isinstance(iterable, collections.Iterable):
-                raise ValueError('values are not iterable')
-            pipe = self.redis.pipeline()
-            pipe.delete(key_name)
-            if iterable:
-                if pickling:
-                    iterable = map(dumps, iterable)
-                pipe.rpush(key_name, *iterable)
-            pipe.execute()
-        else:
-            key_type = self.redis.type(key_name)
-            if key_type not in (REDIS_TYPE_LIST, REDIS_TYPE_NONE):
-                raise TypeError('Cannot bind to "{0}"'.format(key_type))
+            self._replace(key_name, iterable)
+        elif validate:
+            _check_type(self.redis, key_name, REDIS_TYPE_LIST)
         self.key_name = key_name
-        self.pickling = pickling
 
+    def _replace(self, key_name, iterable):
+        """Replace the value stored by the key name with the iterable in a single round trip."""
+        if not isinstance(iterable, Iterable):
+            raise ValueError('values are not iterable')
+        pipe = self.redis.pipeline()
+        pipe.delete(key_name)
+        if iterable:
+            if self.pickling:
+                iterable = encode_many(self.codec, iterable)
+            pipe.rpush(key_name, *iterable)
+            if self.maxlen is not None:
+                pipe.ltrim(key_name, -self.maxlen, -1)
+        pipe.execute()
+
+    @instrumented
     def append(self, value):
         """Append value to the end of list."""
         if self.pickling:
-            value = dumps(value)
-        self.redis.rpush(self.key_name, value)
+            value = self.codec.dumps(value)
+        self._push([value])
 
+    @instrumented
+    def appendleft(self, value):
+        """Insert value at the beginning of list."""
+        if self.pickling:
+            value = self.codec.dumps(value)
+        self._push([value], left=True)
+
+    @instrumented
+    def clear(self):
+        """Remove all items from the list."""
+        self.redis.delete(self.key_name)
+
+    @instrumented
     def copy(self):
         """Return a copy of the list."""
         return list(self)
 
+    @instrumented
+    def count(self, value):
+        """Return the number of occurrences of value, found by a single LPOS."""
+        if self.pickling:
+            value = self.codec.dumps(value)
+        return len(self._lpos(value, count=0))
+
+    @instrumented
+    def diff(self, other, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return indices of items differing from items of the ``other`` RedisList.
+
+        Indices beyond the end of the shorter list are included. Items are fetched by
+        ``chunk_size`` per round trip, and only chunks differing as stored are decoded.
+        """
+        return list(self._iter_diff(other, chunk_size))
+
+    @instrumented
     def extend(self, iterable):
         """Extend list by appending elements from the iterable."""
         if self.pickling:
-            iterable = map(dumps, iterable)
-        self.redis.rpush(self.key_name, *iterable)
+            iterable = encode_many(self.codec, iterable)
+        self._push(iterable)
 
+    @instrumented
+    def filter(
+        self, prefix=None, substring=None, path=None, chunk_size=DEFAULT_SCRIPT_CHUNK_SIZE,
+    ):
+        """
+        Return items starting with ``prefix`` and containing ``substring``, selected in Redis.
+
+        If ``path`` is given (keys and indices separated by dots, e.g. 'user.tags.0'), items
+        are decoded as JSON and values at the path are returned, decoded, instead of items;
+        items without the path are skipped. Items are processed by a Lua script,
+        ``chunk_size`` items per call. Requires ``pickling=False``.
+        """
+        return filter_list(self, prefix, substring, path, chunk_size)
+
+    @instrumented
+    def index(self, value, start=0, stop=None):
+        """
+        Return first index of value.
+
+        The value is found by LPOS, or among items fetched by a single LRANGE if ``start`` or
+        ``stop`` is given. Raises ValueError if the value is not present.
+        """
+        if self.pickling:
+            value = self.codec.dumps(value)
+        if start == 0 and stop is None:
+            position = self._lpos(value)
+        else:
+            position = self._index_in_range(value, start, stop)
+        if position is None:
+            raise ValueError('value not in list')
+        return position
+
+    @instrumented
+    def insert(self, index, value):
+        """
+        Insert value before index.
+
+        Inserting at the beginning makes a single LPUSH. Otherwise the item at the index is
+        read and the value is inserted before it inside WATCH/MULTI/EXEC.
+        """
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        if self.pickling:
+            value = self.codec.dumps(value)
+        if index == 0:
+            self._push([value], left=True)
+            return
+        steps = TransformSteps(
+            read=partial(self._read_insert_location, index),
+            fn=_identity,
+            write=partial(self._write_insert, value),
+        )
+        watch_transform(self.redis, self.key_name, steps, DEFAULT_RETRIES, DEFAULT_BACKOFF)
+
+    def _read_insert_location(self, index, pipe):
+        """Return the position to insert at and the item there, None at the ends."""
+        length = pipe.llen(self.key_name)
+        if index < 0:
+            index += length
+        position = min(max(index, 0), length)
+        if position in {0, length}:
+            return position, None
+        return position, pipe.lindex(self.key_name, position)
+
+    def _write_insert(self, value, pipe, location):
+        """Queue inserting the stored value before the item at the position."""
+        position, pivot = location
+        if pivot is None:
+            self._queue_push(pipe, [value], left=position == 0)
+        else:
+            tombstone = _tombstone()
+            pipe.lset(self.key_name, position, tombstone)
+            pipe.linsert(self.key_name, 'BEFORE', tombstone, value)
+            pipe.lset(self.key_name, position + 1, pivot)
+            if self.maxlen is not None:
+                pipe.ltrim(self.key_name, -self.maxlen, -1)
+
+    @instrumented
+    def last(self, n):
+        """Return ``n`` last items, fetched by a single bounded LRANGE."""
+        if n <= 0:
+            return []
+        items = self.redis.lrange(self.key_name, -n, -1)
+        if self.pickling:
+            items = decode_many(self.codec, items)
+        return items
+
+    @instrumented
     def remove(self, value):
         """
         Remove first occurrence of value.
@@ -73,27 +246,252 @@ class RedisList(object):
         Raises ValueError if the value is not present.
         """
         if self.pickling:
-            value = dumps(value)
+            value = self.codec.dumps(value)
         if not self.redis.lrem(self.key_name, 1, value):
             raise ValueError('value not in list')
 
-    def pop(self):
+    @instrumented
+    def pop(self, index=-1):
         """
-        Remove and return last item.
+        Remove and return item at index (default last).
 
-        Raises IndexError if list is empty.
+        Raises IndexError if list is empty or index is out of range.
         """
-        item = self.redis.rpop(self.key_name)
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        item = self._pop_raw(index)
+        if self.pickling:
+            item = self.codec.loads(item)
+        return item
+
+    def _pop_raw(self, index):
+        """Remove and return the stored item at index, popping it if it is at an end."""
+        if index == -1:
+            item = self.redis.rpop(self.key_name)
+        elif index == 0:
+            item = self.redis.lpop(self.key_name)
+        else:
+            item = self._delete_at(index)
+            if item is None:
+                raise IndexError('pop index out of range')
         if item is None:
             raise IndexError('pop from empty list')
+        return item
+
+    @instrumented
+    def reverse(self):
+        """Reverse the list in place, rewriting it inside WATCH/MULTI/EXEC."""
+        steps = TransformSteps(
+            read=partial(_lrange_all, self.key_name), fn=_reversed, write=self._write_all,
+        )
+        watch_transform(self.redis, self.key_name, steps, DEFAULT_RETRIES, DEFAULT_BACKOFF)
+
+    @instrumented
+    def extend_from_array(self, values):
+        """
+        Extend list by numbers of an array, a NumPy array or any iterable.
+
+        Numbers are packed all at once. Requires the numeric codec. The capped list is
+        trimmed to ``maxlen`` last items, as ``extend`` does.
+        """
+        values = self._array_codec().dumps_array(values)
+        if values:
+            self._push(values)
+
+    @instrumented
+    def to_array(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return items as ``array.array``.
+
+        Items are fetched and unpacked by chunks. Requires the numeric codec.
+        """
+        codec = self._array_codec()
+        values = codec.loads_array([])
+        for chunk in iter_list_chunks(self, chunk_size):
+            codec.loads_array(chunk, values)
+        return values
+
+    @instrumented
+    def to_numpy(self, dtype=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return items as NumPy array converted to ``dtype`` if given.
+
+        Items are fetched by chunks and unpacked all at once. Requires the numeric codec and
+        NumPy installed.
+        """
+        codec = self._array_codec()
+        values = []
+        for chunk in iter_list_chunks(self, chunk_size):
+            values.extend(chunk)
+        return codec.loads_numpy(values, dtype)
+
+    def iter_prefetch(self, chunk_size=DEFAULT_CHUNK_SIZE, depth=DEFAULT_DEPTH, executor=None):
+        """
+        Return an iterator over items fetching the next chunks while decoding the current one.
+
+        Items are fetched by ``chunk_size`` per round trip in a background thread, at most
+        ``depth`` chunks ahead. Chunks are unpickled in the calling thread, or by ``executor``
+        (e.g. ``ProcessPoolExecutor``) if given. Unlike ``iter``, which fetches the whole list
+        at once, items appended or removed during iteration may be skipped or repeated.
+        """
+        decode = partial(decode_many, self.codec) if self.pickling else None
+        return chain.from_iterable(
+            prefetch(iter_list_chunks(self, chunk_size), decode, depth, executor),
+        )
+
+    def snapshot(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return a read-only local copy of the list.
+
+        Items are fetched by ``chunk_size`` per round trip. Reading the snapshot makes no
+        round trips, ``refresh`` fetches only items appended since.
+        """
+        return RedisListSnapshot(self, chunk_size)
+
+    @instrumented
+    def transform(self, index, fn, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+        """
+        Replace item by index with ``fn(item)`` atomically.
+
+        Since the item is a copy, mutating it has to be saved back. The item is read and
+        written inside WATCH/MULTI/EXEC, so if the list is modified concurrently, the
+        transform is retried at most ``retries`` times. Returns TransformResult with the
+        new item and the number of conflicts.
+
+        Raises IndexError if the index is out of range, TransformConflictError if retries
+        are exhausted.
+        """
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        steps = TransformSteps(
+            read=partial(self._read_item, index),
+            fn=fn,
+            write=partial(self._write_item, index),
+        )
+        return watch_transform(self.redis, self.key_name, steps, retries, backoff)
+
+    def _write_all(self, pipe, items):
+        """Queue replacing all stored items of the list to the transaction."""
+        pipe.delete(self.key_name)
+        if items:
+            pipe.rpush(self.key_name, *items)
+
+    def _index_in_range(self, value, start, stop):
+        """Return the first index of the stored value among items fetched by LRANGE, or None."""
+        items = self.redis.lrange(self.key_name, 0, -1)
+        if stop is None:
+            stop = len(items)
+        try:
+            return items.index(value, start, stop)
+        except ValueError:
+            return None
+
+    def _lpos(self, value, count=None):
+        """
+        Return the position of the stored value by LPOS, or positions if ``count`` is given.
+
+        Servers without LPOS (before Redis 6.0.6) reply "unknown command", then positions are
+        found among items fetched by a single LRANGE.
+        """
+        try:
+            return self.redis.lpos(self.key_name, value, count=count)
+        except ResponseError as e:
+            if UNKNOWN_COMMAND not in str(e):
+                raise e
+        items = self.redis.lrange(self.key_name, 0, -1)
+        positions = (position for position, item in enumerate(items) if item == value)
+        if count is None:
+            return next(positions, None)
+        return list(positions)
+
+    def _array_codec(self):
+        """Return the codec, raises TypeError if it cannot pack arrays."""
+        if getattr(self.codec, 'dumps_array', None) is None:
+            raise TypeError('{0!r} does not support arrays'.format(self.codec))
+        return self.codec
+
+    def _read_item(self, index, pipe):
+        """Return the item by index read by the watching pipeline."""
+        item = pipe.lindex(self.key_name, index)
+        if item is None:
+            raise IndexError('list index out of range')
+        if self.pickling:
+            item = self.codec.loads(item)
+        return item
+
+    def _write_item(self, index, pipe, value):
+        """Queue setting the item by index to the transaction."""
         if self.pickling:
-            item = loads(item)
+            value = self.codec.dumps(value)
+        pipe.lset(self.key_name, index, value)
+
+    def _delete_at(self, index):
+        """
+        Remove the stored item by index in one transaction, return it or None if out of range.
+
+        Redis cannot remove by index, so the item is replaced with a unique tombstone, which
+        is removed by LREM.
+        """
+        tombstone = _tombstone()
+        pipe = self.redis.pipeline()
+        pipe.lindex(self.key_name, index)
+        pipe.lset(self.key_name, index, tombstone)
+        pipe.lrem(self.key_name, 1, tombstone)
+        try:
+            item = pipe.execute()[0]
+        except ResponseError as e:
+            if str(e).endswith(INDEX_ERRORS):
+                return None
+            raise e
         return item
 
+    def _push(self, items, left=False):
+        """Push stored items to the end or the beginning, trimming the capped list."""
+        items = list(items)
+        if not items:
+            return
+        if self.maxlen is None:
+            push = self.redis.lpush if left else self.redis.rpush
+            push(self.key_name, *items)
+            return
+        pipe = self.redis.pipeline()
+        self._queue_push(pipe, items, left)
+        pipe.execute()
+
+    def _queue_push(self, pipe, items, left=False):
+        """Queue pushing stored items to the pipeline, trimming the capped list."""
+        if not items:
+            return
+        if left:
+            pipe.lpush(self.key_name, *items)
+            if self.maxlen is not None:
+                pipe.ltrim(self.key_name, 0, self.maxlen - 1)
+        else:
+            pipe.rpush(self.key_name, *items)
+            if self.maxlen is not None:
+                pipe.ltrim(self.key_name, -self.maxlen, -1)
+
+    def _iter_diff(self, other, chunk_size):
+        """Yield indices of items differing from items of the ``other`` list."""
+        other = recorded(other)
+        start = 0
+        chunks = zip_longest(
+            iter_list_chunks(self, chunk_size), iter_list_chunks(other, chunk_size), fillvalue=[],
+        )
+        for chunk, other_chunk in chunks:
+            if chunk != other_chunk or self.codec is not other.codec:
+                for offset in _diff_offsets(self, chunk, other, other_chunk):
+                    yield start + offset
+            start += chunk_size
+
+    @instrumented
     def __contains__(self, item):
-        """Return True if the list has an item ``item``, else False."""
-        return item in list(self)
+        """Return True if the list has an item ``item``, else False, found by LPOS."""
+        if self.pickling:
+            item = self.codec.dumps(item)
+        return self._lpos(item) is not None
 
+    @instrumented
     def __getitem__(self, index):
         """
         Get item by index, or slice from list.
@@ -105,7 +503,7 @@ class RedisList(object):
             if item is None:
                 raise IndexError('list index out of range')
             if self.pickling:
-                item = loads(item)
+                item = self.codec.loads(item)
             return item
         elif isinstance(index, slice):
             items = list(self)
@@ -114,6 +512,7 @@ class RedisList(object):
         else:
             raise TypeError('invalid index type')
 
+    @instrumented
     def __setitem__(self, index, value):
         """
         Set item to list by index.
@@ -123,7 +522,7 @@ class RedisList(object):
         if not isinstance(index, int):
             raise TypeError('invalid index type')
         if self.pickling:
-            value = dumps(value)
+            value = self.codec.dumps(value)
         try:
             self.redis.lset(self.key_name, index, value)
         except ResponseError as e:
@@ -131,6 +530,19 @@ class RedisList(object):
                 raise IndexError('list assignment index out of range')
             raise e
 
+    @instrumented
+    def __delitem__(self, index):
+        """
+        Remove item from list by index in a single transaction.
+
+        x.__delitem__(index) <==> del x[index]
+        """
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        if self._delete_at(index) is None:
+            raise IndexError('list assignment index out of range')
+
+    @instrumented
     def __len__(self):
         """
         Return length of the list.
@@ -139,6 +551,7 @@ class RedisList(object):
         """
         return self.redis.llen(self.key_name)
 
+    @instrumented
     def __iter__(self):
         """
         Return an iterator object.
@@ -147,19 +560,32 @@ class RedisList(object):
         """
         items = self.redis.lrange(self.key_name, 0, -1)
         if self.pickling:
-            items = list(map(loads, items))
+            items = decode_many(self.codec, items)
         return iter(items)
 
+    @instrumented
+    def __reversed__(self):
+        """Return a reverse iterator over items, fetched by a single LRANGE."""
+        return reversed(list(self))
+
+    @instrumented
     def __eq__(self, other):
         """
         Compare self RedisList with other object.
 
+        Lengths are compared first, then items by chunks until the first difference.
+
         x.__eq__(y) <==> x==y
         """
-        if isinstance(other, self.__class__):
-            return self.key_name == other.key_name or list(self) == list(other)
-        return False
-
+        if not isinstance(other, self.__class__):
+            return False
+        if self.key_name == other.key_name:
+            return True
+        if len(self) != len(other):
+            return False
+        return next(self._iter_diff(other, DEFAULT_CHUNK_SIZE), None) is None
+
+    @instrumented
     def __repr__(self):
         """
         Return string representation of the RedisList object.
@@ -169,12 +595,15 @@ class RedisList(object):
         return '{0}: {1}'.format(self.__class__.__name__, list(self))
 
 
-class RedisDict(object):
+class RedisDict(MutableMapping):
     """
     Python binding to the Redis hash type.
 
     Visit https://redis.io/commands#hash to have better understanding.
 
+    Registered as ``MutableMapping``, but all its mixin methods are overridden by ones
+    making a single round trip, rather than looping over items one by one.
+
     Unlike the dictionary in Python, the Redis hash does not preserve insertion order.
 
     WARNING!
@@ -182,42 +611,123 @@ class RedisDict(object):
     mutating a value in place *will not* be saved back to redis.
     """
 
-    def __init__(self, redis_connection, key_name, mapping=None, pickling=True):
+    __slots__ = ('redis', 'key_name', 'pickling', 'codec')
+
+    @instrumented_init
+    def __init__(self, redis_connection, key_name, mapping=None, pickling=True, validate=True):
         """
         Initialize RedisDict.
 
         Bind to value in Redis by the given key name. Validates if the value stored in Redis
         is a hash or None (empty). If ``mapping`` is given, replace stored in Redis value with
         the iterable.
+
+        Keys and values are pickled if ``pickling`` is True, stored as they are if it is False,
+        or encoded by ``pickling`` itself if it is a codec object with ``dumps`` and ``loads``.
+
+        If ``validate`` is False, the type of the stored value is not checked, which saves a
+        round trip when the type is known, e.g. from SCAN with the TYPE option.
         """
         self.redis = redis_connection
+        self.pickling = pickling
+        self.codec = get_codec(pickling)
         if mapping is not None:
-            if not isinstance(mapping, collections.Mapping):
-                raise ValueError('values are not mapping')
-            pipe = self.redis.pipeline()
-            pipe.delete(key_name)
-            if mapping:
-                if pickling:
-                    mapping = {
-                        dumps(k): dumps(v) for k, v in mapping.items()
-                    }
-                pipe.hmset(key_name, mapping)
-            pipe.execute()
-        else:
-            key_type = self.redis.type(key_name)
-            if key_type not in (REDIS_TYPE_HASH, REDIS_TYPE_NONE):
-                raise TypeError('Cannot bind to "{0}"'.format(key_type))
+            self._replace(key_name, mapping)
+        elif validate:
+            _check_type(self.redis, key_name, REDIS_TYPE_HASH)
         self.key_name = key_name
-        self.pickling = pickling
 
+    def _replace(self, key_name, mapping):
+        """Replace the value stored by the key name with the mapping in a single round trip."""
+        if not isinstance(mapping, Mapping):
+            raise ValueError('values are not mapping')
+        pipe = self.redis.pipeline()
+        pipe.delete(key_name)
+        if mapping:
+            if self.pickling:
+                mapping = encode_mapping(self.codec, mapping)
+            pipe.hset(key_name, mapping=mapping)
+        pipe.execute()
+
+    @instrumented
     def clear(self):
         """Remove all items from the hash."""
         self.redis.delete(self.key_name)
 
+    @instrumented
     def copy(self):
-        """Return a copy of the hash."""
-        return dict(self.items())
+        """
+        Return a copy of the hash.
+
+        Keys and values are fetched as two arrays by HKEYS and HVALS in a transaction and
+        zipped, which saves building a dictionary of the reply and another one of decoded
+        items.
+        """
+        pipe = self.redis.pipeline()
+        pipe.hkeys(self.key_name)
+        pipe.hvals(self.key_name)
+        keys, values = pipe.execute()
+        if self.pickling:
+            keys = decode_many(self.codec, keys)
+            values = decode_many(self.codec, values)
+        return dict(zip(keys, values))
+
+    @instrumented
+    def diff(self, other, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return the set of keys having different values in the ``other`` RedisDict or in one only.
+
+        Keys are scanned by about ``chunk_size`` per round trip, values of the same keys in
+        ``other`` are fetched by HMGET, and only values differing as stored are decoded.
+        """
+        keys = set()
+        fields = set()
+        for key, field in self._iter_diff(other, chunk_size):
+            if field is MISSING:
+                keys.add(key)
+            else:
+                fields.add(field)
+        other_fields = recorded(other).redis.hkeys(other.key_name)
+        for field in other_fields:
+            if field not in fields:
+                keys.add(other.codec.loads(field) if other.pickling else field)
+        return keys
+
+    @instrumented
+    def contains_many(self, keys):
+        """Return the dictionary mapping each of ``keys`` to True if it is in the hash."""
+        keys = list(keys)
+        fields = encode_many(self.codec, keys) if self.pickling else keys
+        pipe = self.redis.pipeline(transaction=False)
+        for field in fields:
+            pipe.hexists(self.key_name, field)
+        return dict(zip(keys, map(bool, pipe.execute())))
+
+    @instrumented
+    def delete_many(self, keys):
+        """Remove ``keys`` from the hash by a single HDEL, return the number of removed keys."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        if self.pickling:
+            keys = encode_many(self.codec, keys)
+        return self.redis.hdel(self.key_name, *keys)
+
+    @instrumented
+    def filter(
+        self, prefix=None, substring=None, path=None, chunk_size=DEFAULT_SCRIPT_CHUNK_SIZE,
+    ):
+        """
+        Return items with keys starting with ``prefix`` and containing ``substring`` as a dict.
+
+        If ``path`` is given (keys and indices separated by dots, e.g. 'user.tags.0'), values
+        are decoded as JSON and values at the path are returned, decoded; items without the
+        path are skipped. Items are selected in Redis: the hash is scanned by a Lua script,
+        about ``chunk_size`` items per call. Requires ``pickling=False``.
+        """
+        return filter_hash(self, prefix, substring, path, chunk_size)
 
+    @instrumented
     def get(self, key, default=None):
         """
         Return the value for ``key`` if ``key`` is in the dictionary, else ``default``.
@@ -230,22 +740,39 @@ class RedisDict(object):
         except KeyError:
             return default
 
+    @instrumented
+    def get_many(self, keys, default=None):
+        """
+        Return the dictionary of values for ``keys``, fetched by a single HMGET.
+
+        Keys missing in the hash are mapped to ``default``.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        fields = encode_many(self.codec, keys) if self.pickling else keys
+        values = self.redis.hmget(self.key_name, fields)
+        found = [value for value in values if value is not None]
+        found = iter(decode_many(self.codec, found) if self.pickling else found)
+        return {
+            key: default if value is None else next(found)
+            for key, value in zip(keys, values)
+        }
+
     def items(self):
-        """Return a copy of the hash’s items as ((key, value) pairs)."""
-        r_dict = self.redis.hgetall(self.key_name)
-        if self.pickling:
-            r_dict = {
-                loads(k): loads(v) for k, v in r_dict.items()
-            }
-        return list(r_dict.items())
+        """
+        Return a lazy view of the hash’s items as ((key, value) pairs).
+
+        Nothing is fetched until the view is used, see ``RedisDictItemsView``. Use ``copy``
+        to fetch all items at once.
+        """
+        return RedisDictItemsView(self)
 
     def keys(self):
-        """Return a copy of the hash’s keys."""
-        keys = self.redis.hkeys(self.key_name)
-        if self.pickling:
-            keys = list(map(loads, keys))
-        return keys
+        """Return a lazy view of the hash’s keys, see ``RedisDictKeysView``."""
+        return RedisDictKeysView(self)
 
+    @instrumented
     def pop(self, key, default=UNDEFINED):
         """
         If ``key`` is in the dictionary, remove it and return its value.
@@ -254,28 +781,59 @@ class RedisDict(object):
         """
         original_key = key
         if self.pickling:
-            key = dumps(key)
+            key = self.codec.dumps(key)
         pipe = self.redis.pipeline()
         pipe.hget(self.key_name, key)
         pipe.hdel(self.key_name, key)
-        item, _ = pipe.execute()
+        item = pipe.execute()[0]
         if item is None:
             if default is UNDEFINED:
                 raise KeyError(original_key)
             return default
         else:
             if self.pickling:
-                item = loads(item)
+                item = self.codec.loads(item)
             return item
 
+    @instrumented
     def popitem(self):
         """
         Remove and return a (key, value) pair from the hash.
 
-        Cannot be implemented by Redis means.
+        A field is found by HSCAN and removed by HDEL inside WATCH/MULTI/EXEC. Unlike dict,
+        the pair is not the last inserted one. Raises KeyError if the hash is empty.
         """
-        raise NotImplementedError
+        steps = TransformSteps(read=self._read_any_item, fn=_identity, write=self._write_hdel)
+        key, item = watch_transform(
+            self.redis, self.key_name, steps, DEFAULT_RETRIES, DEFAULT_BACKOFF,
+        ).value
+        if self.pickling:
+            return self.codec.loads(key), self.codec.loads(item)
+        return key, item
+
+    def _read_any_item(self, pipe):
+        """Return a stored (field, value) pair found by HSCAN of the watching pipeline."""
+        cursor = None
+        while cursor != 0:
+            cursor, fields = pipe.hscan(self.key_name, cursor or 0, count=1)
+            if fields:
+                return next(iter(fields.items()))
+        raise KeyError('popitem(): dictionary is empty')
+
+    def _write_hdel(self, pipe, item):
+        """Queue removing the field of the stored pair to the transaction."""
+        pipe.hdel(self.key_name, item[0])
+
+    @instrumented
+    def set_many(self, mapping):
+        """Set items of ``mapping`` by a single HSET, return the number of added keys."""
+        if not mapping:
+            return 0
+        if self.pickling:
+            mapping = encode_mapping(self.codec, mapping)
+        return self.redis.hset(self.key_name, mapping=mapping)
 
+    @instrumented
     def setdefault(self, key, default=None):
         """
         If ``key`` is in the hash, return its value.
@@ -283,47 +841,136 @@ class RedisDict(object):
         If not, insert key with a value of ``default`` and return ``default``.
         """
         if self.pickling:
-            key = dumps(key)
-            default = dumps(default)
+            key = self.codec.dumps(key)
+            default = self.codec.dumps(default)
         pipe = self.redis.pipeline()
         pipe.hsetnx(self.key_name, key, default)
         pipe.hget(self.key_name, key)
         _, item = pipe.execute()
         if self.pickling:
-            item = loads(item)
+            item = self.codec.loads(item)
         return item
 
-    def update(self, other):
+    def iter_prefetch(self, chunk_size=DEFAULT_CHUNK_SIZE, depth=DEFAULT_DEPTH, executor=None):
         """
-        Update the dictionary with the key/value pairs from ``other``.
+        Return an iterator over (key, value) pairs fetching the next chunk while decoding.
 
-        Overwrites existing keys. Returns None.
+        Items are fetched by HSCAN of about ``chunk_size`` items per round trip in a
+        background thread, at most ``depth`` chunks ahead. Chunks are unpickled in the calling
+        thread, or by ``executor`` (e.g. ``ProcessPoolExecutor``) if given. As HSCAN does, it
+        may return an item more than once if the hash is modified during iteration.
         """
-        if not isinstance(other, collections.Mapping):
-            raise ValueError('values are not mapping')
+        decode = partial(decode_mapping, self.codec) if self.pickling else None
+        chunks = prefetch(iter_hash_chunks(self, chunk_size), decode, depth, executor)
+        return chain.from_iterable(chunk.items() for chunk in chunks)
+
+    def _iter_diff(self, other, chunk_size):
+        """
+        Yield (key, field in ``other``) pairs of keys of the hash.
+
+        The field is MISSING if the value differs from the value in ``other`` or is missing.
+        """
+        other = recorded(other)
+        for chunk in iter_hash_chunks(self, chunk_size):
+            yield from self._chunk_diff(other, chunk)
+
+    def _chunk_diff(self, other, chunk):
+        """Return (key, field in ``other``) pairs of keys of the chunk of stored items."""
+        keys = decode_many(self.codec, chunk) if self.pickling else list(chunk)
+        other_fields = list(chunk)
+        if self.codec is not other.codec:
+            other_fields = encode_many(other.codec, keys) if other.pickling else keys
+        same_items = map(
+            partial(_same_item, self),
+            chunk.values(),
+            repeat(other),
+            other.redis.hmget(other.key_name, other_fields),
+        )
+        return [
+            (key, field if is_same else MISSING)
+            for key, field, is_same in zip(keys, other_fields, same_items)
+        ]
+
+    def snapshot(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Return a read-only local copy of the hash.
+
+        Items are fetched by HSCAN of about ``chunk_size`` items per round trip. Reading the
+        snapshot makes no round trips, ``refresh`` fetches the hash again.
+        """
+        return RedisDictSnapshot(self, chunk_size)
+
+    @instrumented
+    def transform(
+        self, key, fn, default=UNDEFINED, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+    ):
+        """
+        Set the item of the hash with key ``key`` to ``fn(item)`` atomically.
+
+        The item is read and written inside WATCH/MULTI/EXEC, so if the hash is modified
+        concurrently, the transform is retried at most ``retries`` times. If ``key`` is not
+        in the hash, ``fn`` is applied to ``default``. Returns TransformResult with the new
+        value and the number of conflicts.
+
+        Raises KeyError if ``key`` is not in the hash and ``default`` is not given,
+        TransformConflictError if retries are exhausted.
+        """
+        field = self.codec.dumps(key) if self.pickling else key
+        steps = TransformSteps(
+            read=partial(self._read_field, key, field, default),
+            fn=fn,
+            write=partial(self._write_field, field),
+        )
+        return watch_transform(self.redis, self.key_name, steps, retries, backoff)
+
+    def _read_field(self, key, field, default, pipe):
+        """Return the value of the field read by the watching pipeline, or ``default``."""
+        item = pipe.hget(self.key_name, field)
+        if item is not None:
+            return self.codec.loads(item) if self.pickling else item
+        if default is UNDEFINED:
+            raise KeyError(key)
+        return default
+
+    def _write_field(self, field, pipe, value):
+        """Queue setting the value of the field to the transaction."""
         if self.pickling:
-            other = {
-                dumps(k): dumps(v) for k, v in other.items()
-            }
-        self.redis.hmset(self.key_name, other)
+            value = self.codec.dumps(value)
+        pipe.hset(self.key_name, field, value)
+
+    @instrumented
+    def update(self, other=(), **kwargs):
+        """
+        Update the dictionary with the key/value pairs from ``other`` and keyword arguments.
+
+        ``other`` is a mapping or an iterable of (key, value) pairs. Overwrites existing keys,
+        all items are written by a single HSET. Returns None.
+        """
+        if isinstance(other, Mapping):
+            other = other.items()
+        elif not isinstance(other, Iterable):
+            raise ValueError('values are not mapping')
+        mapping = dict(other)
+        mapping.update(kwargs)
+        self.set_many(mapping)
 
     def values(self):
-        """Return a copy of the hash’s values."""
-        values = self.redis.hvals(self.key_name)
-        if self.pickling:
-            values = list(map(loads, values))
-        return values
+        """Return a lazy view of the hash’s values, see ``RedisDictValuesView``."""
+        return RedisDictValuesView(self)
 
+    @instrumented
     def __contains__(self, key):
         """Return True if the hash has a key ``key``, else False."""
         if self.pickling:
-            key = dumps(key)
+            key = self.codec.dumps(key)
         return self.redis.hexists(self.key_name, key)
 
+    @instrumented
     def __len__(self):
         """Return the number of items in the hash."""
         return self.redis.hlen(self.key_name)
 
+    @instrumented
     def __getitem__(self, key):
         """
         Return the item of the hash with key ``key``.
@@ -332,21 +979,23 @@ class RedisDict(object):
         """
         original_key = key
         if self.pickling:
-            key = dumps(key)
+            key = self.codec.dumps(key)
         item = self.redis.hget(self.key_name, key)
         if item is None:
             raise KeyError(original_key)
         if self.pickling:
-            item = loads(item)
+            item = self.codec.loads(item)
         return item
 
+    @instrumented
     def __setitem__(self, key, value):
         """Set the item of the hash with key ``key`` to ``value``."""
         if self.pickling:
-            key = dumps(key)
-            value = dumps(value)
+            key = self.codec.dumps(key)
+            value = self.codec.dumps(value)
         self.redis.hset(self.key_name, key, value)
 
+    @instrumented
     def __delitem__(self, key):
         """
         Remove the item by the ``key`` from the hash.
@@ -355,29 +1004,218 @@ class RedisDict(object):
         """
         original_key = key
         if self.pickling:
-            key = dumps(key)
+            key = self.codec.dumps(key)
         if not self.redis.hdel(self.key_name, key):
             raise KeyError(original_key)
 
     def __iter__(self):
         """
-        Return an iterator over the keys of the dictionary.
+        Return an iterator over the keys of the dictionary, fetched by HSCAN chunks.
 
-        This is a shortcut for iter(d.keys()).
+        This is a shortcut for iter(d.keys()). As HSCAN does, it may return a key more than
+        once if the hash is modified during iteration.
         """
         return iter(self.keys())
 
+    @instrumented
     def __eq__(self, other):
         """
         Compare the hash with ``other``.
 
         Return True if the hash and the ``other`` have the same hash name, or all items
-        of both are equal, else False.
+        of both are equal regardless of the order, else False. Lengths are compared first,
+        then values of the same keys by chunks until the first difference.
+        """
+        if not isinstance(other, self.__class__):
+            return False
+        if self.key_name == other.key_name:
+            return True
+        return len(self) == len(other) and all(
+            field is not MISSING for _, field in self._iter_diff(other, DEFAULT_CHUNK_SIZE)
+        )
+
+    @instrumented
+    def __ior__(self, other):
+        """Update the hash with ``other`` by a single HSET, return the hash itself."""
+        self.update(other)
+        return self
+
+    @instrumented
+    def __repr__(self):
+        """Return string representation of RedisDict instance."""
+        return '{0}: {1}'.format(self.__class__.__name__, self.copy())
+
+
+def _check_type(redis_connection, key_name, key_type):
+    """Raise TypeError if the value stored by the key name is neither of the type nor empty."""
+    stored_type = redis_connection.type(key_name)
+    if stored_type not in (key_type, REDIS_TYPE_NONE):
+        raise TypeError('Cannot bind to "{0}"'.format(stored_type))
+
+
+def _object_attributes(obj):
+    """Return attributes of the mapping, dataclass instance or regular object as a dict."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    try:
+        return dict(obj.__dict__)
+    except AttributeError:
+        raise ValueError('object attributes are not accessible')
+
+
+class RedisObject(object):
+    """
+    Python object bound to the Redis hash, each attribute is stored as a separate field.
+
+    Attributes are loaded lazily: reading an attribute fetches only its field. Assigned
+    attributes are kept locally until ``save`` is called, which writes only the changed
+    fields, so a large object is never rewritten as a whole.
+
+    Attributes that are named as methods of RedisObject can be read by ``fetch``.
+
+    WARNING!
+    The same as for RedisDict, attribute values are *copies* of what is in Redis.
+    """
+
+    __slots__ = ('_hash', '_dirty')
+
+    def __init__(self, redis_connection, key_name, obj=None, pickling=True, validate=True):
+        """
+        Initialize RedisObject.
+
+        Bind to value in Redis by the given key name. Validates if the value stored in Redis
+        is a hash or None (empty), unless ``validate`` is False. If ``obj`` is given (a
+        mapping, a dataclass instance or an object with ``__dict__``), replace stored in Redis
+        value with its attributes.
+        """
+        if obj is not None:
+            obj = _object_attributes(obj)
+        redis_dict = RedisDict(redis_connection, key_name, obj, pickling, validate)
+        object.__setattr__(self, '_hash', redis_dict)
+        object.__setattr__(self, '_dirty', {})
+
+    @property
+    def key_name(self):
+        """Return the name of the bound hash."""
+        return self._hash.key_name
+
+    @property
+    def dirty_fields(self):
+        """Return names of the attributes changed since the last save."""
+        return set(self._dirty)
+
+    def fetch(self, *names):
+        """
+        Return the dictionary of the given attributes, fetched in one round trip.
+
+        Missing attributes are omitted. Unsaved changes take precedence over stored values.
+        """
+        fields = [name for name in names if name not in self._dirty]
+        values = self._hash.get_many(fields, default=MISSING)
+        attributes = {name: value for name, value in values.items() if value is not MISSING}
+        attributes.update(
+            (name, self._dirty[name]) for name in names if name in self._dirty
+        )
+        return attributes
+
+    def save(self):
+        """Write changed attributes to Redis in one HSET."""
+        self._hash.set_many(self._dirty)
+        self._dirty.clear()
+
+    def discard(self):
+        """Forget changed attributes that have not been saved."""
+        self._dirty.clear()
+
+    def to_dict(self):
+        """Return all attributes as a dictionary, including unsaved changes."""
+        attributes = self._hash.copy()
+        attributes.update(self._dirty)
+        return attributes
+
+    def __getattr__(self, name):
+        """
+        Return the attribute value.
+
+        Raises AttributeError if the attribute is neither saved nor changed.
+        """
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in self._dirty:
+            return self._dirty[name]
+        try:
+            return self._hash[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        """Change the attribute locally, it is written to Redis by ``save``."""
+        self._dirty[name] = value
+
+    def __delattr__(self, name):
+        """
+        Remove the attribute from Redis immediately, discarding its unsaved change.
+
+        Raises AttributeError if the attribute is neither saved nor changed.
+        """
+        changed = self._dirty.pop(name, UNDEFINED) is not UNDEFINED
+        if not self._hash.delete_many([name]) and not changed:
+            raise AttributeError(name)
+
+    def __eq__(self, other):
+        """
+        Compare the object with ``other``.
+
+        Return True if all attributes of both, including unsaved changes, are equal, else
+        False.
         """
         if isinstance(other, self.__class__):
-            return self.key_name == other.key_name or self.items() == other.items()
+            return self.to_dict() == other.to_dict()
         return False
 
     def __repr__(self):
-        """Return string representation of RedisDict instance."""
-        return '{0}: {1}'.format(self.__class__.__name__, dict(self.items()))
+        """Return string representation of RedisObject instance."""
+        return '{0}: {1}'.format(self.__class__.__name__, self.to_dict())
+
+
+def _same_item(binding, item, other, other_item):
+    """Return True if stored items of two bindings are equal, decoding them only if needed."""
+    if item is MISSING or other_item is MISSING or other_item is None:
+        return False
+    if item == other_item and binding.codec is other.codec:
+        return True
+    if binding.pickling:
+        item = binding.codec.loads(item)
+    if other.pickling:
+        other_item = other.codec.loads(other_item)
+    return item == other_item
+
+
+def _diff_offsets(binding, chunk, other, other_chunk):
+    """Yield offsets of differing stored items of chunks of two lists."""
+    pairs = zip_longest(chunk, other_chunk, fillvalue=MISSING)
+    for offset, pair in enumerate(pairs):
+        if not _same_item(binding, pair[0], other, pair[1]):
+            yield offset
+
+
+def _identity(value):
+    """Return the value itself."""
+    return value
+
+
+def _lrange_all(key_name, pipe):
+    """Return all stored items of the list."""
+    return pipe.lrange(key_name, 0, -1)
+
+
+def _reversed(items):
+    """Return items in reverse order."""
+    return items[::-1]
+
+
+def _tombstone():
+    """Return a unique value marking a list item to be removed."""
+    return TOMBSTONE_PREFIX + uuid4().hex.encode()
@@ -1,62 +1,148 @@
 """
 Redis type descriptors.
 
-Includes IRedisField, IRedisListField.
+Includes IRedisField, IRedisListField, IRedisDictField and IRedisObjectField.
 """
 
+from collections import namedtuple
+from functools import partial
+from itertools import starmap
+from operator import attrgetter
+from string import Formatter
 from weakref import WeakKeyDictionary
 
-from .bindings import RedisDict, RedisList
-from .pickling import dumps, loads
+from .bindings import RedisDict, RedisList, RedisObject
+from .instrumentation import instrumented
+from .pickling import get_codec
+from .transactions import DEFAULT_BACKOFF, DEFAULT_RETRIES, TransformSteps, watch_transform
+
+# Item of ``string.Formatter().parse``, ``name`` is None after the last field
+_TemplateField = namedtuple('_TemplateField', ['literal', 'name', 'spec', 'conversion'])
 
 
 class IRedisField(object):
     """Abstract class for Basic Redis descriptor."""
 
-    def __init__(self, redis_connection, pickling=True):
+    def __init__(
+        self, redis_connection, pickling=True, key_template=None, cache_key_name=False,
+    ):
         """
         Initialize Redis field descriptor.
 
         Accepts user data only as bytes, strings or numbers (ints, longs and floats). An attempt
-        to set value as any other type will raise a DataError exception.
+        to set value as any other type will raise a DataError exception, unless ``pickling``
+        is True (values are pickled) or a codec object with ``dumps`` and ``loads`` methods.
+
+        ``key_template`` (e.g. '{cls}:{pk}:{field}') defines key names instead of overriding
+        ``get_key_name``: ``{cls}`` is the name of the class the field is defined in,
+        ``{field}`` is the name of the field, other names are attributes of the instance.
+        The template is compiled once, when the owner class is created.
+
+        If ``cache_key_name`` is True, the key name is computed once per instance and kept
+        in its ``__dict__`` as bytes, so attributes it is made of must never change.
         """
         self.redis = redis_connection
         self.pickling = pickling
+        self.codec = get_codec(pickling)
         self.name = None
+        self.key_template = key_template
+        self.cache_key_name = cache_key_name
+        self._key_name_format = None
+        self._key_name_attribute = None
 
     def get_key_name(self, instance):
         """
         Return Redis key name of the attribute.
 
-        Needs to be defined by user. It's recommended to follow the Redis convention of key
-        naming using colon to split namespaces. E.g., 'cls_name:obj_id:field_name'.
+        Needs to be defined by user, unless ``key_template`` is given. It's recommended to
+        follow the Redis convention of key naming using colon to split namespaces. E.g.,
+        'cls_name:obj_id:field_name'.
+        """
+        if self._key_name_format is None:
+            raise NotImplementedError
+        return self._key_name_format(instance)
+
+    def _key_name(self, instance):
+        """Return the key name of the instance, cached in the instance if enabled."""
+        if not self.cache_key_name:
+            return self.get_key_name(instance)
+        attributes = instance.__dict__
+        key_name = attributes.get(self._key_name_attribute)
+        if key_name is None:
+            key_name = self.get_key_name(instance)
+            if isinstance(key_name, str):
+                key_name = key_name.encode()
+            attributes[self._key_name_attribute] = key_name
+        return key_name
+
+    @instrumented
+    def transform(self, instance, fn, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
         """
-        raise NotImplementedError
+        Set the attribute on the instance to ``fn(value)`` atomically.
+
+        The value is read and written inside WATCH/MULTI/EXEC, so if it is modified
+        concurrently, the transform is retried at most ``retries`` times. The same as for
+        ``__get__``, ``fn`` gets None if the value is not set. Returns TransformResult with
+        the new value and the number of conflicts.
+
+        The descriptor is returned by the class attribute, e.g.
+        ``Student.name.transform(student, fn)``.
+
+        Raises TransformConflictError if retries are exhausted.
+        """
+        key_name = self._key_name(instance)
+        steps = TransformSteps(
+            read=partial(self._read_value, key_name),
+            fn=fn,
+            write=partial(self._write_value, key_name),
+        )
+        return watch_transform(self.redis, key_name, steps, retries, backoff)
 
+    def _read_value(self, key_name, pipe):
+        """Return the value read by the watching pipeline."""
+        value = pipe.get(key_name)
+        if self.pickling and value is not None:
+            value = self.codec.loads(value)
+        return value
+
+    def _write_value(self, key_name, pipe, value):
+        """Queue setting the value to the transaction."""
+        if self.pickling:
+            value = self.codec.dumps(value)
+        pipe.set(key_name, value)
+
+    @instrumented
     def __get__(self, instance, owner):
-        """Return the attribute value."""
-        value = self.redis.get(self.get_key_name(instance))
+        """Return the attribute value, or the descriptor itself if accessed by the class."""
+        if instance is None:
+            return self
+        value = self.redis.get(self._key_name(instance))
         if self.pickling and value is not None:
-            value = loads(value)
+            value = self.codec.loads(value)
         return value
 
+    @instrumented
     def __set__(self, instance, value):
         """Set the attribute on the instance to the new value."""
         if self.pickling:
-            value = dumps(value)
-        self.redis.set(self.get_key_name(instance), value)
+            value = self.codec.dumps(value)
+        self.redis.set(self._key_name(instance), value)
 
+    @instrumented
     def __delete__(self, instance):
         """Delete the attribute on an instance of the owner class."""
-        self.redis.delete(self.get_key_name(instance))
+        self.redis.delete(self._key_name(instance))
 
     def __set_name__(self, owner, name):
         """
         Set the name the descriptor has been assigned to name.
 
-        Called at the time the owner class is created.
+        Called at the time the owner class is created. Compiles the key template if given.
         """
         self.name = name
+        self._key_name_attribute = '_{0}_key_name'.format(name)
+        if self.key_template is not None:
+            self._key_name_format = _compile_key_template(self.key_template, owner, name)
 
 
 class IRedisDataStructureField(IRedisField):
@@ -64,34 +150,63 @@ class IRedisDataStructureField(IRedisField):
 
     data_structure = None
 
-    def __init__(self, redis_connection, pickling=True):
+    def __init__(self, redis_connection, pickling=True, cache=True, **kwargs):
         """
         Initialize data structure descriptor.
 
-        Creates a dictionary for cache: reference to data structures lives until the reference
-        to the instance is not the only one left.
+        If ``cache`` is True, creates a dictionary for cache: reference to data structures
+        lives until the reference to the instance is not the only one left. Otherwise a
+        binding is created on every access, without checking the type of the stored value,
+        and nothing is kept per instance, which saves memory with many instances.
         """
-        super().__init__(redis_connection, pickling)
-        self.ds_references = WeakKeyDictionary()
+        super().__init__(redis_connection, pickling, **kwargs)
+        self.cache = cache
+        self.ds_references = WeakKeyDictionary() if cache else None
+        self.binding_kwargs = {}
+
+    def transform(self, instance, *args, **kwargs):
+        """
+        Transform an item of the bound data structure atomically.
+
+        Arguments are passed to ``transform`` of the binding, e.g.
+        ``Student.subjects.transform(student, 0, str.upper)`` transforms the first item of
+        the list. Reading or writing the whole value with GET and SET would fail, since the
+        key holds a list or a hash.
+        """
+        return self.__get__(instance, type(instance)).transform(*args, **kwargs)
 
     def __get__(self, instance, owner):
-        """Return the attribute value."""
+        """Return the binding, or the descriptor itself if accessed by the class."""
+        if instance is None:
+            return self
+        if not self.cache:
+            return self.data_structure(
+                self.redis,
+                self._key_name(instance),
+                pickling=self.pickling,
+                validate=False,
+                **self.binding_kwargs,
+            )
         if instance not in self.ds_references:
             self.ds_references[instance] = self.data_structure(
                 self.redis,
-                self.get_key_name(instance),
+                self._key_name(instance),
                 pickling=self.pickling,
+                **self.binding_kwargs,
             )
         return self.ds_references[instance]
 
     def __set__(self, instance, value):
         """Set the attribute on the instance to the new value."""
-        self.ds_references[instance] = self.data_structure(
+        binding = self.data_structure(
             self.redis,
-            self.get_key_name(instance),
+            self._key_name(instance),
             value,
             self.pickling,
+            **self.binding_kwargs,
         )
+        if self.cache:
+            self.ds_references[instance] = binding
 
 
 class IRedisListField(IRedisDataStructureField):
@@ -99,8 +214,91 @@ class IRedisListField(IRedisDataStructureField):
 
     data_structure = RedisList
 
+    def __init__(self, redis_connection, pickling=True, cache=True, *, maxlen=None, **kwargs):
+        """
+        Initialize list descriptor.
+
+        Positional arguments are the same as of other descriptors. If ``maxlen`` is given,
+        lists keep only ``maxlen`` last items, as RedisList does.
+        """
+        super().__init__(redis_connection, pickling, cache, **kwargs)
+        if maxlen is not None:
+            self.binding_kwargs['maxlen'] = maxlen
+
 
 class IRedisDictField(IRedisDataStructureField):
     """Abstract class for Redis hash descriptor."""
 
     data_structure = RedisDict
+
+
+class IRedisObjectField(IRedisDataStructureField):
+    """
+    Abstract class for Redis object descriptor.
+
+    Stores attributes of the assigned object as fields of the hash, so they can be read and
+    updated one by one. Unsaved changes are kept by the RedisObject, so with ``cache=False``
+    keep the returned object until ``save`` is called.
+    """
+
+    data_structure = RedisObject
+
+    def transform(self, instance, *args, **kwargs):
+        """Raise TypeError, attributes of RedisObject are not transformed."""
+        raise TypeError('{0} does not support transform'.format(self.__class__.__name__))
+
+
+def _escape(text):
+    """Return the text with braces escaped for ``str.format``."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def _compile_key_template(key_template, owner, name):
+    """
+    Return the function making key names of instances by the template.
+
+    ``{cls}`` and ``{field}`` are substituted at once, other fields are replaced with
+    positional ones filled by a single ``attrgetter`` call. A single attribute without a
+    format spec is concatenated, which is faster than formatting.
+    """
+    fields = list(_parse_key_template(key_template, owner, name))
+    attributes = [field.name for field in fields if field.name is not None]
+    key_format = ''.join(map(_format_part, fields))
+    if not attributes:
+        constant = key_format.format()
+        return lambda instance: constant
+    if len(attributes) > 1:
+        getter = attrgetter(*attributes)
+        return lambda instance: key_format.format(*getter(instance))
+    return _single_attribute_key(fields, key_format, attrgetter(attributes[0]))
+
+
+def _parse_key_template(key_template, owner, name):
+    """Yield TemplateField items of the template, with ``{cls}`` and ``{field}`` made literal."""
+    constants = {'cls': owner.__name__, 'field': name}
+    for field in starmap(_TemplateField, Formatter().parse(key_template)):
+        if field.name in constants and not field.spec and not field.conversion:
+            yield _TemplateField(field.literal + constants[field.name], None, None, None)
+        else:
+            yield field
+
+
+def _format_part(field):
+    """Return the escaped literal followed by the automatically numbered field if any."""
+    literal = _escape(field.literal)
+    if field.name is None:
+        return literal
+    conversion = '!' + field.conversion if field.conversion else ''
+    spec = ':' + field.spec if field.spec else ''
+    return '{0}{{{1}{2}}}'.format(literal, conversion, spec)
+
+
+def _single_attribute_key(fields, key_format, getter):
+    """Return the function making key names by one attribute, concatenated if it is plain."""
+    attributes = (index for index, field in enumerate(fields) if field.name is not None)
+    position = next(attributes)
+    if fields[position].spec or fields[position].conversion:
+        return lambda instance: key_format.format(getter(instance))
+    prefix = ''.join(field.literal for field in fields[:position + 1])
+    suffix = ''.join(field.literal for field in fields[position + 1:])
+    return lambda instance: prefix + str(getter(instance)) + suffix
@@ -0,0 +1,222 @@
+"""
+Binding factory.
+
+Owns the connection pool shared by all bindings it creates, and the per-thread pipelines
+sending commands of the bindings in batches.
+"""
+
+import threading
+from contextlib import ExitStack, contextmanager
+from functools import partial
+
+import redis
+
+from .bindings import RedisDict, RedisList, RedisObject
+from .packed import RedisPackedList
+
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_TIMEOUT = 20
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+DEFAULT_FLUSH_SIZE = 100
+
+# Pipeline methods that are not commands, forwarded as they are
+_PIPELINE_METHODS = frozenset(('execute', 'reset', 'multi', 'watch', 'unwatch'))
+
+
+class AutoFlushPipeline(object):
+    """
+    Non-transactional pipeline executed as soon as ``flush_size`` commands are queued.
+
+    Commands return the pipeline itself rather than results, as commands of any pipeline do.
+    Pipelines of bindings queue their commands to this one, see ``_BatchPipeline``. It is
+    not thread-safe: only the thread that created it queues commands to it.
+    """
+
+    def __init__(self, redis_connection, flush_size=DEFAULT_FLUSH_SIZE):
+        """Create the pipeline."""
+        self.pipe = redis_connection.pipeline(transaction=False)
+        self.flush_size = flush_size
+
+    def flush(self):
+        """Execute queued commands, return their results."""
+        return self.pipe.execute()
+
+    def __getattr__(self, name):
+        """Return the pipeline attribute, commands queueing to it and flushing it if full."""
+        attribute = getattr(self.pipe, name)
+        if not callable(attribute) or name in _PIPELINE_METHODS:
+            return attribute
+        return partial(self._queue, attribute)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        """Return the pipeline of a binding, queueing its commands to this one."""
+        return _BatchPipeline(self)
+
+    def __len__(self):
+        """Return the number of queued commands."""
+        return len(self.pipe)
+
+    def _queue(self, command, *args, **kwargs):
+        """Queue the command, flush the pipeline if it is full."""
+        command(*args, **kwargs)
+        if len(self.pipe) >= self.flush_size:
+            self.flush()
+        return self.pipe
+
+
+class _BatchPipeline(object):
+    """
+    Pipeline of a binding inside the batch, queueing its commands to the batch pipeline.
+
+    Commands are sent with the batch, so ``execute`` returns no results and transactions
+    cannot be run: methods using results of their commands have to be called outside.
+    """
+
+    def __init__(self, batch):
+        """Keep the batch pipeline."""
+        self._batch = batch
+
+    def __enter__(self):
+        """Enter the pipeline context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Keep the commands queued to the batch."""
+
+    def __getattr__(self, name):
+        """Return the command queueing to the batch pipeline."""
+        return getattr(self._batch, name)
+
+    def execute(self, raise_on_error=True):
+        """Return no results, the commands are sent with the batch."""
+        return []
+
+    def reset(self):
+        """Keep the commands queued to the batch."""
+
+    unwatch = reset
+
+    def watch(self, *names):
+        """Raise TypeError, the batch cannot run transactions."""
+        raise TypeError('Cannot run transactions in factory.pipeline(), call the method outside')
+
+    multi = watch
+
+
+class _ThreadClient(object):
+    """Redis client sending commands to the pipeline of the current thread if there is one."""
+
+    def __init__(self, factory):
+        """Keep the factory."""
+        self._factory = factory
+
+    def __getattr__(self, name):
+        """Return the attribute of the pipeline of the current thread or of the client."""
+        return getattr(self._factory.current_client(), name)
+
+
+class BindingFactory(object):
+    """
+    Factory of bindings sharing the connection pool.
+
+    The pool is blocking by default: when ``max_connections`` are in use, a command waits
+    for a free connection at most ``timeout`` seconds rather than raising an error at once.
+    Connections are kept alive and checked if idle for ``health_check_interval`` seconds.
+    Other keyword arguments are passed to connections. Bindings are created with the
+    ``pickling`` argument of the factory unless given.
+
+    Inside ``with factory.pipeline():`` commands of the bindings created by the factory are
+    queued to the pipeline of the current thread and sent by ``flush_size`` commands at once.
+    Batching applies within the thread only: other threads send their commands at once.
+    """
+
+    def __init__(
+        self,
+        url=None,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+        blocking=True,
+        timeout=DEFAULT_TIMEOUT,
+        health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+        pickling=True,
+        flush_size=DEFAULT_FLUSH_SIZE,
+        **connection_kwargs,
+    ):
+        """Create the connection pool."""
+        connection_kwargs = {'socket_keepalive': True, **connection_kwargs}
+        connection_kwargs.update(
+            max_connections=max_connections, health_check_interval=health_check_interval,
+        )
+        pool_class = redis.ConnectionPool
+        if blocking:
+            pool_class = redis.BlockingConnectionPool
+            connection_kwargs['timeout'] = timeout
+        if url is None:
+            self.pool = pool_class(**connection_kwargs)
+        else:
+            self.pool = pool_class.from_url(url, **connection_kwargs)
+        self.redis = redis.Redis(connection_pool=self.pool)
+        self.pickling = pickling
+        self.flush_size = flush_size
+        self.client = _ThreadClient(self)
+        self._local = threading.local()
+
+    def list(self, key_name, iterable=None, **kwargs):
+        """Return RedisList bound to ``key_name``."""
+        return self.bind(RedisList, key_name, iterable, **kwargs)
+
+    def dict(self, key_name, mapping=None, **kwargs):
+        """Return RedisDict bound to ``key_name``."""
+        return self.bind(RedisDict, key_name, mapping, **kwargs)
+
+    def object(self, key_name, obj=None, **kwargs):
+        """Return RedisObject bound to ``key_name``."""
+        return self.bind(RedisObject, key_name, obj, **kwargs)
+
+    def packed_list(self, key_name, iterable=None, **kwargs):
+        """Return RedisPackedList bound to ``key_name``."""
+        return self.bind(RedisPackedList, key_name, iterable, **kwargs)
+
+    def bind(self, binding_class, key_name, *args, **kwargs):
+        """Return the binding of the given class sharing the connection pool."""
+        kwargs.setdefault('pickling', self.pickling)
+        return binding_class(self.client, key_name, *args, **kwargs)
+
+    def current_client(self):
+        """Return the pipeline of the current thread if there is one, else the client."""
+        pipeline = getattr(self._local, 'pipeline', None)
+        return self.redis if pipeline is None else pipeline
+
+    @contextmanager
+    def pipeline(self):
+        """
+        Queue commands of bindings in the current thread to the auto-flushing pipeline.
+
+        Queued commands are sent on exit, unless an exception is raised. Only methods not
+        using results of commands (e.g. ``append``, ``extend``, ``update``, setting items of
+        dicts) can be called inside, bindings have to be created outside or with
+        ``validate=False``. Nested blocks share the pipeline. Commands of other threads are
+        not queued, even if they use the same bindings.
+        """
+        pipeline = getattr(self._local, 'pipeline', None)
+        if pipeline is not None:
+            yield pipeline
+            return
+        pipeline = AutoFlushPipeline(self.redis, self.flush_size)
+        self._local.pipeline = pipeline
+        with ExitStack() as stack:
+            # Commands go straight to the client again even if the block fails
+            stack.callback(setattr, self._local, 'pipeline', None)
+            yield pipeline
+        pipeline.flush()
+
+    def close(self):
+        """Close all connections of the pool."""
+        self.pool.disconnect()
+
+    def __enter__(self):
+        """Return the factory itself."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close all connections of the pool."""
+        self.close()
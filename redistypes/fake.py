@@ -0,0 +1,777 @@
+"""
+In-memory Redis.
+
+Provides FakeRedis: a client keeping data in the process memory, to be passed to bindings
+and descriptors instead of the Redis client. It implements the commands they send,
+pipelines and WATCH/MULTI/EXEC transactions, but not Lua scripts: scripts of the package
+fall back to Python implementations. Round trips are counted and may be slowed down by a
+simulated latency, so tests and benchmarks run without a server, deterministically.
+"""
+
+import fnmatch
+import threading
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import timedelta
+from functools import partial
+from itertools import starmap
+
+from redis.exceptions import DataError, RedisError, ResponseError, WatchError
+
+WRONGTYPE = 'WRONGTYPE Operation against a key holding the wrong kind of value'
+NOT_INTEGER = 'value is not an integer or out of range'
+
+_TYPE_NAMES = {bytes: b'string', list: b'list', dict: b'hash'}
+_SIZED_TYPES = (bytes, str, int, float)
+_INVALID_INPUT = 'Invalid input of type: {0!r}. Convert to a bytes, string, int or float first.'
+
+# Data of FakeServer restored when a transaction fails
+_State = namedtuple('_State', ['data', 'expires', 'versions', 'version'])
+
+
+def _encode(value):
+    """Return the value as bytes sent to Redis, as redis-py encodes command arguments."""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise DataError(_INVALID_INPUT.format(type(value).__name__))
+    return repr(value).encode()
+
+
+def _to_int(value):
+    """Return the integer argument or stored value, raise ResponseError if it is not one."""
+    try:
+        return int(_encode(value))
+    except ValueError:
+        raise ResponseError(NOT_INTEGER)
+
+
+def _seconds(value):
+    """Return the number of seconds of the int or timedelta argument."""
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return _to_int(value)
+
+
+def _now():
+    """Return the monotonic time keys expire by."""
+    return time.monotonic()
+
+
+def _list_range(length, start, end):
+    """Return the slice of a list of ``length`` items selected by inclusive Redis indices."""
+    start, end = _to_int(start), _to_int(end)
+    if start < 0:
+        start = max(length + start, 0)
+    if end < 0:
+        end += length
+    stop = min(end, length - 1) + 1
+    return slice(start, max(stop, start))
+
+
+def _flatten(values):
+    """Yield values of nested lists, tuples and mappings."""
+    for value in values:
+        if isinstance(value, dict):
+            value = list(value.items())
+        if isinstance(value, (list, tuple)):
+            yield from _flatten(value)
+        else:
+            yield value
+
+
+def _occurrences(items, value, count):
+    """Return indices of ``count`` occurrences of the value, from the tail if negative, all if 0."""
+    indices = [index for index, item in enumerate(items) if item == value]
+    if count < 0:
+        indices = indices[::-1]
+    return indices[:abs(count)] if count else indices
+
+
+def _command_size(name, args, kwargs):
+    """Return the approximate number of bytes of the command and its arguments."""
+    size = 0
+    for value in _flatten((name, args, kwargs)):
+        if isinstance(value, _SIZED_TYPES) and not isinstance(value, bool):
+            size += len(_encode(value))
+    return size
+
+
+def _raise_first_error(commands, results):
+    """Raise the first error of results of pipelined commands, as redis-py does."""
+    for index, result in enumerate(results):
+        if isinstance(result, ResponseError):
+            message = 'Command # {0} ({1}) of pipeline caused error: {2}'.format(
+                index + 1, commands[index][0].upper(), result,
+            )
+            raise type(result)(message)
+
+
+class _KeyCommands(object):
+    """Commands of keys and the keyspace, and access to values of keys for other commands."""
+
+    def _get(self, name):
+        """Return the value of the key, None if it does not exist or has expired."""
+        key = _encode(name)
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= _now():
+            self._delete(key)
+        return self._data.get(key)
+
+    def _get_typed(self, name, value_type):
+        """Return the value of the key, raise ResponseError if it is of another type."""
+        value = self._get(name)
+        if value is not None and type(value) is not value_type:
+            raise ResponseError(WRONGTYPE)
+        return value
+
+    def _put(self, name, value, keep_ttl=False):
+        """Set the value of the key, removing the key if the list or hash is empty."""
+        key = _encode(name)
+        if not keep_ttl:
+            self._expires.pop(key, None)
+        if isinstance(value, (list, dict)) and not value:
+            self._delete(key)
+            return
+        self._data[key] = value
+        self._touch(key)
+
+    def _delete(self, key):
+        """Remove the key, return True if it existed."""
+        self._expires.pop(key, None)
+        if self._data.pop(key, None) is None:
+            return False
+        self._touch(key)
+        return True
+
+    def _exists(self, name):
+        """Return True if the key exists and has not expired."""
+        return self._get(name) is not None
+
+    def _remove(self, name):
+        """Remove the key unless it has expired, return True if it existed."""
+        self._get(name)
+        return self._delete(_encode(name))
+
+    def _touch(self, key):
+        """Change the version of the key, failing transactions watching it."""
+        self._version += 1
+        self._versions[key] = self._version
+
+    def _watch(self, names):
+        """Return current versions of the keys."""
+        for name in names:
+            self._get(name)
+        return {_encode(name): self._versions.get(_encode(name)) for name in names}
+
+    def _changed(self, versions):
+        """Return True if any key changed since its versions were taken."""
+        return self._watch(list(versions)) != versions
+
+    def _keys(self, match=None, type_name=None):
+        """Return names of existing keys matching the glob pattern and the type."""
+        names = list(filter(self._exists, list(self._data)))
+        if match is not None:
+            names = fnmatch.filter(names, _encode(match))
+        if type_name is not None:
+            type_name = _encode(type_name).lower()
+            names = [key for key in names if self.type(key) == type_name]
+        return names
+
+    def ping(self):
+        """Return True."""
+        return True
+
+    def flushdb(self, asynchronous=False):
+        """Remove all keys."""
+        for key in list(self._data):
+            self._delete(key)
+        return True
+
+    flushall = flushdb
+
+    def wait(self, num_replicas, timeout):
+        """Return 0, there are no replicas."""
+        return 0
+
+    def dbsize(self):
+        """Return the number of keys."""
+        return len(self._keys())
+
+    def delete(self, *names):
+        """Remove the keys, return the number of removed ones."""
+        return sum(map(self._remove, names))
+
+    unlink = delete
+
+    def exists(self, *names):
+        """Return the number of existing keys."""
+        return sum(map(self._exists, names))
+
+    def type(self, name):
+        """Return the type of the key, b'none' if it does not exist."""
+        return _TYPE_NAMES.get(type(self._get(name)), b'none')
+
+    def keys(self, pattern='*'):
+        """Return names of keys matching the pattern."""
+        return self._keys(pattern)
+
+    def scan(self, cursor=0, match=None, count=None, _type=None):
+        """Return the zero cursor and all keys, as if they were scanned at once."""
+        return 0, self._keys(match, _type)
+
+    def expire(self, name, time):
+        """Make the key expire in ``time`` seconds, return False if it does not exist."""
+        return self.pexpire(name, _seconds(time) * 1000)
+
+    def pexpire(self, name, time):
+        """Make the key expire in ``time`` milliseconds, return False if it does not exist."""
+        if isinstance(time, timedelta):
+            time = time.total_seconds() * 1000
+        if self._get(name) is None:
+            return False
+        key = _encode(name)
+        self._expires[key] = _now() + float(time) / 1000
+        self._touch(key)
+        return True
+
+    def persist(self, name):
+        """Remove the expiration of the key, return True if it had one."""
+        if not self._exists(name):
+            return False
+        return self._expires.pop(_encode(name), None) is not None
+
+    def pttl(self, name):
+        """Return milliseconds the key expires in, -1 if it does not, -2 if it does not exist."""
+        if self._get(name) is None:
+            return -2
+        expires_at = self._expires.get(_encode(name))
+        if expires_at is None:
+            return -1
+        return int(round((expires_at - _now()) * 1000))
+
+    def ttl(self, name):
+        """Return seconds the key expires in, -1 if it does not, -2 if it does not exist."""
+        milliseconds = self.pttl(name)
+        return milliseconds if milliseconds < 0 else int(round(milliseconds / 1000.0))
+
+
+class _StringCommands(object):
+    """Commands of string values."""
+
+    def get(self, name):
+        """Return the value of the string key."""
+        return self._get_typed(name, bytes)
+
+    def mget(self, keys, *args):
+        """Return values of the keys, None for missing keys and keys of other types."""
+        names = [keys] if isinstance(keys, (bytes, str)) else list(keys)
+        values = [self._get(name) for name in names + list(args)]
+        return [value if isinstance(value, bytes) else None for value in values]
+
+    def set(self, name, value, ex=None, px=None, nx=False, xx=False, keepttl=False):
+        """Set the string value, return None if the NX or XX condition is not met."""
+        value = _encode(value)
+        exists = self._get(name) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._put(name, value, keep_ttl=keepttl)
+        if ex is not None:
+            self.expire(name, ex)
+        if px is not None:
+            self.pexpire(name, px)
+        return True
+
+    def mset(self, mapping):
+        """Set values of the keys."""
+        for name, value in mapping.items():
+            self.set(name, value)
+        return True
+
+    def strlen(self, name):
+        """Return the length of the string value."""
+        return len(self.get(name) or b'')
+
+    def incrby(self, name, amount=1):
+        """Increment the integer value, return the new one."""
+        value = _to_int(self.get(name) or 0) + _to_int(amount)
+        self._put(name, _encode(value), keep_ttl=True)
+        return value
+
+    incr = incrby
+
+    def decrby(self, name, amount=1):
+        """Decrement the integer value, return the new one."""
+        return self.incrby(name, -_to_int(amount))
+
+    decr = decrby
+
+
+class _ListCommands(object):
+    """Commands of list values."""
+
+    def _list(self, name):
+        """Return the list value, an empty list if the key does not exist."""
+        return self._get_typed(name, list) or []
+
+    def _push(self, name, values, left):
+        """Add values to the list, return its new length."""
+        if not values:
+            raise DataError('Pushing nothing to the list')
+        items = self._list(name)
+        values = [_encode(value) for value in values]
+        items = values[::-1] + items if left else items + values
+        self._put(name, items, keep_ttl=True)
+        return len(items)
+
+    def rpush(self, name, *values):
+        """Add values to the tail of the list, return its new length."""
+        return self._push(name, values, left=False)
+
+    def lpush(self, name, *values):
+        """Add values to the head of the list, return its new length."""
+        return self._push(name, values, left=True)
+
+    def _pop(self, name, count, left):
+        """Remove and return the head or the tail item, or ``count`` items if given."""
+        items = self._list(name)
+        if not items:
+            return None
+        number = 1 if count is None else _to_int(count)
+        if left:
+            popped, remaining = items[:number], items[number:]
+        else:
+            popped = items[::-1][:number]
+            remaining = items[:max(len(items) - number, 0)]
+        self._put(name, remaining, keep_ttl=True)
+        return popped[0] if count is None else popped
+
+    def rpop(self, name, count=None):
+        """Remove and return the tail item, or ``count`` tail items."""
+        return self._pop(name, count, left=False)
+
+    def lpop(self, name, count=None):
+        """Remove and return the head item, or ``count`` head items."""
+        return self._pop(name, count, left=True)
+
+    def llen(self, name):
+        """Return the length of the list."""
+        return len(self._list(name))
+
+    def lrange(self, name, start, end):
+        """Return items between ``start`` and ``end`` indices inclusive."""
+        items = self._list(name)
+        return items[_list_range(len(items), start, end)]
+
+    def ltrim(self, name, start, end):
+        """Keep only items between ``start`` and ``end`` indices inclusive."""
+        items = self._list(name)
+        selected = items[_list_range(len(items), start, end)]
+        self._put(name, selected, keep_ttl=True)
+        return True
+
+    def lindex(self, name, index):
+        """Return the item at the index, None if it is out of range."""
+        items = self._list(name)
+        index = _to_int(index)
+        if -len(items) <= index < len(items):
+            return items[index]
+        return None
+
+    def lset(self, name, index, value):
+        """Set the item at the index."""
+        items = self._get_typed(name, list)
+        if items is None:
+            raise ResponseError('no such key')
+        index = _to_int(index)
+        if not -len(items) <= index < len(items):
+            raise ResponseError('index out of range')
+        items = list(items)
+        items[index] = _encode(value)
+        self._put(name, items, keep_ttl=True)
+        return True
+
+    def lrem(self, name, count, value):
+        """Remove ``count`` occurrences of the value, from the tail if negative, all if 0."""
+        items = self._list(name)
+        removed = set(_occurrences(items, _encode(value), _to_int(count)))
+        self._put(
+            name,
+            [item for index, item in enumerate(items) if index not in removed],
+            keep_ttl=True,
+        )
+        return len(removed)
+
+    def linsert(self, name, where, refvalue, value):
+        """Insert the value before or after the pivot, return the new length or -1."""
+        items = self._list(name)
+        if not items:
+            return 0
+        where = _encode(where).upper()
+        if where not in (b'BEFORE', b'AFTER'):
+            raise ResponseError('syntax error')
+        refvalue = _encode(refvalue)
+        if refvalue not in items:
+            return -1
+        index = items.index(refvalue) + (where == b'AFTER')
+        items = items[:index] + [_encode(value)] + items[index:]
+        self._put(name, items, keep_ttl=True)
+        return len(items)
+
+    def lpos(self, name, value, rank=None, count=None, maxlen=None):
+        """Return the index of the value, or the list of ``count`` indices (0 for all)."""
+        rank = 1 if rank is None else _to_int(rank)
+        if not rank:
+            raise ResponseError("RANK can't be zero")
+        items = self._list(name)
+        value = _encode(value)
+        indices = range(len(items))
+        if rank < 0:
+            indices = indices[::-1]
+        if maxlen:
+            indices = indices[:_to_int(maxlen)]
+        found = [index for index in indices if value == items[index]]
+        found = found[abs(rank) - 1:]
+        if count is None:
+            return found[0] if found else None
+        count = _to_int(count)
+        return found[:count] if count else found
+
+
+class _HashCommands(object):
+    """Commands of hash values."""
+
+    def _hash(self, name):
+        """Return the hash value, an empty dict if the key does not exist."""
+        return self._get_typed(name, dict) or {}
+
+    def hset(self, name, key=None, value=None, mapping=None, items=None):
+        """Set fields of the hash, return the number of added ones."""
+        pairs = []
+        if key is not None:
+            pairs.append((key, value))
+        if mapping:
+            pairs.extend(mapping.items())
+        if items:
+            pairs.extend(zip(items[::2], items[1::2]))
+        if not pairs:
+            raise DataError("'hset' with no key value pairs")
+        fields = dict(self._hash(name))
+        added = 0
+        for key, value in pairs:
+            key = _encode(key)
+            added += key not in fields
+            fields[key] = _encode(value)
+        self._put(name, fields, keep_ttl=True)
+        return added
+
+    def hmset(self, name, mapping):
+        """Set fields of the hash."""
+        if not mapping:
+            raise DataError("'hmset' with 'mapping' of length 0")
+        self.hset(name, mapping=mapping)
+        return True
+
+    def hsetnx(self, name, key, value):
+        """Set the field if it does not exist, return True if it was set."""
+        if _encode(key) in self._hash(name):
+            return False
+        return bool(self.hset(name, key, value))
+
+    def hget(self, name, key):
+        """Return the value of the field."""
+        return self._hash(name).get(_encode(key))
+
+    def hmget(self, name, keys, *args):
+        """Return values of the fields, None for missing ones."""
+        fields = self._hash(name)
+        keys = [keys] if isinstance(keys, (bytes, str)) else list(keys)
+        return [fields.get(_encode(key)) for key in keys + list(args)]
+
+    def hgetall(self, name):
+        """Return the dict of all fields."""
+        return dict(self._hash(name))
+
+    def hkeys(self, name):
+        """Return names of fields."""
+        return list(self._hash(name))
+
+    def hvals(self, name):
+        """Return values of fields."""
+        return list(self._hash(name).values())
+
+    def hlen(self, name):
+        """Return the number of fields."""
+        return len(self._hash(name))
+
+    def hstrlen(self, name, key):
+        """Return the length of the field value."""
+        return len(self.hget(name, key) or b'')
+
+    def hexists(self, name, key):
+        """Return True if the field exists."""
+        return _encode(key) in self._hash(name)
+
+    def hdel(self, name, *keys):
+        """Remove fields, return the number of removed ones."""
+        fields = dict(self._hash(name))
+        size = len(fields)
+        for key in keys:
+            fields.pop(_encode(key), None)
+        self._put(name, fields, keep_ttl=True)
+        return size - len(fields)
+
+    def hincrby(self, name, key, amount=1):
+        """Increment the integer field, return the new value."""
+        value = _to_int(self.hget(name, key) or 0)
+        value += _to_int(amount)
+        self.hset(name, key, value)
+        return value
+
+    def hscan(self, name, cursor=0, match=None, count=None, no_values=None):
+        """Return the zero cursor and all fields matching the pattern, as if scanned at once."""
+        fields = self._hash(name)
+        if match is not None:
+            matching = fnmatch.filter(fields, _encode(match))
+            fields = {key: fields[key] for key in matching}
+        if no_values:
+            return 0, list(fields)
+        return 0, dict(fields)
+
+
+class FakeServer(_KeyCommands, _StringCommands, _ListCommands, _HashCommands):
+    """
+    Data of FakeRedis clients: keys, their expiration times and versions.
+
+    Public methods of the mixins are Redis commands. Clients run them by ``run`` and
+    ``run_transaction`` holding ``lock``, so every command and every transaction is atomic.
+    Key versions change on every write of the key, they are compared by EXEC of
+    transactions watching the key.
+    """
+
+    def __init__(self):
+        """Start with no keys."""
+        self.lock = threading.RLock()
+        self._data = {}
+        self._expires = {}
+        self._versions = {}
+        self._version = 0
+
+    def versions(self, names):
+        """Return current versions of the keys, taken by WATCH."""
+        with self.lock:
+            return self._watch(names)
+
+    def run(self, name, args, kwargs):
+        """Run the command, return ResponseError instead of raising it."""
+        with self.lock:
+            try:
+                return getattr(self, name)(*args, **kwargs)
+            except ResponseError as error:
+                return error
+
+    def run_transaction(self, commands, versions):
+        """
+        Run (name, args, kwargs) commands atomically, return their results or ResponseErrors.
+
+        Raises WatchError if any key has changed since its ``versions`` were taken. As by
+        Redis, commands failing with ResponseError do not stop the others, but if a command
+        raises any other error (e.g. DataError, which redis-py raises before sending
+        anything), changes of the previous ones are undone and the error is raised.
+        """
+        with self.lock:
+            if versions and self._changed(versions):
+                raise WatchError('Watched variable changed.')
+            state = _State(
+                dict(self._data), dict(self._expires), dict(self._versions), self._version,
+            )
+            try:
+                return list(starmap(self.run, commands))
+            except Exception:
+                self._restore(state)
+                raise
+
+    def _restore(self, state):
+        """Restore keys, their expiration times and versions."""
+        self._data = state.data
+        self._expires = state.expires
+        self._versions = state.versions
+        self._version = state.version
+
+
+# Methods of FakeServer run as commands
+COMMANDS = frozenset(
+    name
+    for mixin in (_KeyCommands, _StringCommands, _ListCommands, _HashCommands)
+    for name, attribute in mixin.__dict__.items()
+    if not name.startswith('_') and callable(attribute)
+)
+
+
+class FakePipeline(object):
+    """
+    Pipeline of FakeRedis, sending queued commands by one round trip.
+
+    As by redis-py, commands called after WATCH and before MULTI are sent immediately, and
+    EXEC raises WatchError if a watched key has changed. Errors of commands do not stop the
+    following ones: the first one is raised after all commands are run, unless
+    ``raise_on_error`` is False, then errors are returned in place of results.
+    """
+
+    def __init__(self, client, transaction=True):
+        """Start with no commands queued."""
+        self.client = client
+        self.transaction = transaction
+        self.command_stack = []
+        self.watching = False
+        self.explicit_transaction = False
+        self._versions = {}
+
+    def __enter__(self):
+        """Enter the pipeline context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Reset the pipeline."""
+        self.reset()
+
+    def __len__(self):
+        """Return the number of queued commands."""
+        return len(self.command_stack)
+
+    def __bool__(self):
+        """Return True even if no commands are queued, as redis-py pipelines do."""
+        return True
+
+    def __getattr__(self, name):
+        """Return the command queueing to the pipeline, or sent at once while watching."""
+        if name not in COMMANDS:
+            raise AttributeError(
+                '{0!r} object has no attribute {1!r}'.format(self.__class__.__name__, name),
+            )
+        if self.watching and not self.explicit_transaction:
+            return getattr(self.client, name)
+        return partial(self._queue, name)
+
+    def _queue(self, name, *args, **kwargs):
+        """Queue the command."""
+        self.command_stack.append((name, args, kwargs))
+        return self
+
+    def watch(self, *names):
+        """Watch the keys, failing EXEC if any of them changes."""
+        if self.explicit_transaction:
+            raise RedisError('Cannot issue a WATCH after a MULTI')
+        self.client.round_trip(('watch', names, {}))
+        self._versions.update(self.client.server.versions(names))
+        self.watching = True
+        return True
+
+    def unwatch(self):
+        """Forget watched keys."""
+        self._versions = {}
+        self.watching = False
+        return True
+
+    def multi(self):
+        """Start queueing commands of the transaction."""
+        if self.explicit_transaction:
+            raise RedisError('Cannot issue nested calls to MULTI')
+        if self.command_stack:
+            raise RedisError('Commands without an initial WATCH have already been issued')
+        self.explicit_transaction = True
+
+    def execute(self, raise_on_error=True):
+        """Run queued commands atomically and return their results."""
+        stack = self.command_stack
+        if not stack and not self.watching:
+            return []
+        with ExitStack() as cleanup:
+            cleanup.callback(self.reset)
+            self.client.round_trip(*stack)
+            results = self.client.server.run_transaction(stack, self._versions)
+        if raise_on_error:
+            _raise_first_error(stack, results)
+        return results
+
+    def reset(self):
+        """Forget queued commands and watched keys."""
+        self.command_stack = []
+        self.unwatch()
+        self.explicit_transaction = False
+
+
+class FakeRedis(object):
+    """
+    Redis client keeping data in memory, see the module docstring.
+
+    Clients created with the same ``server`` share data, each one makes its own server by
+    default. Every round trip, by a command or by a pipeline, is counted by ``round_trips``
+    and ``bytes_sent``, and takes ``latency`` seconds more if given. ``scripting`` is False,
+    so LuaScript runs Python fallbacks of scripts.
+    """
+
+    scripting = False
+
+    def __init__(self, latency=0, server=None):
+        """Create the server unless given."""
+        self.latency = latency
+        self.server = FakeServer() if server is None else server
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        """Return the pipeline."""
+        return FakePipeline(self, transaction)
+
+    def scan_iter(self, match=None, count=None, _type=None):
+        """Yield names of keys matching the pattern and the type."""
+        cursor = None
+        while cursor != 0:
+            cursor, names = self.scan(cursor or 0, match=match, count=count, _type=_type)
+            yield from names
+
+    def hscan_iter(self, name, match=None, count=None):
+        """Yield (field, value) pairs of the hash matching the pattern."""
+        cursor = None
+        while cursor != 0:
+            cursor, fields = self.hscan(name, cursor or 0, match=match, count=count)
+            yield from fields.items()
+
+    def close(self):
+        """Do nothing, there is no connection."""
+
+    def __getattr__(self, name):
+        """Return the command sent by a round trip of its own."""
+        if name not in COMMANDS:
+            raise AttributeError(
+                '{0!r} object has no attribute {1!r}'.format(self.__class__.__name__, name),
+            )
+        return partial(self._call, name)
+
+    def round_trip(self, *commands):
+        """Count the round trip sending the commands, wait for the simulated latency."""
+        size = sum(starmap(_command_size, commands))
+        with self._lock:
+            self.round_trips += 1
+            self.bytes_sent += size
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _call(self, name, *args, **kwargs):
+        """Send the command and return its result."""
+        self.round_trip((name, args, kwargs))
+        result = self.server.run(name, args, kwargs)
+        if isinstance(result, ResponseError):
+            raise result
+        return result
+
+    def __repr__(self):
+        """Return string representation of FakeRedis instance."""
+        return '{0}(latency={1!r})'.format(self.__class__.__name__, self.latency)
@@ -0,0 +1,464 @@
+"""
+Instrumentation of binding operations.
+
+Observers added by ``add_observer`` receive an OperationEvent after every operation of the
+bindings and the descriptors: the commands it sent, the number of round trips, the payload
+bytes sent and received, the total latency and the time spent outside Redis calls, which is
+mostly (un)pickling. While no observer is added, the overhead is a check of an empty tuple.
+
+Includes StatsObserver aggregating events in memory, and PrometheusObserver and
+OpenTelemetryObserver adapters, which require ``prometheus_client`` and
+``opentelemetry-api`` packages accordingly.
+"""
+
+import bisect
+import copy
+import re
+import threading
+import time
+from collections import namedtuple
+from functools import partial, wraps
+
+OperationEvent = namedtuple('OperationEvent', [
+    'binding',
+    'method',
+    'key_name',
+    'key_pattern',
+    'commands',
+    'round_trips',
+    'bytes_sent',
+    'bytes_received',
+    'latency',
+    'serialization_time',
+])
+
+# Upper bounds of latency histogram buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1,
+)
+
+# Key name parts looking like identifiers: numbers, UUIDs and hex digests
+_ID_PART = re.compile(r'^(\d+|[0-9a-fA-F-]{32,36})$')
+
+# Pipeline methods that do not send anything to Redis
+_PIPELINE_LOCAL_METHODS = frozenset(('multi', 'reset'))
+
+_local = threading.local()
+
+
+def _pattern_part(part):
+    """Return ``*`` if the key name part looks like an identifier, the part itself otherwise."""
+    return '*' if _ID_PART.match(part) else part
+
+
+def default_key_pattern(key_name):
+    """
+    Return the key name with identifier-like parts replaced by ``*``.
+
+    E.g., 'Student:1:subjects' turns into 'Student:*:subjects'.
+    """
+    if isinstance(key_name, bytes):
+        key_name = key_name.decode('utf-8', 'replace')
+    return ':'.join(map(_pattern_part, str(key_name).split(':')))
+
+
+class _Registry(object):
+    """Observers and the key pattern function shared by all threads."""
+
+    def __init__(self):
+        """Start with no observers and the default key pattern."""
+        self.observers = ()
+        self.key_pattern = default_key_pattern
+
+
+_registry = _Registry()
+
+
+def key_pattern(key_name):
+    """Return the pattern of the key name events are tagged with."""
+    return _registry.key_pattern(key_name)
+
+
+def set_key_pattern(func):
+    """Set the function turning key names into patterns events are tagged with."""
+    _registry.key_pattern = func or default_key_pattern
+
+
+def add_observer(observer):
+    """Start sending operation events to ``observer``."""
+    _registry.observers = _registry.observers + (observer,)
+
+
+def remove_observer(observer):
+    """Stop sending operation events to ``observer``."""
+    _registry.observers = tuple(
+        known for known in _registry.observers if known is not observer
+    )
+
+
+def _size(value):
+    """Return approximate payload size of the command argument or reply in bytes."""
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (list, tuple, set)):
+        return sum(map(_size, value))
+    if isinstance(value, dict):
+        return _size(list(value.items()))
+    if value is None or isinstance(value, bool):
+        return 0
+    return len(str(value))
+
+
+class _RoundTrip(object):
+    """Context adding the time spent and the round trip to the recorder on exit."""
+
+    def __init__(self, recorder):
+        """Remember the recorder."""
+        self.recorder = recorder
+        self.started = None
+
+    def __enter__(self):
+        """Start the timer."""
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Add the round trip, whether it failed or not."""
+        self.recorder.redis_time += time.perf_counter() - self.started
+        self.recorder.round_trips += 1
+
+
+class _Recorder(object):
+    """
+    Accumulates commands of a single operation.
+
+    Used as the context of the operation: it is the current recorder of the thread inside,
+    and the event is sent to observers on exit, whether the operation failed or not.
+    """
+
+    def __init__(self, target, method):
+        """Start with no commands."""
+        self.target = target
+        self.method = method
+        self.started = None
+        self.key_name = None
+        self.commands = []
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.redis_time = 0
+
+    def __enter__(self):
+        """Become the current recorder and start the timer."""
+        _local.recorder = self
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop recording and notify observers."""
+        _local.recorder = None
+        _notify(self.event(time.perf_counter() - self.started))
+
+    def queue(self, name, args, kwargs):
+        """Record the command queued in a pipeline."""
+        if self.key_name is None and args:
+            self.key_name = args[0]
+        self.commands.append(name.upper())
+        self.bytes_sent += _size(args) + _size(list(kwargs.values()))
+
+    def call(self, name, method, *args, **kwargs):
+        """Call the command sent to Redis immediately and record it."""
+        self.queue(name, args, kwargs)
+        return self.send(method, *args, **kwargs)
+
+    def send(self, method, *args, **kwargs):
+        """Call ``method`` making a round trip to Redis and record the reply."""
+        with _RoundTrip(self):
+            reply = method(*args, **kwargs)
+        self.bytes_received += _size(reply)
+        return reply
+
+    def event(self, latency):
+        """Return OperationEvent of the recorded operation."""
+        key_name = self.key_name
+        if key_name is None:
+            key_name = getattr(self.target, 'key_name', None)
+        return OperationEvent(
+            binding=type(self.target).__name__,
+            method=self.method,
+            key_name=key_name,
+            key_pattern=None if key_name is None else key_pattern(key_name),
+            commands=tuple(self.commands),
+            round_trips=self.round_trips,
+            bytes_sent=self.bytes_sent,
+            bytes_received=self.bytes_received,
+            latency=latency,
+            serialization_time=max(latency - self.redis_time, 0),
+        )
+
+
+class _RecordingPipeline(object):
+    """Proxy of the Redis pipeline recording queued and immediate commands."""
+
+    def __init__(self, pipeline, recorder):
+        """Wrap the pipeline."""
+        self._pipeline = pipeline
+        self._recorder = recorder
+
+    def __enter__(self):
+        """Enter the pipeline context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Reset the pipeline."""
+        self._pipeline.__exit__(*exc_info)
+
+    def __len__(self):
+        """Return the number of queued commands."""
+        return len(self._pipeline)
+
+    def __getattr__(self, name):
+        """Return the pipeline attribute, recording commands called through it."""
+        attribute = getattr(self._pipeline, name)
+        if not callable(attribute) or name in _PIPELINE_LOCAL_METHODS:
+            return attribute
+        if name == 'execute':
+            return partial(self._recorder.send, attribute)
+        pipeline = self._pipeline
+        if name == 'watch' or (pipeline.watching and not pipeline.explicit_transaction):
+            return partial(self._recorder.call, name, attribute)
+        return partial(self._queue, name, attribute)
+
+    def _queue(self, name, method, *args, **kwargs):
+        """Queue the command in the pipeline and record it."""
+        self._recorder.queue(name, args, kwargs)
+        method(*args, **kwargs)
+        return self
+
+
+class _RecordingClient(object):
+    """Proxy of the Redis client recording commands of the current operation."""
+
+    def __init__(self, client, recorder):
+        """Wrap the client."""
+        self._client = client
+        self._recorder = recorder
+
+    def pipeline(self, *args, **kwargs):
+        """Return the recording pipeline."""
+        return _RecordingPipeline(self._client.pipeline(*args, **kwargs), self._recorder)
+
+    def __getattr__(self, name):
+        """Return the client attribute, recording commands called through it."""
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+        return partial(self._recorder.call, name, attribute)
+
+
+def _shadow(target, recorder):
+    """Return a shallow copy of the binding or the descriptor sending commands to recorder."""
+    shadow = copy.copy(target)
+    shadow.redis = _RecordingClient(target.redis, recorder)
+    return shadow
+
+
+def recorded(target):
+    """
+    Return the binding or the descriptor recording its commands into the current operation.
+
+    Used by operations sending commands through another binding directly, not by calling
+    its instrumented methods. Returns the target itself outside of observed operations.
+    """
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is None or isinstance(target.redis, _RecordingClient):
+        return target
+    return _shadow(target, recorder)
+
+
+def _notify(event):
+    """Send the event to all observers."""
+    for observer in _registry.observers:
+        observer.record(event)
+
+
+def _call_shadowed(method, target, recorder, args, kwargs):
+    """
+    Call the method on the shadow of the target recording into ``recorder``.
+
+    The shadow returned by the method, e.g. by in-place operators, is replaced with the
+    target, so the recording client never escapes the operation.
+    """
+    if isinstance(target.redis, _RecordingClient):
+        return method(target, *args, **kwargs)
+    shadow = _shadow(target, recorder)
+    result_value = method(shadow, *args, **kwargs)
+    return target if result_value is shadow else result_value
+
+
+def _observe(method, target, args, kwargs):
+    """Call the instrumented method, recording it unless it is nested into another one."""
+    recorder = getattr(_local, 'recorder', None)
+    if recorder is not None:
+        return _call_shadowed(method, target, recorder, args, kwargs)
+    with _Recorder(target, method.__name__) as recorder:
+        return _call_shadowed(method, target, recorder, args, kwargs)
+
+
+def instrumented(method):
+    """
+    Decorate the method of a binding or a descriptor to be observed.
+
+    The method is called on a shallow copy of the object with the recording Redis client,
+    so the object itself is never changed, and it is thread-safe.
+    """
+    @wraps(method)
+    def decorator(target, *args, **kwargs):
+        if not _registry.observers:
+            return method(target, *args, **kwargs)
+        return _observe(method, target, args, kwargs)
+    return decorator
+
+
+def instrumented_init(init):
+    """Decorate ``__init__`` of a binding, which gets the Redis client as the argument."""
+    @wraps(init)
+    def decorator(binding, redis_connection, *args, **kwargs):
+        if not _registry.observers or getattr(_local, 'recorder', None) is not None:
+            return init(binding, redis_connection, *args, **kwargs)
+        with _Recorder(binding, init.__name__) as recorder:
+            init(binding, _RecordingClient(redis_connection, recorder), *args, **kwargs)
+        binding.redis = redis_connection
+    return decorator
+
+
+class Observer(object):
+    """Abstract class of the operation events observer."""
+
+    def record(self, event):
+        """Handle OperationEvent. Needs to be defined by user."""
+        raise NotImplementedError
+
+
+class OperationStats(object):
+    """Aggregated statistics of one operation."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Start with zero counters and an empty latency histogram."""
+        self.count = 0
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = 0
+        self.serialization_time = 0
+        self.buckets = buckets
+        self.histogram = [0] * (len(buckets) + 1)
+
+    def add(self, event):
+        """Add the event to statistics."""
+        self.count += 1
+        self.round_trips += event.round_trips
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.latency += event.latency
+        self.serialization_time += event.serialization_time
+        self.histogram[bisect.bisect_left(self.buckets, event.latency)] += 1
+
+    def __repr__(self):
+        """Return string representation of OperationStats instance."""
+        return '{0}(count={1}, round_trips={2}, latency={3:.6f})'.format(
+            self.__class__.__name__, self.count, self.round_trips, self.latency,
+        )
+
+
+class StatsObserver(Observer):
+    """
+    Observer aggregating events in memory.
+
+    ``operations`` maps (binding, method, key pattern) to OperationStats.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Start with no statistics."""
+        self.buckets = buckets
+        self.operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, event):
+        """Add the event to statistics of its operation."""
+        operation = (event.binding, event.method, event.key_pattern)
+        with self._lock:
+            if operation not in self.operations:
+                self.operations[operation] = OperationStats(self.buckets)
+            self.operations[operation].add(event)
+
+    def clear(self):
+        """Remove all statistics."""
+        with self._lock:
+            self.operations.clear()
+
+
+class PrometheusObserver(Observer):
+    """Observer exporting events as Prometheus metrics."""
+
+    def __init__(self, registry=None, namespace='redistypes', buckets=DEFAULT_BUCKETS):
+        """Create metrics in the ``registry``, the default one if not given."""
+        import prometheus_client
+
+        counter = partial(
+            prometheus_client.Counter,
+            labelnames=('binding', 'method', 'key_pattern'),
+            namespace=namespace,
+            registry=registry or prometheus_client.REGISTRY,
+        )
+        histogram = partial(prometheus_client.Histogram, buckets=buckets, **counter.keywords)
+        self.operations = counter('operations', 'Binding operations')
+        self.round_trips = counter('round_trips', 'Round trips to Redis')
+        self.bytes_sent = counter('sent_bytes', 'Payload bytes sent to Redis')
+        self.bytes_received = counter('received_bytes', 'Payload bytes received from Redis')
+        self.latency = histogram('operation_seconds', 'Operation latency')
+        self.serialization_time = histogram(
+            'serialization_seconds', 'Time spent outside Redis calls',
+        )
+
+    def record(self, event):
+        """Update metrics labeled by the binding, the method and the key pattern."""
+        labels = (event.binding, event.method, event.key_pattern or '')
+        self.operations.labels(*labels).inc()
+        self.round_trips.labels(*labels).inc(event.round_trips)
+        self.bytes_sent.labels(*labels).inc(event.bytes_sent)
+        self.bytes_received.labels(*labels).inc(event.bytes_received)
+        self.latency.labels(*labels).observe(event.latency)
+        self.serialization_time.labels(*labels).observe(event.serialization_time)
+
+
+class OpenTelemetryObserver(Observer):
+    """Observer exporting events as OpenTelemetry metrics."""
+
+    def __init__(self, meter=None):
+        """Create instruments by ``meter``, the global 'redistypes' meter if not given."""
+        from opentelemetry import metrics
+
+        meter = meter or metrics.get_meter('redistypes')
+        self.operations = meter.create_counter('redistypes.operations')
+        self.round_trips = meter.create_counter('redistypes.round_trips')
+        self.bytes_sent = meter.create_counter('redistypes.sent', unit='By')
+        self.bytes_received = meter.create_counter('redistypes.received', unit='By')
+        self.latency = meter.create_histogram('redistypes.operation.duration', unit='s')
+        self.serialization_time = meter.create_histogram(
+            'redistypes.serialization.duration', unit='s',
+        )
+
+    def record(self, event):
+        """Update instruments with the binding, the method and the key pattern attributes."""
+        attributes = {
+            'binding': event.binding,
+            'method': event.method,
+            'key_pattern': event.key_pattern or '',
+        }
+        self.operations.add(1, attributes)
+        self.round_trips.add(event.round_trips, attributes)
+        self.bytes_sent.add(event.bytes_sent, attributes)
+        self.bytes_received.add(event.bytes_received, attributes)
+        self.latency.record(event.latency, attributes)
+        self.serialization_time.record(event.serialization_time, attributes)
@@ -0,0 +1,108 @@
+"""
+Keyspace scanning.
+
+Finds keys matching a pattern by SCAN, binds them to RedisList or RedisDict without checking
+their types one by one, and reads them by pipelines in a bounded thread pool.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from .bindings import RedisDict, RedisList
+from .pickling import decode_many, decode_mapping
+
+DEFAULT_COUNT = 1000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 4
+
+BINDINGS = {b'list': RedisList, b'hash': RedisDict}
+
+
+def scan_bindings(redis_connection, match, count=DEFAULT_COUNT, type_name=None, pickling=True):
+    """
+    Yield bindings of keys matching the pattern ``match``: RedisList or RedisDict.
+
+    Keys are scanned by SCAN with the ``count`` hint. If ``type_name`` ('list' or 'hash') is
+    given, Redis filters keys by the type (requires Redis 6); otherwise types of every page of
+    keys are fetched by a single pipeline, and keys of other types are skipped. Key names are
+    returned by Redis as bytes.
+    """
+    if type_name is None:
+        yield from _scan_typed(redis_connection, match, count, pickling)
+        return
+    binding_class = BINDINGS.get(type_name.encode())
+    if binding_class is None:
+        raise ValueError('Cannot bind to "{0}"'.format(type_name))
+    for key_name in redis_connection.scan_iter(match, count, _type=type_name):
+        yield binding_class(redis_connection, key_name, pickling=pickling, validate=False)
+
+
+def read_bindings(bindings, batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS):
+    """
+    Yield (binding, value) pairs as soon as values are read: lists for lists, dicts for hashes.
+
+    Values of ``batch_size`` bindings are read by a single pipeline in a pool of ``workers``
+    threads, at most two batches per thread are read ahead. Bindings of a batch have to share
+    the Redis connection.
+    """
+    with ThreadPoolExecutor(workers) as executor:
+        pending = set()
+        for batch in _batches(bindings, batch_size):
+            pending.add(executor.submit(_read_batch, batch))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def scan_read(redis_connection, match, count=DEFAULT_COUNT, type_name=None, pickling=True):
+    """Yield (binding, value) pairs of keys matching the pattern ``match``."""
+    return read_bindings(scan_bindings(redis_connection, match, count, type_name, pickling))
+
+
+def _scan_typed(redis_connection, match, count, pickling):
+    """Yield bindings of keys matching the pattern, fetching types of every page of keys."""
+    for key_names in _batches(redis_connection.scan_iter(match, count), count):
+        pipe = redis_connection.pipeline(transaction=False)
+        for key_name in key_names:
+            pipe.type(key_name)
+        for key_name, key_type in zip(key_names, pipe.execute()):
+            if key_type in BINDINGS:
+                yield BINDINGS[key_type](
+                    redis_connection, key_name, pickling=pickling, validate=False,
+                )
+
+
+def _batches(iterable, size):
+    """Yield lists of ``size`` items of the iterable."""
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def _read_batch(batch):
+    """Return (binding, value) pairs of the bindings, read by a single pipeline."""
+    pipe = batch[0].redis.pipeline(transaction=False)
+    for binding in batch:
+        if isinstance(binding, RedisDict):
+            pipe.hgetall(binding.key_name)
+        else:
+            pipe.lrange(binding.key_name, 0, -1)
+    values = pipe.execute()
+    return [
+        (binding, _decode(binding, value))
+        for binding, value in zip(batch, values)
+    ]
+
+
+def _decode(binding, value):
+    """Decode the value read for the binding."""
+    if not binding.pickling:
+        return value
+    if isinstance(binding, RedisDict):
+        return decode_mapping(binding.codec, value)
+    return decode_many(binding.codec, value)
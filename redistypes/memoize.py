@@ -0,0 +1,391 @@
+"""
+Memoization of function results in Redis.
+
+Provides ``redis_memoize`` decorator: results are stored in Redis strings or in a RedisDict,
+served from a local LRU cache in front of Redis, and computed by a single worker at a time.
+"""
+
+import hashlib
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import ExitStack
+from functools import partial, update_wrapper
+from uuid import uuid4
+
+from redis.exceptions import WatchError
+
+from .bindings import RedisDict
+from .pickling import PICKLE_CODEC, get_codec
+from .scripting import LuaScript
+
+DEFAULT_LOCAL_SIZE = 128
+DEFAULT_LOCK_TIMEOUT = 10
+DEFAULT_WAIT_TIMEOUT = 10
+DEFAULT_POLL_INTERVAL = 0.05
+DEFAULT_SCAN_COUNT = 1000
+
+NEVER = float('inf')
+MISSING = object()
+
+# Entries are stored as the time they expire at followed by the encoded result
+_EXPIRY = struct.Struct('>d')
+
+# A call of the memoized function, ``key`` is the digest of its arguments
+_Call = namedtuple('_Call', ['key', 'args', 'kwargs'])
+
+
+def _release_lock(redis_connection, keys, args):
+    """Remove the lock if it holds the token, by a transaction watching the lock."""
+    with redis_connection.pipeline() as pipe:
+        pipe.watch(keys[0])
+        if pipe.get(keys[0]) != args[0].encode():
+            return 0
+        pipe.multi()
+        pipe.delete(keys[0])
+        try:
+            return pipe.execute()[0]
+        except WatchError:
+            return 0
+
+
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+RELEASE_LOCK = LuaScript(_RELEASE_LOCK, _release_lock)
+
+
+class MemoizeStats(object):
+    """Counters of a memoized function."""
+
+    def __init__(self):
+        """Start with zero counters."""
+        self.local_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def add(self, name):
+        """Increment the counter ``name``."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def __repr__(self):
+        """Return string representation of MemoizeStats instance."""
+        return '{0}(local_hits={1}, hits={2}, misses={3}, waits={4}, stale={5})'.format(
+            self.__class__.__name__,
+            self.local_hits,
+            self.hits,
+            self.misses,
+            self.waits,
+            self.stale,
+        )
+
+
+class MemoizedFunction(object):
+    """
+    Function with results cached in Redis, returned by ``redis_memoize``.
+
+    ``stats`` counts results served by the local cache (``local_hits``) and by Redis
+    (``hits``), computed results (``misses``), calls that waited for a result computed by
+    another worker (``waits``) and expired results served while another worker computes
+    the new one (``stale``).
+    """
+
+    def __init__(
+        self,
+        fn,
+        redis_connection,
+        key_name,
+        ttl,
+        hash_storage,
+        pickling,
+        local_size,
+        local_ttl,
+        stale_ttl,
+        lock_timeout,
+        wait_timeout,
+        poll_interval,
+    ):
+        """Keep the function and options, see ``redis_memoize``."""
+        self.codec = get_codec(pickling)
+        if self.codec is None:
+            raise ValueError('Results have to be encoded')
+        self.fn = fn
+        self.redis = redis_connection
+        self.key_name = key_name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.hash = None
+        if hash_storage:
+            self.hash = RedisDict(redis_connection, key_name, pickling=False, validate=False)
+        self.stats = MemoizeStats()
+        self._local = _LocalCache(local_size, local_ttl)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        update_wrapper(self, fn)
+
+    def cache_key(self, args, kwargs):
+        """Return the digest of call arguments identifying the result."""
+        call = PICKLE_CODEC.dumps((args, sorted(kwargs.items())))
+        return hashlib.sha256(call).hexdigest()
+
+    def invalidate(self, *args, **kwargs):
+        """Remove the result of the call with the given arguments."""
+        key = self.cache_key(args, kwargs)
+        self._local.discard(key)
+        if self.hash is None:
+            self.redis.delete(self._entry_name(key))
+        else:
+            self.hash.pop(key, None)
+
+    def clear(self):
+        """Remove all results, scanning keys of results stored in strings, but not locks."""
+        self._local.clear()
+        if self.hash is not None:
+            self.hash.clear()
+            return
+        match = self._entry_name('*')
+        key_names = []
+        for key_name in self.redis.scan_iter(match, DEFAULT_SCAN_COUNT):
+            key_names.append(key_name)
+            if len(key_names) >= DEFAULT_SCAN_COUNT:
+                self.redis.delete(*key_names)
+                key_names = []
+        if key_names:
+            self.redis.delete(*key_names)
+
+    def __call__(self, *args, **kwargs):
+        """Return the cached result, or compute it if there is none."""
+        call = _Call(self.cache_key(args, kwargs), args, kwargs)
+        value = self._local.get(call.key)
+        if value is not MISSING:
+            self.stats.add('local_hits')
+            return value
+        with self._lock:
+            event = self._inflight.get(call.key)
+            if event is None:
+                self._inflight[call.key] = threading.Event()
+        if event is not None:
+            return self._follow(event, call)
+        with ExitStack() as stack:
+            stack.callback(self._finish, call.key)
+            return self._load_or_compute(call)
+
+    def __get__(self, instance, owner):
+        """Return the function bound to ``instance`` if it is accessed as a method."""
+        if instance is None:
+            return self
+        return partial(self, instance)
+
+    def _follow(self, event, call):
+        """Wait for the result computed by another thread, then load it."""
+        self.stats.add('waits')
+        event.wait(self.wait_timeout)
+        value = self._local.get(call.key)
+        if value is not MISSING:
+            return value
+        return self._load_or_compute(call, waited=True)
+
+    def _finish(self, key):
+        """Wake up threads waiting for the result computed by this thread."""
+        with self._lock:
+            event = self._inflight.pop(key)
+        event.set()
+
+    def _load_or_compute(self, call, waited=False):
+        """Return the result stored in Redis, or compute it under the lock."""
+        expires_at, value = self._load(call.key)
+        if expires_at > time.time():
+            self.stats.add('hits')
+            self._local.put(call.key, expires_at, value)
+            return value
+        token = uuid4().hex
+        if self._acquire(call.key, token):
+            with self._releasing(call.key, token):
+                return self._compute(call)
+        if value is not MISSING:
+            self.stats.add('stale')
+            return value
+        if not waited:
+            self.stats.add('waits')
+        return self._poll(call, token)
+
+    def _poll(self, call, token):
+        """Wait for the result computed by another worker, computing it after the timeout."""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() <= deadline:
+            time.sleep(self.poll_interval)
+            if self._acquire(call.key, token):
+                with self._releasing(call.key, token):
+                    value = self._load_fresh(call.key)
+                    return self._compute(call) if value is MISSING else value
+            value = self._load_fresh(call.key)
+            if value is not MISSING:
+                return value
+        return self._compute(call)
+
+    def _acquire(self, key, token):
+        """Take the lock of the result with ``token``, return True if it is taken."""
+        px = int(self.lock_timeout * 1000)
+        return bool(self.redis.set(self._lock_name(key), token, nx=True, px=px))
+
+    def _releasing(self, key, token):
+        """Return the context releasing the lock of the result on exit."""
+        stack = ExitStack()
+        stack.callback(RELEASE_LOCK, self.redis, [self._lock_name(key)], [token])
+        return stack
+
+    def _compute(self, call):
+        """Call the function and store the result."""
+        self.stats.add('misses')
+        value = self.fn(*call.args, **call.kwargs)
+        expires_at = NEVER if self.ttl is None else time.time() + self.ttl
+        data = _EXPIRY.pack(expires_at) + self.codec.dumps(value)
+        if self.hash is not None:
+            self.hash[call.key] = data
+        else:
+            px = None
+            if self.ttl is not None:
+                px = int((self.ttl + self.stale_ttl) * 1000)
+            self.redis.set(self._entry_name(call.key), data, px=px)
+        self._local.put(call.key, expires_at, value)
+        return value
+
+    def _load(self, key):
+        """Return the expiration time and the result stored in Redis, MISSING if none."""
+        if self.hash is None:
+            data = self.redis.get(self._entry_name(key))
+        else:
+            data = self.hash.get(key)
+        if data is None:
+            return 0, MISSING
+        expires_at = _EXPIRY.unpack_from(data)[0]
+        if expires_at + self.stale_ttl <= time.time():
+            return 0, MISSING
+        return expires_at, self.codec.loads(data[_EXPIRY.size:])
+
+    def _load_fresh(self, key):
+        """Return the unexpired result stored in Redis caching it locally, MISSING if none."""
+        expires_at, value = self._load(key)
+        if expires_at <= time.time():
+            return MISSING
+        self._local.put(key, expires_at, value)
+        return value
+
+    def _entry_name(self, key):
+        """Return the name of the key storing the result, in the namespace of values."""
+        return '{0}:v:{1}'.format(self.key_name, key)
+
+    def _lock_name(self, key):
+        """Return the name of the key locking the result while it is computed."""
+        return '{0}:{1}:lock'.format(self.key_name, key)
+
+
+class _LocalCache(object):
+    """LRU cache of results and the time they expire at, shared by threads."""
+
+    def __init__(self, size, ttl):
+        """Keep up to ``size`` results for ``ttl`` seconds at most if given."""
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached result, MISSING if there is none or it has expired."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.time():
+                self.entries.pop(key)
+                return MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, expires_at, value):
+        """Cache the result, evicting the least recently used one."""
+        if not self.size:
+            return
+        if self.ttl is not None:
+            expires_at = min(expires_at, time.time() + self.ttl)
+        with self._lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        """Remove the result if it is cached."""
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """Remove all results."""
+        with self._lock:
+            self.entries.clear()
+
+
+def redis_memoize(
+    redis_connection,
+    key_name=None,
+    ttl=None,
+    hash_storage=False,
+    pickling=True,
+    local_size=DEFAULT_LOCAL_SIZE,
+    local_ttl=None,
+    stale_ttl=0,
+    lock_timeout=DEFAULT_LOCK_TIMEOUT,
+    wait_timeout=DEFAULT_WAIT_TIMEOUT,
+    poll_interval=DEFAULT_POLL_INTERVAL,
+):
+    """
+    Decorate the function to cache its results in Redis for ``ttl`` seconds (forever if None).
+
+    Results are identified by pickled call arguments and encoded by ``pickling`` (True for
+    pickle or a codec object). They are stored in keys named ``key_name:v:<digest>``, or in
+    fields of the RedisDict ``key_name`` if ``hash_storage`` is True; then expired fields
+    are not removed by Redis, only overwritten. ``key_name`` defaults to
+    'memoize:<module>.<name>' of the function.
+
+    Up to ``local_size`` results are also kept in a local LRU cache, for ``local_ttl``
+    seconds at most if given, so results changed in Redis by other processes may be seen
+    later. Locally cached results are returned as they are, not copies.
+
+    Only one worker computes a missing result: it holds a lock in Redis for
+    ``lock_timeout`` seconds at most, and threads of the same process wait for it locally.
+    Others poll Redis every ``poll_interval`` seconds, at most ``wait_timeout`` seconds,
+    then compute the result themselves. Expired results are kept ``stale_ttl`` seconds
+    more and served while the new result is being computed.
+    """
+    def decorator(fn):
+        name = key_name
+        if name is None:
+            name = 'memoize:{0}.{1}'.format(fn.__module__, fn.__qualname__)
+        return MemoizedFunction(
+            fn,
+            redis_connection,
+            name,
+            ttl,
+            hash_storage,
+            pickling,
+            local_size,
+            local_ttl,
+            stale_ttl,
+            lock_timeout,
+            wait_timeout,
+            poll_interval,
+        )
+    return decorator
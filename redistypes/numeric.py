@@ -0,0 +1,109 @@
+"""
+Numeric codec.
+
+Stores numbers as fixed-width little-endian binary values instead of pickles, and encodes or
+decodes whole chunks of them at once through ``array`` and NumPy buffers.
+"""
+
+import struct
+import sys
+from array import array
+
+
+class NumericCodec(object):
+    """
+    Codec storing numbers as packed binary values of the fixed width.
+
+    ``typecode`` is one of the ``array`` module type codes having the same size on every
+    platform: 'b', 'B', 'h', 'H', 'i', 'I', 'q', 'Q', 'f' or 'd' (the default, 8-byte float).
+    """
+
+    def __init__(self, typecode='d'):
+        """Validate the type code."""
+        self.typecode = typecode
+        self.format = '<{0}'.format(typecode)
+        self.width = struct.calcsize(self.format)
+        if array(typecode).itemsize != self.width:
+            raise ValueError('type code "{0}" has platform-dependent size'.format(typecode))
+        self._struct = struct.Struct(self.format)
+
+    def dumps(self, value):
+        """Pack a number."""
+        return self._struct.pack(value)
+
+    def loads(self, value):
+        """Unpack a number, raises a ValueError in case the value has wrong size."""
+        try:
+            return self._struct.unpack(value)[0]
+        except struct.error as e:
+            raise ValueError('Cannot unpack value', e)
+
+    def dumps_array(self, values):
+        """
+        Pack numbers of an array, a NumPy array or any iterable to the list of values.
+
+        The numbers are converted to the codec type by one call for the whole collection.
+        """
+        astype = getattr(values, 'astype', None)
+        if astype is not None:
+            data = astype(self.format, copy=False).tobytes()
+        else:
+            if not isinstance(values, array) or values.typecode != self.typecode:
+                values = array(self.typecode, values)
+            elif sys.byteorder == 'big':
+                values = array(self.typecode, values)  # copy, not to swap bytes of the argument
+            data = self._to_little_endian(values).tobytes()
+        width = self.width
+        return [
+            data[start:start + width]
+            for start in range(0, len(data), width)
+        ]
+
+    def loads_array(self, values, into=None):
+        """
+        Unpack values to the array, appending them to ``into`` if given.
+
+        Raises a ValueError in case any value has wrong size.
+        """
+        if into is None:
+            into = array(self.typecode)
+        chunk = array(self.typecode, self._join(values))
+        into.extend(self._to_little_endian(chunk))
+        return into
+
+    def loads_numpy(self, values, dtype=None):
+        """
+        Unpack values to the NumPy array, converted to ``dtype`` if given.
+
+        Raises a ValueError in case any value has wrong size.
+        """
+        import numpy
+
+        result = numpy.frombuffer(self._join(values), dtype=self.format)
+        if dtype is not None:
+            return result.astype(dtype)
+        return result
+
+    def dumps_many(self, values):
+        """Pack all numbers at once."""
+        return self.dumps_array(values)
+
+    def loads_many(self, values):
+        """Unpack all values at once, raises a ValueError in case any of them has wrong size."""
+        return self.loads_array(values).tolist()
+
+    def _join(self, values):
+        """Concatenate values, raises a ValueError in case any of them has wrong size."""
+        if not set(map(len, values)) <= {self.width}:
+            raise ValueError('Cannot unpack values of size other than {0}'.format(self.width))
+        return b''.join(values)
+
+    def _to_little_endian(self, values):
+        """Swap bytes of the array in place on big-endian platforms."""
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def __repr__(self):
+        """Return string representation of the codec."""
+        return "{0}('{1}')".format(self.__class__.__name__, self.typecode)
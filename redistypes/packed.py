@@ -0,0 +1,436 @@
+"""Provides RedisPackedList class."""
+
+from collections import namedtuple
+from collections.abc import Iterable
+from functools import partial
+
+from redis.connection import Encoder
+
+from .instrumentation import instrumented, instrumented_init
+from .pickling import PICKLE_CODEC, decode_many, dumps, encode_many, get_codec, loads
+from .transactions import (
+    DEFAULT_BACKOFF,
+    DEFAULT_RETRIES,
+    TransformConflictError,
+    TransformResult,
+    TransformSteps,
+    watch_transform,
+)
+
+DEFAULT_CHUNK_SIZE = 128
+TAIL_SUFFIX = ':tail'
+
+REDIS_TYPES = (b'list', b'none')
+
+# Encodes items the same way redis-py does when pickling is disabled
+_RAW_ENCODER = Encoder(encoding='utf-8', encoding_errors='strict', decode_responses=False)
+
+# Location of the item: the key name and the index of the item or of its chunk, the values of
+# the chunk, or the item itself if it is in the tail, and the offset of the item in values
+_Location = namedtuple('_Location', ['key_name', 'position', 'values', 'offset'])
+
+
+def _identity(value):
+    """Return the value itself."""
+    return value
+
+
+def _write_nothing(pipe, value):
+    """Queue no commands, for read-only transactions."""
+
+
+def _without(value, values):
+    """Return values with the first occurrence of value removed."""
+    try:
+        values.remove(value)
+    except ValueError:
+        raise ValueError('value not in list')
+    return values
+
+
+def _apply_at(fn, location):
+    """Replace the located item with ``fn(item)``, return the location."""
+    location.values[location.offset] = fn(location.values[location.offset])
+    return location
+
+
+def _located_item(location):
+    """Return the located item."""
+    return location.values[location.offset]
+
+
+class RedisPackedList(object):
+    """
+    Python binding to the list stored in Redis by chunks.
+
+    Has the same interface as RedisList. New items are pushed to the tail Redis list
+    ``<key_name>:tail``. As soon as the tail has ``chunk_size`` items, they are packed into a
+    single entry of the Redis list ``key_name``. Packed chunks take much less memory than an
+    entry per item, and iteration unpickles one value per chunk. Appending an item takes a
+    single round trip, except for every ``chunk_size``-th one, which packs the tail in a
+    transaction. Index lookup takes one round trip, or a transaction if the item is in the
+    packed part and the index is negative, or the tail outgrew a chunk.
+
+    Removing an item rewrites the whole list in a transaction.
+
+    ``chunk_size`` has to be the same for all bindings of the same key.
+
+    WARNING!
+    The value returned by the index lookup is a *copy* of what is in Redis. As such,
+    mutating a value in place *will not* be saved back to redis.
+    """
+
+    __slots__ = ('redis', 'key_name', 'tail_key_name', 'pickling', 'codec', 'chunk_size')
+
+    @instrumented_init
+    def __init__(
+        self,
+        redis_connection,
+        key_name,
+        iterable=None,
+        pickling=True,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initialize RedisPackedList.
+
+        Bind to values in Redis by the given key name. Validates if the values stored in
+        Redis are lists or None (empty). If ``iterable`` is given, replace stored in Redis
+        values with the iterable.
+        """
+        self.redis = redis_connection
+        self.pickling = pickling
+        self.codec = get_codec(pickling)
+        self.key_name = key_name
+        self.tail_key_name = '{0}{1}'.format(key_name, TAIL_SUFFIX)
+        self.chunk_size = chunk_size
+        pipe = self.redis.pipeline()
+        if iterable is not None:
+            if not isinstance(iterable, Iterable):
+                raise ValueError('values are not iterable')
+            pipe.delete(self.key_name, self.tail_key_name)
+            self._queue_values(pipe, list(iterable))
+            pipe.execute()
+        else:
+            pipe.type(self.key_name)
+            pipe.type(self.tail_key_name)
+            for key_type in pipe.execute():
+                if key_type not in REDIS_TYPES:
+                    raise TypeError('Cannot bind to "{0}"'.format(key_type))
+
+    @instrumented
+    def append(self, value):
+        """Append value to the end of list."""
+        if self.redis.rpush(self.tail_key_name, self._encode(value)) >= self.chunk_size:
+            try:
+                self._pack_tail([])
+            except TransformConflictError:
+                # The tail stays unpacked, it is packed by one of the next appends
+                return
+
+    @instrumented
+    def copy(self):
+        """Return a copy of the list."""
+        return list(self)
+
+    @instrumented
+    def extend(self, iterable):
+        """Extend list by appending elements from the iterable."""
+        values = list(iterable)
+        if len(values) >= self.chunk_size:
+            self._pack_tail(values)
+        elif values:
+            length = self.redis.rpush(self.tail_key_name, *self._encode_many(values))
+            if length >= self.chunk_size:
+                self._pack_tail([])
+
+    @instrumented
+    def remove(self, value):
+        """
+        Remove first occurrence of value.
+
+        Raises ValueError if the value is not present.
+        """
+        self._watch(TransformSteps(
+            read=self._read_all, fn=partial(_without, value), write=self._write_all,
+        ))
+
+    @instrumented
+    def pop(self):
+        """
+        Remove and return last item.
+
+        Raises IndexError if list is empty.
+        """
+        item = self.redis.rpop(self.tail_key_name)
+        if item is not None:
+            return self._decode(item)
+        steps = TransformSteps(read=self._read_last, fn=_identity, write=self._write_pop)
+        return self._watch(steps).value[1][-1]
+
+    @instrumented
+    def transform(self, index, fn, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+        """
+        Replace item by index with ``fn(item)`` atomically.
+
+        Works the same way as RedisList.transform.
+        """
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        steps = TransformSteps(
+            read=partial(self._locate, index), fn=partial(_apply_at, fn), write=self._write_at,
+        )
+        result = self._watch(steps, retries, backoff)
+        return TransformResult(_located_item(result.value), result.conflicts)
+
+    @instrumented
+    def __contains__(self, item):
+        """Return True if the list has an item ``item``, else False."""
+        return item in list(self)
+
+    @instrumented
+    def __getitem__(self, index):
+        """
+        Get item by index, or slice from list.
+
+        x.__getitem__(y) <==> x[y]
+        """
+        if isinstance(index, slice):
+            return list(self)[index]
+        if not isinstance(index, int):
+            raise TypeError('invalid index type')
+        return self._get_index(index)
+
+    @instrumented
+    def __setitem__(self, index, value):
+        """
+        Set item to list by index.
+
+        x.__setitem__(index, value) <==> x[index]=value
+        """
+        try:
+            self.transform(index, lambda _: value)
+        except IndexError:
+            raise IndexError('list assignment index out of range')
+
+    @instrumented
+    def __len__(self):
+        """
+        Return length of the list.
+
+        x.__len__() <==> len(x)
+        """
+        pipe = self.redis.pipeline()
+        pipe.llen(self.key_name)
+        pipe.llen(self.tail_key_name)
+        chunks, tail_length = pipe.execute()
+        return chunks * self.chunk_size + tail_length
+
+    @instrumented
+    def __iter__(self):
+        """
+        Return an iterator object.
+
+        x.__iter__() <==> iter(x)
+        """
+        pipe = self.redis.pipeline()
+        pipe.lrange(self.key_name, 0, -1)
+        pipe.lrange(self.tail_key_name, 0, -1)
+        return iter(self._decode_all(*pipe.execute()))
+
+    @instrumented
+    def __eq__(self, other):
+        """
+        Compare self RedisPackedList with other object.
+
+        x.__eq__(y) <==> x==y
+        """
+        if isinstance(other, self.__class__):
+            return self.key_name == other.key_name or list(self) == list(other)
+        return False
+
+    @instrumented
+    def __repr__(self):
+        """
+        Return string representation of the RedisPackedList object.
+
+        x.__repr__() <==> repr(x)
+        """
+        return '{0}: {1}'.format(self.__class__.__name__, list(self))
+
+    def _encode(self, value):
+        """Encode the item to be stored in the tail."""
+        if self.codec:
+            return self.codec.dumps(value)
+        return _RAW_ENCODER.encode(value)
+
+    def _decode(self, item):
+        """Decode the item stored in the tail."""
+        return self.codec.loads(item) if self.codec else item
+
+    def _encode_many(self, values):
+        """Encode items to be stored in the tail."""
+        if self.codec:
+            return encode_many(self.codec, values)
+        return [_RAW_ENCODER.encode(value) for value in values]
+
+    def _decode_many(self, items):
+        """Decode items stored in the tail."""
+        return decode_many(self.codec, items) if self.codec else list(items)
+
+    def _pack(self, values):
+        """Return the chunk of values."""
+        if self.codec is PICKLE_CODEC:
+            return dumps(values)
+        return dumps(self._encode_many(values))
+
+    def _unpack(self, chunk):
+        """Return values of the chunk."""
+        values = loads(chunk)
+        if self.codec is PICKLE_CODEC or not self.codec:
+            return values
+        return decode_many(self.codec, values)
+
+    def _decode_all(self, chunks, tail):
+        """Return values of all chunks and the tail."""
+        values = []
+        for chunk in chunks:
+            values.extend(self._unpack(chunk))
+        values.extend(self._decode_many(tail))
+        return values
+
+    def _queue_values(self, pipe, values):
+        """Queue commands appending ``values`` to the list, assuming the tail is empty."""
+        size = len(values) - len(values) % self.chunk_size
+        if size:
+            pipe.rpush(self.key_name, *[
+                self._pack(values[start:start + self.chunk_size])
+                for start in range(0, size, self.chunk_size)
+            ])
+        if len(values) > size:
+            pipe.rpush(self.tail_key_name, *self._encode_many(values[size:]))
+
+    def _pack_tail(self, values):
+        """Pack the tail followed by ``values`` into chunks in a transaction."""
+        self._watch(TransformSteps(
+            read=partial(self._read_tail, values), fn=_identity, write=self._write_tail,
+        ))
+
+    def _read_all(self, pipe):
+        """Return all values read by the watching pipeline."""
+        chunks = pipe.lrange(self.key_name, 0, -1)
+        return self._decode_all(chunks, pipe.lrange(self.tail_key_name, 0, -1))
+
+    def _write_all(self, pipe, values):
+        """Queue commands replacing all values of the list."""
+        pipe.delete(self.key_name, self.tail_key_name)
+        self._queue_values(pipe, values)
+
+    def _read_tail(self, values, pipe):
+        """Return values of the tail followed by ``values``."""
+        return self._decode_many(pipe.lrange(self.tail_key_name, 0, -1)) + values
+
+    def _write_tail(self, pipe, values):
+        """Queue commands packing the tail replaced by ``values``."""
+        pipe.delete(self.tail_key_name)
+        self._queue_values(pipe, values)
+
+    def _read_last(self, pipe):
+        """Return (True, [last item]) if the tail is not empty, else (False, last chunk)."""
+        if pipe.llen(self.tail_key_name):
+            return True, [self._decode(pipe.lindex(self.tail_key_name, -1))]
+        chunk = pipe.lindex(self.key_name, -1)
+        if chunk is None:
+            raise IndexError('pop from empty list')
+        return False, self._unpack(chunk)
+
+    def _write_pop(self, pipe, last):
+        """Queue commands popping the last item, moving the rest of its chunk to the tail."""
+        from_tail, values = last
+        if from_tail:
+            pipe.rpop(self.tail_key_name)
+        else:
+            pipe.rpop(self.key_name)
+            if len(values) > 1:
+                pipe.rpush(self.tail_key_name, *self._encode_many(values[:-1]))
+
+    def _write_at(self, pipe, location):
+        """Queue the command setting the located item, or its whole chunk."""
+        if location.key_name == self.tail_key_name:
+            item = self._encode(_located_item(location))
+        else:
+            item = self._pack(location.values)
+        pipe.lset(location.key_name, location.position, item)
+
+    def _read_index(self, index):
+        """
+        Return lengths of the packed list and the tail, and items the index may point to.
+
+        A non-negative index may point to its chunk or, if there are no more chunks, to the
+        tail item at its offset, so both are read. A negative one may point to the tail item.
+        """
+        pipe = self.redis.pipeline()
+        pipe.llen(self.key_name)
+        pipe.llen(self.tail_key_name)
+        if index >= 0:
+            position, offset = divmod(index, self.chunk_size)
+            pipe.lindex(self.key_name, position)
+            pipe.lindex(self.tail_key_name, offset)
+        else:
+            pipe.lindex(self.tail_key_name, index)
+        return pipe.execute()
+
+    def _get_index(self, index):
+        """
+        Return the item by index read in one round trip.
+
+        Falls back to the transaction if the item is packed and the index is negative, or
+        the tail is longer than a chunk, as the position depends on the lengths read.
+        """
+        replies = self._read_index(index)
+        position, offset = divmod(index, self.chunk_size)
+        packed_length = replies[0] * self.chunk_size
+        tail_length = replies[1]
+        if not -packed_length - tail_length <= index < packed_length + tail_length:
+            raise IndexError('list index out of range')
+        if index < -tail_length:
+            return self._get_watched(index)
+        if index < 0:
+            return self._decode(replies[2])
+        if index < packed_length:
+            return self._unpack(replies[2])[offset]
+        if position == replies[0]:
+            return self._decode(replies[3])
+        return self._get_watched(index)
+
+    def _get_watched(self, index):
+        """Return the item by index read in a transaction, so the chunks are not shifted."""
+        steps = TransformSteps(
+            read=partial(self._locate, index), fn=_identity, write=_write_nothing,
+        )
+        return _located_item(self._watch(steps).value)
+
+    def _locate(self, index, pipe):
+        """
+        Return _Location of the item by index read by the watching pipeline.
+
+        The values are the whole chunk if the item is packed, else the item itself.
+        """
+        packed_length = pipe.llen(self.key_name) * self.chunk_size
+        length = packed_length + pipe.llen(self.tail_key_name)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        if index < packed_length:
+            position, offset = divmod(index, self.chunk_size)
+            values = self._unpack(pipe.lindex(self.key_name, position))
+            return _Location(self.key_name, position, values, offset)
+        position = index - packed_length
+        values = [self._decode(pipe.lindex(self.tail_key_name, position))]
+        return _Location(self.tail_key_name, position, values, 0)
+
+    def _watch(self, steps, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+        """Run the transaction watching both keys."""
+        key_names = (self.key_name, self.tail_key_name)
+        return watch_transform(self.redis, key_names, steps, retries, backoff)
@@ -1,8 +1,13 @@
 """Common pickling functions."""
 
 import pickle
+import struct
 from functools import partial
 
+# Batches of that many values and more are split into chunks if an executor is given
+PARALLEL_MIN_SIZE = 100000
+PARALLEL_CHUNK_SIZE = 20000
+
 
 def loads(value):
     """Unpickles value, raises a ValueError in case anything fails."""
@@ -15,3 +20,140 @@ def loads(value):
 
 # Serialize pickle dumps using the highest pickle protocol (binary, by default uses ascii)
 dumps = partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# Pickles of floats and short strings differ by the value bytes and the frame size only
+_FLOAT_HEAD = dumps(float())[:-9]
+_STR_HEAD = dumps('')[:3]
+_STR_TAIL = dumps('')[-2:]
+_STR_FRAME = struct.Struct('<QcB')
+_SHORT_STR_SIZE = 256
+
+
+def _dumps_floats(values):
+    """Pickle floats by packing them all at once."""
+    data = struct.pack('>{0}d'.format(len(values)), *values)
+    return [
+        _FLOAT_HEAD + data[start:start + 8] + b'.'
+        for start in range(0, len(data), 8)
+    ]
+
+
+def _dumps_strs(values):
+    """Pickle short strings by encoding them directly, return None if any string is long."""
+    try:
+        encoded = [value.encode() for value in values]
+    except UnicodeEncodeError:
+        return None
+    sizes = list(map(len, encoded))
+    if max(sizes, default=0) >= _SHORT_STR_SIZE:
+        return None
+    frame = _STR_FRAME.pack
+    return [
+        _STR_HEAD + frame(size + 4, b'\x8c', size) + value + _STR_TAIL
+        for value, size in zip(encoded, sizes)
+    ]
+
+
+# Batch encoders by the types of all values
+_BATCH_ENCODERS = {(float,): _dumps_floats, (str,): _dumps_strs}
+
+
+def _parallel(executor, fn, values):
+    """Apply ``fn`` to chunks of values by the executor, return the joined results."""
+    chunks = [
+        values[start:start + PARALLEL_CHUNK_SIZE]
+        for start in range(0, len(values), PARALLEL_CHUNK_SIZE)
+    ]
+    results = []
+    for chunk in executor.map(fn, chunks):
+        results.extend(chunk)
+    return results
+
+
+def dumps_many(values, executor=None):
+    """
+    Pickle all values, the same way as ``[dumps(value) for value in values]`` does.
+
+    Batches of floats only or short strings only are encoded without calling the pickler
+    per value. If ``executor`` (e.g. ``concurrent.futures.ProcessPoolExecutor``) is given,
+    batches of PARALLEL_MIN_SIZE values and more are pickled by chunks in the executor.
+    """
+    values = list(values)
+    if executor is not None and len(values) >= PARALLEL_MIN_SIZE:
+        return _parallel(executor, dumps_many, values)
+    encoder = _BATCH_ENCODERS.get(tuple(set(map(type, values))))
+    encoded = encoder(values) if encoder else None
+    if encoded is None:
+        return list(map(dumps, values))
+    return encoded
+
+
+def loads_many(values, executor=None):
+    """
+    Unpickle all values, raises a ValueError in case anything fails.
+
+    If ``executor`` is given, batches of PARALLEL_MIN_SIZE values and more are unpickled by
+    chunks in the executor.
+    """
+    values = list(values)
+    if executor is not None and len(values) >= PARALLEL_MIN_SIZE:
+        return _parallel(executor, loads_many, values)
+    try:
+        return list(map(pickle.loads, values))
+    except Exception as e:
+        raise ValueError('Cannot unpickle value', e)
+
+
+def encode_many(codec, values):
+    """Encode values by the codec, by a single call if the codec supports batches."""
+    codec_dumps_many = getattr(codec, 'dumps_many', None)
+    if codec_dumps_many is not None:
+        return codec_dumps_many(values)
+    return list(map(codec.dumps, values))
+
+
+def decode_many(codec, values):
+    """Decode values by the codec, by a single call if the codec supports batches."""
+    codec_loads_many = getattr(codec, 'loads_many', None)
+    if codec_loads_many is not None:
+        return codec_loads_many(values)
+    return list(map(codec.loads, values))
+
+
+def encode_mapping(codec, mapping):
+    """Return the dictionary of keys and values of ``mapping`` encoded by the codec."""
+    keys = encode_many(codec, mapping.keys())
+    return dict(zip(keys, encode_many(codec, mapping.values())))
+
+
+def decode_mapping(codec, mapping):
+    """Return the dictionary of keys and values of ``mapping`` decoded by the codec."""
+    keys = decode_many(codec, mapping.keys())
+    return dict(zip(keys, decode_many(codec, mapping.values())))
+
+
+class PickleCodec(object):
+    """Codec pickling values by the highest protocol."""
+
+    def __init__(self):
+        """Use the pickling functions as they are, not bound to the codec."""
+        self.dumps = dumps
+        self.loads = loads
+        self.dumps_many = dumps_many
+        self.loads_many = loads_many
+
+
+PICKLE_CODEC = PickleCodec()
+
+
+def get_codec(pickling):
+    """
+    Return the codec by the ``pickling`` argument of bindings and descriptors.
+
+    True stands for pickling, False for storing values as they are (no codec). Any other
+    value is a codec itself: an object with ``dumps`` and ``loads`` methods.
+    """
+    if pickling is True:
+        return PICKLE_CODEC
+    return pickling or None
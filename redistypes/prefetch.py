@@ -0,0 +1,85 @@
+"""
+Prefetching iteration.
+
+Fetches chunks of a data structure in a background thread while the chunks fetched before
+are being decoded, so waiting for the network overlaps with unpickling.
+"""
+
+import queue
+import threading
+from collections import deque
+from contextlib import ExitStack
+
+DEFAULT_DEPTH = 2
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+def prefetch(chunks, decode=None, depth=DEFAULT_DEPTH, executor=None):
+    """
+    Iterate over chunks of the iterator ``chunks``, decoded by ``decode`` if given.
+
+    ``chunks`` is consumed in a background thread, at most ``depth`` chunks ahead of the
+    chunk being decoded, which caps memory. Chunks are decoded in the calling thread, or by
+    ``executor`` (e.g. ``concurrent.futures.ProcessPoolExecutor``) if given, ``depth`` chunks
+    at a time. Exceptions raised by ``chunks`` are raised by the iteration.
+    """
+    fetched = queue.Queue(depth)
+    stopped = threading.Event()
+    thread = threading.Thread(target=_fetch, args=(chunks, fetched, stopped), daemon=True)
+    thread.start()
+    with ExitStack() as stack:
+        # Stop the fetching thread as soon as the iteration is over, closed or failed
+        stack.callback(stopped.set)
+        if executor is None or decode is None:
+            for chunk in _receive(fetched):
+                yield decode(chunk) if decode else chunk
+        else:
+            yield from _decode_by_executor(_receive(fetched), decode, depth, executor)
+
+
+def _fetch(chunks, fetched, stopped):
+    """Put chunks to the queue until they are over or the iteration is stopped."""
+    try:
+        for chunk in chunks:
+            if not _put(fetched, (chunk, None), stopped):
+                return
+    except Exception as e:
+        _put(fetched, (None, e), stopped)
+        return
+    _put(fetched, _DONE, stopped)
+
+
+def _put(fetched, item, stopped):
+    """Put the item to the queue, return False if the iteration is stopped first."""
+    while not stopped.is_set():
+        try:
+            fetched.put(item, timeout=_POLL_INTERVAL)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _receive(fetched):
+    """Yield chunks from the queue, raise the exception of the fetching thread if any."""
+    while True:
+        item = fetched.get()
+        if item is _DONE:
+            return
+        chunk, error = item
+        if error is not None:
+            raise error
+        yield chunk
+
+
+def _decode_by_executor(chunks, decode, depth, executor):
+    """Yield chunks decoded by the executor, keeping at most ``depth`` chunks in flight."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(decode, chunk))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
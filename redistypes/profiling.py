@@ -0,0 +1,140 @@
+"""
+Detection of N+1 access patterns.
+
+Within the NPlusOneDetector scope, every operation of the bindings and the descriptors is
+recorded with the code location it was called from. Operations repeatedly made from the
+same location, each sending a single command in its own round trip, are reported as N+1
+patterns: they could have been batched into one round trip.
+"""
+
+import inspect
+import logging
+import os
+import threading
+import traceback
+from collections import OrderedDict, namedtuple
+from contextlib import ContextDecorator
+
+from .instrumentation import Observer, add_observer, remove_observer
+
+DEFAULT_THRESHOLD = 3
+
+LOGGER = logging.getLogger(__name__)
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SUGGESTIONS = {
+    'GET': 'read values of all instances with one MGET or in a pipeline',
+    'SET': 'write values of all instances with one MSET or in a pipeline',
+    'TYPE': 'bind the keys in a pipeline instead of one by one',
+    'HGET': 'read the fields with RedisDict.get_many (one HMGET), or the keys in a pipeline',
+    'HSET': 'update the fields with RedisDict.set_many (one HSET), or the keys in a pipeline',
+    'HEXISTS': 'check the fields with RedisDict.contains_many, or the keys in a pipeline',
+    'HDEL': 'delete the fields with RedisDict.delete_many (one HDEL), or the keys in a pipeline',
+    'LINDEX': 'read a slice or iterate over the list instead of indexing in a loop',
+    'RPUSH': 'append the items with RedisList.extend, or to the keys in a pipeline',
+}
+DEFAULT_SUGGESTION = 'send the commands in a pipeline'
+
+NPlusOne = namedtuple('NPlusOne', [
+    'location',
+    'binding',
+    'method',
+    'key_pattern',
+    'command',
+    'count',
+    'keys',
+    'stack',
+    'suggestion',
+])
+
+
+def _caller():
+    """Return the frame of the code calling redistypes."""
+    frame = inspect.currentframe().f_back
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+    return frame
+
+
+class _Calls(object):
+    """Repeated calls of the same shape from one location."""
+
+    def __init__(self, frame):
+        """Keep the stack of the first call."""
+        self.count = 0
+        self.keys = set()
+        self.stack = ''.join(traceback.format_stack(frame, limit=5))
+
+
+class NPlusOneDetector(Observer, ContextDecorator):
+    """
+    Context manager and decorator detecting N+1 access patterns.
+
+    Only operations made by the thread that entered the scope are taken into account. The
+    same detector should not be entered by several threads at once.
+
+    On exit, detected patterns are logged as warnings by ``logger``, if it is not None.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, logger=LOGGER):
+        """Report patterns repeated at least ``threshold`` times."""
+        self.threshold = threshold
+        self.logger = logger
+        self.thread = None
+        self.calls = OrderedDict()
+
+    def __enter__(self):
+        """Start recording operations of the current thread."""
+        self.thread = threading.get_ident()
+        self.calls = OrderedDict()
+        add_observer(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop recording and log detected patterns."""
+        remove_observer(self)
+        if self.logger is not None:
+            for pattern in self.report():
+                self.logger.warning(
+                    'N+1 pattern: %s.%s sent %s %d times at %s, %s\n%s',
+                    pattern.binding,
+                    pattern.method,
+                    pattern.command,
+                    pattern.count,
+                    pattern.location,
+                    pattern.suggestion,
+                    pattern.stack,
+                )
+
+    def record(self, event):
+        """Count the single round trip operation at the location of its caller."""
+        if threading.get_ident() != self.thread:
+            return
+        if event.round_trips != 1 or len(event.commands) != 1:
+            return
+        frame = _caller()
+        location = '{0}:{1} in {2}'.format(
+            frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name,
+        ) if frame is not None else None
+        shape = (location, event.binding, event.method, event.key_pattern, event.commands[0])
+        if shape not in self.calls:
+            self.calls[shape] = _Calls(frame)
+        calls = self.calls[shape]
+        calls.count += 1
+        calls.keys.add(event.key_name)
+
+    def report(self):
+        """Return the list of NPlusOne patterns, the most repeated first."""
+        patterns = [
+            NPlusOne(
+                *shape,
+                count=calls.count,
+                keys=len(calls.keys),
+                stack=calls.stack,
+                suggestion=SUGGESTIONS.get(shape[-1], DEFAULT_SUGGESTION),
+            )
+            for shape, calls in self.calls.items()
+            if calls.count >= self.threshold
+        ]
+        return sorted(patterns, key=lambda pattern: pattern.count, reverse=True)
@@ -0,0 +1,234 @@
+"""
+Read replica routing.
+
+Provides ReadWriteRouter: a client sending read-only commands to a replica and the rest to
+the primary, to be passed to bindings and descriptors instead of the Redis client.
+"""
+
+import time
+from contextlib import ExitStack
+from functools import partial
+
+DEFAULT_WINDOW = 1.0
+DEFAULT_WAIT_TIMEOUT = 100
+
+CONSISTENCY_PRIMARY = 'primary'
+CONSISTENCY_WAIT = 'wait'
+CONSISTENCY_LEVELS = (None, CONSISTENCY_PRIMARY, CONSISTENCY_WAIT)
+
+# Methods of the Redis client sending read-only commands
+READ_COMMANDS = frozenset((
+    'exists',
+    'get',
+    'hexists',
+    'hget',
+    'hgetall',
+    'hkeys',
+    'hlen',
+    'hmget',
+    'hscan',
+    'hscan_iter',
+    'hstrlen',
+    'hvals',
+    'lindex',
+    'llen',
+    'lpos',
+    'lrange',
+    'mget',
+    'scan',
+    'scan_iter',
+    'strlen',
+    'type',
+))
+
+# Methods of the Redis client sending commands that modify data, scripts may do it as well
+WRITE_COMMANDS = frozenset((
+    'append',
+    'decr',
+    'decrby',
+    'delete',
+    'eval',
+    'evalsha',
+    'expire',
+    'expireat',
+    'flushall',
+    'flushdb',
+    'getset',
+    'hdel',
+    'hincrby',
+    'hincrbyfloat',
+    'hmset',
+    'hset',
+    'hsetnx',
+    'incr',
+    'incrby',
+    'incrbyfloat',
+    'linsert',
+    'lmove',
+    'lpop',
+    'lpush',
+    'lpushx',
+    'lrem',
+    'lset',
+    'ltrim',
+    'mset',
+    'msetnx',
+    'persist',
+    'pexpire',
+    'pexpireat',
+    'psetex',
+    'rename',
+    'renamenx',
+    'rpop',
+    'rpoplpush',
+    'rpush',
+    'rpushx',
+    'set',
+    'setex',
+    'setnx',
+    'setrange',
+    'unlink',
+))
+
+
+class _WriteTrackingPipeline(object):
+    """Proxy of the pipeline calling ``on_write`` when it executes queued write commands."""
+
+    def __init__(self, pipeline, on_write):
+        """Wrap the pipeline."""
+        self.pipeline = pipeline
+        self.on_write = on_write
+        self.writes = False
+
+    def __enter__(self):
+        """Enter the pipeline context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Reset the pipeline."""
+        self.pipeline.__exit__(*exc_info)
+
+    def __len__(self):
+        """Return the number of queued commands."""
+        return len(self.pipeline)
+
+    def __getattr__(self, name):
+        """Return the pipeline attribute, tracking write commands called through it."""
+        attribute = getattr(self.pipeline, name)
+        if not callable(attribute):
+            return attribute
+        if name == 'execute':
+            return partial(self._execute, attribute)
+        return partial(self._call, name, attribute)
+
+    def _call(self, name, method, *args, **kwargs):
+        """Call the pipeline method, return the proxy instead of the pipeline itself."""
+        if name in WRITE_COMMANDS:
+            self.writes = True
+        reply = method(*args, **kwargs)
+        return self if reply is self.pipeline else reply
+
+    def _execute(self, execute, *args, **kwargs):
+        """Execute the pipeline, call ``on_write`` if any write command was queued."""
+        if not self.writes:
+            return execute(*args, **kwargs)
+        self.writes = False
+        with ExitStack() as stack:
+            # The writes could be made even if the pipeline raised an error
+            stack.callback(self.on_write)
+            return execute(*args, **kwargs)
+
+
+def _write(command, on_write, *args, **kwargs):
+    """Send the write command, call ``on_write`` after it."""
+    with ExitStack() as stack:
+        # The write could be made even if the command raised an error
+        stack.callback(on_write)
+        return command(*args, **kwargs)
+
+
+def _tracking_pipeline(pipeline, on_write, *args, **kwargs):
+    """Return the pipeline calling ``on_write`` when it executes write commands."""
+    return _WriteTrackingPipeline(pipeline(*args, **kwargs), on_write)
+
+
+class ReadWriteRouter(object):
+    """
+    Redis client routing read-only commands to ``read_connection``, others to the primary.
+
+    Pipelines and transactions always go to the primary. The ``consistency`` option sets
+    what a client reads after its own writes:
+
+    * None: reads always go to the replica, so they may miss the latest writes;
+    * 'primary': reads go to the primary for ``window`` seconds after a write;
+    * 'wait': every write command is followed by WAIT for ``replicas`` replicas, at most
+      ``wait_timeout`` milliseconds, on the same connection. Writes made by pipelines are
+      not waited for, reads go to the primary for ``window`` seconds after them instead.
+
+    Write commands are the ones of WRITE_COMMANDS, and pipelines executing any of them. Other
+    methods of the primary client, e.g. ``lock``, are returned as they are.
+    """
+
+    def __init__(
+        self,
+        write_connection,
+        read_connection,
+        consistency=None,
+        window=DEFAULT_WINDOW,
+        replicas=1,
+        wait_timeout=DEFAULT_WAIT_TIMEOUT,
+    ):
+        """Validate the consistency option."""
+        if consistency not in CONSISTENCY_LEVELS:
+            raise ValueError('Unknown consistency "{0}"'.format(consistency))
+        self.write_connection = write_connection
+        self.read_connection = read_connection
+        self.consistency = consistency
+        self.window = window
+        self.replicas = replicas
+        self.wait_timeout = wait_timeout
+        self._written_at = None
+
+    @classmethod
+    def from_sentinel(cls, sentinel, service_name, **kwargs):
+        """Return the router to the primary and replicas of the service monitored by Sentinel."""
+        return cls(sentinel.master_for(service_name), sentinel.slave_for(service_name), **kwargs)
+
+    def __getattr__(self, name):
+        """Return the method of the connection to send the command ``name`` to."""
+        if name in READ_COMMANDS:
+            return getattr(self._read_client(), name)
+        command = getattr(self.write_connection, name)
+        if name == 'pipeline' and self.consistency is not None:
+            return partial(_tracking_pipeline, command, self._mark_written)
+        if self.consistency is None or name not in WRITE_COMMANDS:
+            return command
+        if self.consistency == CONSISTENCY_WAIT:
+            return partial(self._write_and_wait, name)
+        return partial(_write, command, self._mark_written)
+
+    def _read_client(self):
+        """Return the primary during the window after the last write, else the replica."""
+        written_at = self._written_at
+        if written_at is not None and time.monotonic() - written_at < self.window:
+            return self.write_connection
+        return self.read_connection
+
+    def _mark_written(self):
+        """Remember the time of the last write."""
+        self._written_at = time.monotonic()
+
+    def _write_and_wait(self, name, *args, **kwargs):
+        """
+        Send the command followed by WAIT through the same connection.
+
+        Errors are raised as the command alone raises them, not rewritten by the pipeline.
+        """
+        pipe = self.write_connection.pipeline(transaction=False)
+        getattr(pipe, name)(*args, **kwargs)
+        pipe.wait(self.replicas, self.wait_timeout)
+        results = pipe.execute(raise_on_error=False)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results[0]
@@ -0,0 +1,308 @@
+"""
+Server-side filtering and projection.
+
+Lua scripts select items of lists and hashes by a prefix or a substring, and extract values
+of JSON items by a path, so only matching items are sent back. Scripts are cached by Redis:
+they are called by EVALSHA, and sent by EVAL only the first time. Every call processes one
+chunk of items, so a script never blocks Redis for long. Clients unable to run scripts,
+as FakeRedis, run their Python fallbacks instead.
+"""
+
+import hashlib
+import json
+from itertools import chain
+
+from redis.exceptions import NoScriptError
+
+DEFAULT_SCRIPT_CHUNK_SIZE = 1000
+
+MISSING = object()
+
+_HELPERS = """
+local function matches(value, prefix, substring)
+    if prefix ~= '' and string.sub(value, 1, #prefix) ~= prefix then
+        return false
+    end
+    return substring == '' or string.find(value, substring, 1, true) ~= nil
+end
+
+-- JSON is scanned as text, so values are sent as stored: decoding them by cjson would round
+-- numbers to doubles and could not tell empty arrays from empty objects.
+local function skip_space(text, position)
+    return string.find(text, '[^%s]', position) or #text + 1
+end
+
+local function skip_string(text, position)
+    local index = position + 1
+    while true do
+        local found = string.find(text, '["\\\\]', index)
+        if string.sub(text, found, found) == '"' then
+            return found + 1
+        end
+        index = found + 2
+    end
+end
+
+local function skip_value(text, position)
+    local first = string.sub(text, position, position)
+    if first == '"' then
+        return skip_string(text, position)
+    end
+    if first ~= '{' and first ~= '[' then
+        local _, last = string.find(text, '^[^,%]}%s]+', position)
+        return last + 1
+    end
+    local depth = 0
+    local index = position
+    repeat
+        local found = string.find(text, '[%[%]{}"]', index)
+        local char = string.sub(text, found, found)
+        index = found + 1
+        if char == '"' then
+            index = skip_string(text, found)
+        elseif char == '{' or char == '[' then
+            depth = depth + 1
+        else
+            depth = depth - 1
+        end
+    until depth == 0
+    return index
+end
+
+local function next_element(text, position)
+    position = skip_space(text, skip_value(text, position))
+    if string.sub(text, position, position) ~= ',' then
+        return nil
+    end
+    return skip_space(text, position + 1)
+end
+
+local function array_child(text, position, key)
+    if not string.match(key, '^%d+$') then
+        return nil
+    end
+    position = skip_space(text, position + 1)
+    if string.sub(text, position, position) == ']' then
+        return nil
+    end
+    for _ = 1, tonumber(key) do
+        position = next_element(text, position)
+        if position == nil then
+            return nil
+        end
+    end
+    return position
+end
+
+local function object_child(text, position, key)
+    local child = nil
+    position = skip_space(text, position + 1)
+    while position ~= nil and string.sub(text, position, position) == '"' do
+        local after = skip_string(text, position)
+        local name = cjson.decode(string.sub(text, position, after - 1))
+        position = skip_space(text, skip_space(text, after) + 1)
+        if name == key then
+            child = position
+        end
+        position = next_element(text, position)
+    end
+    return child
+end
+
+local function extract(item, path)
+    local position = skip_space(item, 1)
+    for key in string.gmatch(path, '[^.]+') do
+        local first = string.sub(item, position, position)
+        if first == '[' then
+            position = array_child(item, position, key)
+        elseif first == '{' then
+            position = object_child(item, position, key)
+        else
+            position = nil
+        end
+        if position == nil then
+            return false
+        end
+    end
+    return string.sub(item, position, skip_value(item, position) - 1)
+end
+
+local function project(item, path)
+    if path == '' then
+        return item
+    end
+    if not pcall(cjson.decode, item) then
+        return false
+    end
+    local ok, value = pcall(extract, item, path)
+    return ok and value
+end
+"""
+
+_FILTER_LIST = _HELPERS + """
+local items = redis.call('LRANGE', KEYS[1], ARGV[1], ARGV[2])
+local result = {#items}
+for _, item in ipairs(items) do
+    if matches(item, ARGV[3], ARGV[4]) then
+        local value = project(item, ARGV[5])
+        if value then
+            result[#result + 1] = value
+        end
+    end
+end
+return result
+"""
+
+_FILTER_HASH = _HELPERS + """
+local reply = redis.call('HSCAN', KEYS[1], ARGV[1], 'COUNT', ARGV[2])
+local result = {reply[1]}
+local items = reply[2]
+for index = 1, #items, 2 do
+    if matches(items[index], ARGV[3], ARGV[4]) then
+        local value = project(items[index + 1], ARGV[5])
+        if value then
+            result[#result + 1] = items[index]
+            result[#result + 1] = value
+        end
+    end
+end
+return result
+"""
+
+
+class LuaScript(object):
+    """
+    Lua script called by its SHA1 digest, loaded to Redis on the first call.
+
+    ``fallback`` is the function called with the same arguments and returning the same
+    reply by clients having ``scripting`` set to False.
+    """
+
+    def __init__(self, source, fallback=None):
+        """Compute the digest of the script."""
+        self.source = source
+        self.fallback = fallback
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    def __call__(self, redis_connection, keys, args):
+        """Run the script, sending its source only if Redis has not cached it yet."""
+        if self.fallback is not None and getattr(redis_connection, 'scripting', None) is False:
+            return self.fallback(redis_connection, keys, args)
+        try:
+            return redis_connection.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            return redis_connection.eval(self.source, len(keys), *keys, *args)
+
+
+def _filter_list_fallback(redis_connection, keys, args):
+    """Return the reply of the list filtering script, selecting items fetched by LRANGE."""
+    start, stop, *options = args
+    items = redis_connection.lrange(keys[0], start, stop)
+    selected = _select(zip(items, items), *options)
+    return [len(items), *(value for _, value in selected)]
+
+
+def _filter_hash_fallback(redis_connection, keys, args):
+    """Return the reply of the hash filtering script, selecting fields fetched by HSCAN."""
+    cursor, count, *options = args
+    cursor, fields = redis_connection.hscan(keys[0], cursor, count=count)
+    selected = _select(fields.items(), *options)
+    return [cursor, *chain.from_iterable(selected)]
+
+
+def _select(pairs, prefix, substring, path):
+    """Yield (name, item) pairs matching by name, with items projected by the path."""
+    for name, item in pairs:
+        if _matches(name, prefix, substring):
+            value = _project(item, path)
+            if value is not None:
+                yield name, value
+
+
+def _matches(value, prefix, substring):
+    """Return True if the value starts with the prefix and has the substring, as in Lua."""
+    return value.startswith(_bytes(prefix)) and _bytes(substring) in value
+
+
+def _project(item, path):
+    """Return the JSON value extracted from the item by the path, None if there is none."""
+    if not path:
+        return item
+    try:
+        value = json.loads(item)
+    except ValueError:
+        return None
+    for key in filter(None, path.split('.')):
+        value = _child(value, key)
+        if value is MISSING:
+            return None
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _child(value, key):
+    """Return the element of the JSON array or object by the key of the path, or MISSING."""
+    if isinstance(value, list):
+        if key.isdigit() and int(key) < len(value):
+            return value[int(key)]
+        return MISSING
+    if isinstance(value, dict):
+        return value.get(key, MISSING)
+    return MISSING
+
+
+def _bytes(value):
+    """Return the string argument as bytes."""
+    return value if isinstance(value, bytes) else value.encode()
+
+
+FILTER_LIST = LuaScript(_FILTER_LIST, _filter_list_fallback)
+FILTER_HASH = LuaScript(_FILTER_HASH, _filter_hash_fallback)
+
+
+def filter_list(binding, prefix, substring, path, chunk_size):
+    """Return items of the RedisList selected in Redis, see ``RedisList.filter``."""
+    _check_raw(binding)
+    args = _filter_args(prefix, substring, path)
+    items = []
+    start = 0
+    while True:
+        scanned, *values = FILTER_LIST(
+            binding.redis, [binding.key_name], [start, start + chunk_size - 1, *args],
+        )
+        items.extend(_projected(values, path))
+        if scanned < chunk_size:
+            return items
+        start += chunk_size
+
+
+def filter_hash(binding, prefix, substring, path, chunk_size):
+    """Return items of the RedisDict selected in Redis, see ``RedisDict.filter``."""
+    _check_raw(binding)
+    args = _filter_args(prefix, substring, path)
+    items = {}
+    cursor = 0
+    while True:
+        reply = FILTER_HASH(binding.redis, [binding.key_name], [cursor, chunk_size, *args])
+        fields = reply[1::2]
+        items.update(zip(fields, _projected(reply[2::2], path)))
+        cursor = int(reply[0])
+        if not cursor:
+            return items
+
+
+def _check_raw(binding):
+    """Raise TypeError if items of the binding are encoded, so cannot be matched in Redis."""
+    if binding.pickling:
+        raise TypeError('Cannot filter encoded items, use pickling=False')
+
+
+def _filter_args(prefix, substring, path):
+    """Return script arguments, empty strings for omitted ones."""
+    return [prefix or '', substring or '', path or '']
+
+
+def _projected(values, path):
+    """Return values decoded from JSON if they were extracted by the path."""
+    if not path:
+        return values
+    return [json.loads(value) for value in values]
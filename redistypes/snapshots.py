@@ -0,0 +1,176 @@
+"""
+Local snapshots of bindings.
+
+Snapshots fetch the whole data structure once, by chunks, and serve all read operations
+locally, so repeated reads make no round trips.
+"""
+
+from collections.abc import Mapping, Sequence
+
+from .instrumentation import instrumented
+from .pickling import decode_many, decode_mapping
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_list_chunks(redis_list, chunk_size):
+    """Yield lists of stored items of the list, fetching ``chunk_size`` items per round trip."""
+    start = 0
+    while True:
+        chunk = redis_list.redis.lrange(redis_list.key_name, start, start + chunk_size - 1)
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        start += chunk_size
+
+
+def iter_hash_chunks(redis_dict, chunk_size):
+    """Yield dictionaries of stored items of the hash, about ``chunk_size`` per round trip."""
+    cursor = None
+    while cursor != 0:
+        cursor, chunk = redis_dict.redis.hscan(
+            redis_dict.key_name, cursor or 0, count=chunk_size,
+        )
+        if chunk:
+            yield chunk
+
+
+class RedisListSnapshot(Sequence):
+    """
+    Read-only local copy of the RedisList.
+
+    Call ``refresh`` to fetch changes made after the snapshot was taken.
+    """
+
+    def __init__(self, redis_list, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Fetch all items of ``redis_list`` by ``chunk_size`` items per round trip."""
+        self.redis = redis_list.redis
+        self.key_name = redis_list.key_name
+        self.pickling = redis_list.pickling
+        self.codec = redis_list.codec
+        self.chunk_size = chunk_size
+        self._items = []
+        self.refresh(full=True)
+
+    @instrumented
+    def refresh(self, full=False):
+        """
+        Fetch changes of the list.
+
+        Unless ``full`` is True, only items beyond the last known length are fetched, which
+        is enough for lists growing by appending only. If the list got shorter, it is
+        fetched again entirely.
+        """
+        start = 0 if full else len(self._items)
+        pipe = self.redis.pipeline()
+        pipe.llen(self.key_name)
+        pipe.lrange(self.key_name, start, start + self.chunk_size - 1)
+        length, chunk = pipe.execute()
+        if length < start:
+            return self.refresh(full=True)
+        if full:
+            self._items.clear()
+        while chunk:
+            start += len(chunk)
+            if self.pickling:
+                chunk = decode_many(self.codec, chunk)
+            self._items.extend(chunk)
+            if start >= length:
+                break
+            chunk = self.redis.lrange(
+                self.key_name, start, start + self.chunk_size - 1,
+            )
+
+    def __getitem__(self, index):
+        """
+        Get item by index, or slice as a list.
+
+        x.__getitem__(y) <==> x[y]
+        """
+        return self._items[index]
+
+    def __len__(self):
+        """
+        Return length of the snapshot.
+
+        x.__len__() <==> len(x)
+        """
+        return len(self._items)
+
+    def __iter__(self):
+        """
+        Return an iterator object.
+
+        x.__iter__() <==> iter(x)
+        """
+        return iter(self._items)
+
+    def __contains__(self, item):
+        """Return True if the snapshot has an item ``item``, else False."""
+        return item in self._items
+
+    def __eq__(self, other):
+        """
+        Compare items of the snapshot with items of the other snapshot or list.
+
+        x.__eq__(y) <==> x==y
+        """
+        if isinstance(other, self.__class__):
+            other = list(other)
+        return isinstance(other, list) and self._items == other
+
+    def __repr__(self):
+        """Return string representation of the snapshot."""
+        return '{0}: {1}'.format(self.__class__.__name__, self._items)
+
+
+class RedisDictSnapshot(Mapping):
+    """
+    Read-only local copy of the RedisDict.
+
+    Call ``refresh`` to fetch the hash again.
+    """
+
+    def __init__(self, redis_dict, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Fetch all items of ``redis_dict`` by about ``chunk_size`` items per round trip."""
+        self.redis = redis_dict.redis
+        self.key_name = redis_dict.key_name
+        self.pickling = redis_dict.pickling
+        self.codec = redis_dict.codec
+        self.chunk_size = chunk_size
+        self._items = {}
+        self.refresh()
+
+    @instrumented
+    def refresh(self):
+        """Fetch all items of the hash by HSCAN."""
+        self._items.clear()
+        for chunk in iter_hash_chunks(self, self.chunk_size):
+            if self.pickling:
+                chunk = decode_mapping(self.codec, chunk)
+            self._items.update(chunk)
+
+    def __getitem__(self, key):
+        """
+        Return the item of the snapshot with key ``key``.
+
+        Raises a KeyError if key is not in the map.
+        """
+        return self._items[key]
+
+    def __len__(self):
+        """Return the number of items in the snapshot."""
+        return len(self._items)
+
+    def __iter__(self):
+        """Return an iterator over the keys of the snapshot."""
+        return iter(self._items)
+
+    def __contains__(self, key):
+        """Return True if the snapshot has a key ``key``, else False."""
+        return key in self._items
+
+    def __repr__(self):
+        """Return string representation of the snapshot."""
+        return '{0}: {1}'.format(self.__class__.__name__, self._items)
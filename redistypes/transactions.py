@@ -0,0 +1,70 @@
+"""
+Optimistic transactions.
+
+Provides read-modify-write helpers built on top of Redis WATCH/MULTI/EXEC.
+"""
+
+import random
+import time
+from collections import namedtuple
+
+from redis import WatchError
+
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 0.001
+
+TransformResult = namedtuple('TransformResult', ['value', 'conflicts'])
+
+# Callables of a transform: ``read(pipe)``, ``fn(value)`` and ``write(pipe, value)``
+TransformSteps = namedtuple('TransformSteps', ['read', 'fn', 'write'])
+
+
+class TransformConflictError(WatchError):
+    """Raised when a transform has not been applied within the allowed number of retries."""
+
+    def __init__(self, key_name, conflicts):
+        """Keep the key name and the number of conflicts met."""
+        super().__init__(
+            'Cannot transform "{0}" after {1} conflicts'.format(key_name, conflicts),
+        )
+        self.key_name = key_name
+        self.conflicts = conflicts
+
+
+def watch_transform(redis_connection, key_name, steps, retries, backoff):
+    """
+    Apply ``steps.fn`` to the value of ``key_name`` atomically.
+
+    ``key_name`` may also be a tuple of key names to be watched together.
+
+    ``steps.read(pipe)`` is called while the key is watched and returns the current value,
+    ``steps.write(pipe, value)`` queues the commands storing ``fn`` result inside MULTI. If
+    the key is modified by someone else in between, the transaction is retried after a
+    random exponential backoff, at most ``retries`` times.
+
+    Returns TransformResult with the new value and the number of conflicts met. Raises
+    TransformConflictError when retries are exhausted.
+    """
+    key_names = key_name if isinstance(key_name, tuple) else (key_name,)
+    conflicts = 0
+    with redis_connection.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(*key_names)
+                value = steps.fn(steps.read(pipe))
+                pipe.multi()
+                steps.write(pipe, value)
+                pipe.execute()
+            except WatchError:
+                conflicts += 1
+                if conflicts > retries:
+                    raise TransformConflictError(key_name, conflicts)
+                time.sleep(_backoff_delay(backoff, conflicts))
+            else:
+                return TransformResult(value, conflicts)
+
+
+def _backoff_delay(backoff, conflicts):
+    """Return a random delay before the next attempt, growing exponentially with conflicts."""
+    limit = backoff * 2 ** (conflicts - 1)
+    return random.uniform(0, limit)
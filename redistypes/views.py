@@ -0,0 +1,207 @@
+"""
+Lazy views of RedisDict.
+
+Views fetch nothing until used: ``len`` makes HLEN, ``in`` makes HEXISTS or HGET, iteration
+fetches the hash by HSCAN chunks. Set operations with small collections look up only their
+elements in the hash instead of fetching it.
+"""
+
+from collections.abc import ItemsView, Iterable, KeysView, Set, ValuesView
+from functools import partial
+from itertools import chain
+
+from .pickling import decode_many
+from .snapshots import DEFAULT_CHUNK_SIZE, iter_hash_chunks
+
+MISSING = object()
+
+
+class _RedisDictSetView(object):
+    """
+    Set operations of a view, sending no more data than needed.
+
+    Operations that need elements of the view only if they are in the other collection
+    (``&``, ``isdisjoint``, ``>=``, ``==``, ``other - view``) look up elements of the
+    other collection in the hash by one round trip. Other operations fetch the view by
+    chunks and return regular sets. As for dict views, the other operand of ``&``, ``|``,
+    ``^`` and ``-`` may be any iterable, comparisons require a set.
+    """
+
+    __slots__ = ()
+
+    def _found(self, elements):
+        """Return the set of ``elements`` which are in the view."""
+        raise NotImplementedError
+
+    def _iter_chunks(self):
+        """Yield lists of elements of the view, fetched by HSCAN chunks."""
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Iterate over elements, fetching them by HSCAN chunks."""
+        return chain.from_iterable(self._iter_chunks())
+
+    def isdisjoint(self, other):
+        """Return True if the view and ``other`` have no elements in common."""
+        return not self._found(other)
+
+    def __and__(self, other):
+        """Return the set of elements of ``other`` which are in the view."""
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return self._found(other)
+
+    __rand__ = __and__
+
+    def __or__(self, other):
+        """Return the set of elements of the view and ``other``."""
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return set(self) | set(other)
+
+    __ror__ = __or__
+
+    def __xor__(self, other):
+        """Return the set of elements either of the view or of ``other``."""
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return set(self) ^ set(other)
+
+    __rxor__ = __xor__
+
+    def __sub__(self, other):
+        """Return the set of elements of the view which are not in ``other``."""
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return set(self) - set(other)
+
+    def __rsub__(self, other):
+        """Return the set of elements of ``other`` which are not in the view."""
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        other = set(other)
+        return other - self._found(other)
+
+    def __le__(self, other):
+        """Return True if all elements of the view are in ``other``."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        if len(self) > len(other):
+            return False
+        if isinstance(other, _RedisDictSetView):
+            return all(map(partial(_has_all, other), self._iter_chunks()))
+        return all(element in other for element in self)
+
+    def __ge__(self, other):
+        """Return True if all elements of ``other`` are in the view."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        if len(self) < len(other):
+            return False
+        return _has_all(self, other)
+
+    def __lt__(self, other):
+        """Return True if the view is a proper subset of ``other``."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return len(self) < len(other) and self <= other
+
+    def __gt__(self, other):
+        """Return True if the view is a proper superset of ``other``."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return len(self) > len(other) and self >= other
+
+    def __eq__(self, other):
+        """Return True if the view and ``other`` have the same elements."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return len(self) == len(other) and self >= other
+
+
+class RedisDictKeysView(_RedisDictSetView, KeysView):
+    """Lazy view of keys of RedisDict."""
+
+    __slots__ = ()
+
+    def _found(self, elements):
+        """Return the set of ``elements`` which are keys of the hash."""
+        found = self._mapping.contains_many(elements)
+        return {key for key, is_found in found.items() if is_found}
+
+    def _iter_chunks(self):
+        """Yield lists of keys, fetched by HSCAN chunks."""
+        mapping = self._mapping
+        for chunk in iter_hash_chunks(mapping, DEFAULT_CHUNK_SIZE):
+            yield decode_many(mapping.codec, chunk) if mapping.pickling else list(chunk)
+
+    def __repr__(self):
+        """Return string representation of the view."""
+        return '{0}({1!r})'.format(self.__class__.__name__, self._mapping.key_name)
+
+
+class RedisDictItemsView(_RedisDictSetView, ItemsView):
+    """Lazy view of (key, value) pairs of RedisDict."""
+
+    __slots__ = ()
+
+    def _found(self, elements):
+        """Return the set of ``elements`` which are (key, value) pairs of the hash."""
+        pairs = [
+            element for element in elements
+            if isinstance(element, tuple) and len(element) == 2
+        ]
+        if not pairs:
+            return set()
+        values = self._mapping.get_many([key for key, _ in pairs], default=MISSING)
+        found = {key: value for key, value in values.items() if value is not MISSING}
+        return {pair for pair in pairs if pair in found.items()}
+
+    def _iter_chunks(self):
+        """Yield lists of (key, value) pairs, fetched by HSCAN chunks and decoded as pairs."""
+        mapping = self._mapping
+        for chunk in iter_hash_chunks(mapping, DEFAULT_CHUNK_SIZE):
+            if not mapping.pickling:
+                yield list(chunk.items())
+                continue
+            keys = decode_many(mapping.codec, list(chunk))
+            values = decode_many(mapping.codec, list(chunk.values()))
+            yield list(zip(keys, values))
+
+    def __contains__(self, item):
+        """Return True if ``item`` is a (key, value) pair of the hash, fetched by HGET."""
+        return bool(self._found([item]))
+
+    def __repr__(self):
+        """Return string representation of the view."""
+        return '{0}({1!r})'.format(self.__class__.__name__, self._mapping.key_name)
+
+
+class RedisDictValuesView(ValuesView):
+    """Lazy view of values of RedisDict."""
+
+    __slots__ = ()
+
+    def _iter_chunks(self):
+        """Yield lists of values, fetched by HSCAN chunks."""
+        mapping = self._mapping
+        for chunk in iter_hash_chunks(mapping, DEFAULT_CHUNK_SIZE):
+            values = list(chunk.values())
+            yield decode_many(mapping.codec, values) if mapping.pickling else values
+
+    def __contains__(self, value):
+        """Return True if the hash has the value, stopping at the first matching chunk."""
+        return any(value in chunk for chunk in self._iter_chunks())
+
+    def __iter__(self):
+        """Iterate over values, fetching them by HSCAN chunks."""
+        return chain.from_iterable(self._iter_chunks())
+
+    def __repr__(self):
+        """Return string representation of the view."""
+        return '{0}({1!r})'.format(self.__class__.__name__, self._mapping.key_name)
+
+
+def _has_all(view, elements):
+    """Return True if all ``elements`` are in the view, looked up by one round trip."""
+    return len(view & elements) == len(elements)
@@ -1,15 +1,42 @@
 import pytest
 import redis
 
+from redistypes.fake import FakeRedis
+
 REDIS_TEST_KEY_NAME = 'redis_key_name'
 VAL_1 = 'VAL_1'
 VAL_2 = 'VAL_2'
 VAL_3 = 'VAL_3'
 
 
+def pytest_addoption(parser):
+    """Add the option running tests without Redis."""
+    parser.addoption(
+        '--fake-redis', action='store_true', help='use in-memory FakeRedis instead of Redis',
+    )
+
+
+def pytest_configure(config):
+    """Register the marker of tests needing Redis."""
+    config.addinivalue_line('markers', 'server: test needs Redis, skipped with --fake-redis')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests needing Redis if tests are run with --fake-redis."""
+    if not config.getoption('--fake-redis'):
+        return
+    skip = pytest.mark.skip(reason='needs Redis')
+    for item in items:
+        if 'server' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture()
-def r():
-    """Redis client."""
+def r(request):
+    """Redis client, or FakeRedis if tests are run with --fake-redis."""
+    if request.config.getoption('--fake-redis'):
+        yield FakeRedis()
+        return
     client = redis.Redis(host='localhost', port=6379, db=9)
     client.flushdb()
     yield client
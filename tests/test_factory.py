@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+
+from redistypes import RedisDict, RedisList
+from redistypes.factory import AutoFlushPipeline, BindingFactory
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2
+
+REDIS_TEST_URL = 'redis://localhost:6379/9'
+
+pytestmark = pytest.mark.server
+
+
+@pytest.fixture
+def factory(r):
+    """BindingFactory of the test database."""
+    with BindingFactory(REDIS_TEST_URL, max_connections=2, flush_size=3) as binding_factory:
+        yield binding_factory
+
+
+class TestBindingFactory(object):
+    """Test BindingFactory class."""
+
+    def test_bindings(self, factory):
+        """Should create bindings sharing the connection pool."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [VAL_1])
+        redis_dict = factory.dict('dict', {VAL_1: VAL_2}, pickling=False)
+        assert isinstance(redis_list, RedisList) and list(redis_list) == [VAL_1]
+        assert isinstance(redis_dict, RedisDict) and redis_dict[VAL_1] == VAL_2.encode()
+        assert factory.packed_list('packed', [VAL_1])[0] == VAL_1
+        assert factory.object('object', {'name': VAL_1}).name == VAL_1
+
+    def test_pool_options(self):
+        """Should create the blocking pool of the given size."""
+        binding_factory = BindingFactory(max_connections=3, socket_keepalive=False)
+        assert binding_factory.pool.max_connections == 3
+        assert binding_factory.pool.timeout == 20
+        assert binding_factory.pool.connection_kwargs['socket_keepalive'] is False
+
+    def test_shared_pool(self, factory):
+        """Should not open more connections than the pool size for many threads."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [])
+        threads = [threading.Thread(target=redis_list.append, args=(n,)) for n in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(redis_list) == list(range(20))
+        assert len(factory.pool._connections) <= 2
+
+
+class TestPipeline(object):
+    """Test per-thread auto-flushing pipelines."""
+
+    def test_flush(self, r, factory):
+        """Should send commands by ``flush_size`` and on exit."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [])
+        with factory.pipeline() as pipeline:
+            assert isinstance(pipeline, AutoFlushPipeline)
+            for item in range(4):
+                redis_list.append(item)
+            assert r.llen(REDIS_TEST_KEY_NAME) == 3
+            with factory.pipeline() as nested:
+                assert nested is pipeline
+        assert list(redis_list) == list(range(4))
+
+    def test_other_threads(self, r, factory):
+        """Should not queue commands of other threads."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [])
+        with factory.pipeline():
+            redis_list.append(VAL_1)
+            thread = threading.Thread(target=redis_list.append, args=(VAL_2,))
+            thread.start()
+            thread.join()
+            assert r.llen(REDIS_TEST_KEY_NAME) == 1
+        assert list(redis_list) == [VAL_2, VAL_1]
+
+    def test_discard_on_error(self, r, factory):
+        """Should not send commands if an exception is raised."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [])
+        with pytest.raises(KeyError):
+            with factory.pipeline():
+                redis_list.append(VAL_1)
+                raise KeyError(VAL_1)
+        assert list(redis_list) == []
+
+    def test_binding_pipelines(self, r, factory):
+        """Should queue commands of pipelines of bindings to the batch, not flushing it."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [], maxlen=2)
+        with factory.pipeline() as pipeline:
+            redis_list.append(VAL_1)
+            assert len(pipeline) == 2 and r.llen(REDIS_TEST_KEY_NAME) == 0
+            redis_list.append(VAL_2)
+            redis_list.append(VAL_2)
+            assert pipeline.connection_pool is factory.pool
+        assert list(redis_list) == [VAL_2, VAL_2]
+
+    def test_transactions(self, factory):
+        """Should raise TypeError for transactions of bindings in the batch."""
+        redis_list = factory.list(REDIS_TEST_KEY_NAME, [VAL_1, VAL_2])
+        with pytest.raises(TypeError):
+            with factory.pipeline():
+                redis_list.reverse()
+        assert list(redis_list) == [VAL_1, VAL_2]
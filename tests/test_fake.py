@@ -0,0 +1,143 @@
+import time
+
+import pytest
+from redis.exceptions import DataError, ResponseError, WatchError
+
+from redistypes import RedisDict, RedisList
+from redistypes.fake import FakeRedis, FakeServer
+from redistypes.scripting import FILTER_LIST
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2, VAL_3
+
+
+@pytest.fixture
+def fake():
+    """FakeRedis client."""
+    return FakeRedis()
+
+
+class TestFakeRedis(object):
+    """Test FakeRedis client."""
+
+    def test_bindings(self, fake):
+        """Should store bindings in memory."""
+        redis_list = RedisList(fake, REDIS_TEST_KEY_NAME, [VAL_1, VAL_2])
+        redis_list.insert(1, VAL_3)
+        redis_dict = RedisDict(fake, 'dict', {VAL_1: 1})
+        assert list(redis_list) == [VAL_1, VAL_3, VAL_2]
+        assert dict(redis_dict) == {VAL_1: 1}
+        assert sorted(fake.scan_iter()) == [b'dict', REDIS_TEST_KEY_NAME.encode()]
+
+    def test_list_commands(self, fake):
+        """Should follow Redis list semantics."""
+        fake.rpush(REDIS_TEST_KEY_NAME, 1, 2, 3, 2)
+        assert fake.lrange(REDIS_TEST_KEY_NAME, -2, 10) == [b'3', b'2']
+        assert fake.lrange(REDIS_TEST_KEY_NAME, 3, 1) == []
+        assert fake.lpos(REDIS_TEST_KEY_NAME, 2, rank=-1) == 3
+        assert fake.lpos(REDIS_TEST_KEY_NAME, 2, count=0) == [1, 3]
+        assert fake.lrem(REDIS_TEST_KEY_NAME, -1, 2) == 1
+        assert fake.linsert(REDIS_TEST_KEY_NAME, 'after', 1, 0) == 4
+        assert fake.rpop(REDIS_TEST_KEY_NAME, 2) == [b'3', b'2']
+        assert fake.lpop(REDIS_TEST_KEY_NAME, 5) == [b'1', b'0']
+        assert not fake.exists(REDIS_TEST_KEY_NAME)
+
+    def test_errors(self, fake):
+        """Should raise errors of Redis."""
+        fake.set('string', VAL_1)
+        with pytest.raises(ResponseError, match='WRONGTYPE'):
+            fake.rpush('string', VAL_2)
+        with pytest.raises(ResponseError, match='no such key'):
+            fake.lset(REDIS_TEST_KEY_NAME, 0, VAL_1)
+        fake.rpush(REDIS_TEST_KEY_NAME, VAL_1)
+        with pytest.raises(ResponseError, match='index out of range'):
+            fake.lset(REDIS_TEST_KEY_NAME, 1, VAL_1)
+
+    def test_expiration(self, fake):
+        """Should remove keys when they expire."""
+        assert fake.set(VAL_1, VAL_1, px=10)
+        assert fake.set(VAL_1, VAL_2, nx=True) is None
+        assert fake.ttl(VAL_1) == 0 and fake.ttl(VAL_2) == -2
+        time.sleep(0.02)
+        assert fake.get(VAL_1) is None
+
+    def test_shared_server(self):
+        """Should share data between clients of the same server."""
+        server = FakeServer()
+        FakeRedis(server=server).set(VAL_1, VAL_2)
+        assert FakeRedis(server=server).get(VAL_1) == VAL_2.encode()
+        assert FakeRedis().get(VAL_1) is None
+
+
+class TestRoundTrips(object):
+    """Test round trips counting and latency of FakeRedis."""
+
+    def test_count(self, fake):
+        """Should count a command or a pipeline as one round trip."""
+        RedisList(fake, REDIS_TEST_KEY_NAME, pickling=False).extend([VAL_1, VAL_2])
+        round_trips = fake.round_trips
+        with fake.pipeline() as pipe:
+            pipe.llen(REDIS_TEST_KEY_NAME).lrange(REDIS_TEST_KEY_NAME, 0, -1)
+            assert len(pipe) == 2
+            assert pipe.execute() == [2, [VAL_1.encode(), VAL_2.encode()]]
+        assert fake.round_trips == round_trips + 1
+        assert fake.bytes_sent > 0
+
+    def test_latency(self):
+        """Should wait for the latency on every round trip."""
+        fake = FakeRedis(latency=0.01)
+        started = time.monotonic()
+        fake.ping()
+        fake.pipeline().ping().ping().execute()
+        assert time.monotonic() - started >= 0.02
+        assert fake.round_trips == 2
+
+
+class TestPipeline(object):
+    """Test FakePipeline."""
+
+    def test_watch(self, fake):
+        """Should fail the transaction if a watched key has changed."""
+        with fake.pipeline() as pipe:
+            pipe.watch(REDIS_TEST_KEY_NAME)
+            assert pipe.get(REDIS_TEST_KEY_NAME) is None
+            fake.set(REDIS_TEST_KEY_NAME, VAL_1)
+            pipe.multi()
+            pipe.set(REDIS_TEST_KEY_NAME, VAL_2)
+            with pytest.raises(WatchError):
+                pipe.execute()
+        assert fake.get(REDIS_TEST_KEY_NAME) == VAL_1.encode()
+
+    def test_errors(self, fake):
+        """Should run all commands and raise the first error."""
+        fake.set('string', VAL_1)
+        pipe = fake.pipeline()
+        pipe.rpush('string', VAL_1).rpush(REDIS_TEST_KEY_NAME, VAL_1)
+        with pytest.raises(ResponseError, match='Command # 1 .* WRONGTYPE'):
+            pipe.execute()
+        assert fake.llen(REDIS_TEST_KEY_NAME) == 1
+        results = pipe.rpush('string', VAL_1).execute(raise_on_error=False)
+        assert isinstance(results[0], ResponseError)
+
+    def test_atomic(self, fake):
+        """Should undo commands of the transaction if one raises an error of arguments."""
+        fake.set(VAL_1, VAL_1)
+        versions = fake.server.versions([VAL_1])
+        pipe = fake.pipeline()
+        pipe.set(VAL_1, VAL_2).rpush(REDIS_TEST_KEY_NAME, VAL_1)
+        pipe.rpush(REDIS_TEST_KEY_NAME, object())
+        with pytest.raises(DataError):
+            pipe.execute()
+        assert fake.get(VAL_1) == VAL_1.encode() and not fake.exists(REDIS_TEST_KEY_NAME)
+        assert fake.server.versions([VAL_1]) == versions and not len(pipe)
+
+
+class TestScripts(object):
+    """Test fallbacks of Lua scripts."""
+
+    def test_fallback(self, r, fake):
+        """Should return the same reply as the script."""
+        items = ['{"name": "a", "tags": [1, 2]}', 'b', '{"name": "c"}', 'not json']
+        for client in (r, fake):
+            client.rpush(REDIS_TEST_KEY_NAME, *items)
+        args = [0, -1, '{', '', 'tags.1']
+        assert FILTER_LIST(fake, [REDIS_TEST_KEY_NAME], args) == [4, b'2']
+        assert FILTER_LIST(r, [REDIS_TEST_KEY_NAME], args) == [4, b'2']
@@ -0,0 +1,146 @@
+import pytest
+
+from redistypes import RedisDict, RedisList, instrumentation
+from redistypes.instrumentation import (
+    Observer,
+    StatsObserver,
+    add_observer,
+    default_key_pattern,
+    remove_observer,
+    set_key_pattern,
+)
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2
+from tests.test_redis_field import RedisTestField
+
+
+class CollectingObserver(Observer):
+    """Observer keeping all events."""
+
+    def __init__(self):
+        """Start with no events."""
+        self.events = []
+
+    def record(self, event):
+        """Keep the event."""
+        self.events.append(event)
+
+
+@pytest.fixture
+def observer():
+    """Observer added for the test only."""
+    collecting_observer = CollectingObserver()
+    add_observer(collecting_observer)
+    yield collecting_observer
+    remove_observer(collecting_observer)
+
+
+def test_no_observers(r):
+    """Should keep the Redis client of the binding untouched."""
+    redis_list = RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1])
+    assert redis_list.redis is r
+    assert instrumentation._registry.observers == ()
+
+
+def test_init(r, observer):
+    """Should record the validating TYPE call and keep the original client."""
+    redis_list = RedisList(r, REDIS_TEST_KEY_NAME)
+    event, = observer.events
+    assert (event.binding, event.method, event.commands) == ('RedisList', '__init__', ('TYPE',))
+    assert redis_list.redis is r
+
+
+def test_command(r, observer):
+    """Should record the command, its round trip and the sizes of payload."""
+    redis_list = RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1], pickling=False)
+    redis_list.append(VAL_2)
+    event = observer.events[-1]
+    assert event.method == 'append' and event.commands == ('RPUSH',)
+    assert event.round_trips == 1
+    assert event.bytes_sent == len(REDIS_TEST_KEY_NAME) + len(VAL_2)
+    assert event.latency >= event.serialization_time >= 0
+    assert redis_list.redis is r
+
+
+def test_pipeline(r, observer):
+    """Should record all commands of the pipeline as a single round trip."""
+    redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, {VAL_1: VAL_2})
+    assert redis_dict.pop(VAL_1) == VAL_2
+    event = observer.events[-1]
+    assert event.commands == ('HGET', 'HDEL') and event.round_trips == 1
+
+
+def test_transaction(r, observer):
+    """Should record WATCH and the immediate command as separate round trips."""
+    RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1]).transform(0, str.lower)
+    event = observer.events[-1]
+    assert event.commands == ('WATCH', 'LINDEX', 'LSET') and event.round_trips == 3
+
+
+def test_nested_operations(r, observer):
+    """Should record commands of nested operations as a part of the outer one."""
+    redis_list = RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1])
+    other_redis_list = RedisList(r, 'other_key_name', [VAL_1])
+    del observer.events[:]
+    assert redis_list == other_redis_list
+    event, = observer.events
+    assert event.method == '__eq__' and event.commands.count('LRANGE') == 2
+
+
+def test_returned_self(r, observer):
+    """Should return the binding itself, not its recording copy."""
+    redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME)
+    merged_dict = redis_dict
+    merged_dict |= {VAL_1: VAL_2}
+    assert merged_dict is redis_dict
+    assert merged_dict.redis is r
+    assert observer.events[-1].method == '__ior__'
+
+
+def test_descriptor(r, observer):
+    """Should record descriptor operations with the key pattern."""
+    class Model(object):
+        redis_field = RedisTestField(r)
+
+    Model().redis_field = VAL_1
+    event = observer.events[-1]
+    assert (event.binding, event.method) == ('RedisTestField', '__set__')
+    assert event.key_pattern == 'redis_field'
+
+
+def test_key_pattern():
+    """Should replace identifier-like parts of the key name, unless customized."""
+    assert default_key_pattern(b'Student:12:subjects') == 'Student:*:subjects'
+    set_key_pattern(str.upper)
+    try:
+        assert instrumentation.key_pattern('a:1') == 'A:1'
+    finally:
+        set_key_pattern(None)
+    assert instrumentation.key_pattern('a:1') == 'a:*'
+
+
+def test_stats_observer(r):
+    """Should aggregate events by operation."""
+    stats_observer = StatsObserver(buckets=(10,))
+    add_observer(stats_observer)
+    try:
+        redis_list = RedisList(r, 'Student:1:subjects', [VAL_1])
+        redis_list.append(VAL_2)
+        redis_list.append(VAL_2)
+    finally:
+        remove_observer(stats_observer)
+    stats = stats_observer.operations[('RedisList', 'append', 'Student:*:subjects')]
+    assert (stats.count, stats.round_trips, stats.histogram) == (2, 2, [2, 0])
+
+
+def test_prometheus_observer(r):
+    """Should update Prometheus metrics."""
+    prometheus_client = pytest.importorskip('prometheus_client')
+    registry = prometheus_client.CollectorRegistry()
+    prometheus_observer = instrumentation.PrometheusObserver(registry=registry)
+    add_observer(prometheus_observer)
+    try:
+        RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1]).append(VAL_2)
+    finally:
+        remove_observer(prometheus_observer)
+    labels = {'binding': 'RedisList', 'method': 'append', 'key_pattern': REDIS_TEST_KEY_NAME}
+    assert registry.get_sample_value('redistypes_round_trips_total', labels) == 1
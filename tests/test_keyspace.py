@@ -0,0 +1,68 @@
+import pytest
+
+from redistypes import RedisDict, RedisList
+from redistypes.keyspace import read_bindings, scan_bindings, scan_read
+
+LISTS = {'student:{0}:subjects'.format(index): ['math', index] for index in range(15)}
+HASHES = {'student:{0}:marks'.format(index): {'math': index} for index in range(5)}
+
+
+@pytest.fixture
+def keyspace(r):
+    """Lists, hashes and strings of students."""
+    for key_name, items in LISTS.items():
+        RedisList(r, key_name, items)
+    for key_name, mapping in HASHES.items():
+        RedisDict(r, key_name, mapping)
+    r.set('student:0:name', 'name')
+    return r
+
+
+def _key_names(bindings):
+    """Return key names of bindings as strings."""
+    return {binding.key_name.decode() for binding in bindings}
+
+
+class TestScanBindings(object):
+    """Test ``scan_bindings`` function."""
+
+    def test_bind_by_types(self, keyspace):
+        """Should bind lists and hashes, skipping keys of other types."""
+        bindings = list(scan_bindings(keyspace, 'student:*', count=4))
+        assert _key_names(bindings) == set(LISTS) | set(HASHES)
+        for binding in bindings:
+            key_name = binding.key_name.decode()
+            assert isinstance(binding, RedisList if key_name in LISTS else RedisDict)
+
+    def test_filter_by_type(self, keyspace):
+        """Should bind keys of the given type only."""
+        bindings = list(scan_bindings(keyspace, 'student:*', type_name='hash'))
+        assert _key_names(bindings) == set(HASHES)
+        assert all(isinstance(binding, RedisDict) for binding in bindings)
+
+    def test_unsupported_type(self, keyspace):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            list(scan_bindings(keyspace, 'student:*', type_name='string'))
+
+
+class TestReadBindings(object):
+    """Test reading values of scanned keys."""
+
+    def test_scan_read(self, keyspace):
+        """Should read and decode values of all keys."""
+        values = {
+            binding.key_name.decode(): value for binding, value in scan_read(keyspace, '*')
+        }
+        assert values == dict(LISTS, **HASHES)
+
+    def test_without_pickling(self, keyspace):
+        """Should return values as they are stored."""
+        keyspace.rpush('raw', 'item')
+        bindings = scan_bindings(keyspace, 'raw', pickling=False)
+        assert [value for _, value in read_bindings(bindings)] == [[b'item']]
+
+    def test_bounded_pool(self, keyspace):
+        """Should read all batches with a single worker."""
+        bindings = scan_bindings(keyspace, 'student:*:subjects', type_name='list')
+        assert len(list(read_bindings(bindings, batch_size=2, workers=1))) == len(LISTS)
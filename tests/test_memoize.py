@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from redistypes import RedisDict, redis_memoize
+
+
+def _counting(fn):
+    """Return the function counting its calls in ``calls`` attribute."""
+    def wrapper(*args, **kwargs):
+        wrapper.calls += 1
+        return fn(*args, **kwargs)
+    wrapper.calls = 0
+    return wrapper
+
+
+class Square(object):
+    """Picklable instance having a memoized method in tests."""
+
+    def __init__(self, side):
+        """Keep the side."""
+        self.side = side
+
+
+def _area(square):
+    """Return the area of the square."""
+    return square.side ** 2
+
+
+class TestRedisMemoize(object):
+    """Test ``redis_memoize`` decorator."""
+
+    @pytest.mark.parametrize('hash_storage', [False, True])
+    def test_cache(self, r, hash_storage):
+        """Should compute the result once, then serve it from Redis and the local cache."""
+        square = _counting(lambda x: x * x)
+        memoized = redis_memoize(r, 'square', hash_storage=hash_storage)(square)
+        assert memoized(3) == memoized(3) == 9
+        assert redis_memoize(r, 'square', hash_storage=hash_storage)(square)(3) == 9
+        assert square.calls == 1 and memoized.stats.local_hits == 1
+        if hash_storage:
+            assert len(RedisDict(r, 'square', pickling=False)) == 1
+        memoized.invalidate(3)
+        assert memoized(3) == 9 and square.calls == 2
+        memoized.clear()
+        assert r.keys('square*') == []
+
+    def test_clear_keeps_locks(self, r):
+        """Should remove results but not locks of results being computed."""
+        memoized = redis_memoize(r, 'identity')(lambda x: x)
+        memoized(1)
+        lock_name = 'identity:{0}:lock'.format(memoized.cache_key((2,), {}))
+        r.set(lock_name, 'other worker')
+        memoized.clear()
+        assert r.keys('identity*') == [lock_name.encode()]
+
+    def test_method(self, r, monkeypatch):
+        """Should bind the memoized function to the instance, identified by its pickle."""
+        area = _counting(_area)
+        monkeypatch.setattr(Square, 'area', redis_memoize(r, 'area')(area), raising=False)
+        assert Square(2).area() == Square(2).area() == 4 and Square(3).area() == 9
+        assert area.calls == 2 and Square.area.stats.local_hits == 1
+
+    def test_default_key_name(self, r):
+        """Should name keys after the function."""
+        @redis_memoize(r)
+        def answer():
+            return 42
+
+        assert answer() == 42 and answer.__name__ == 'answer'
+        assert r.keys('memoize:{0}.*'.format(__name__))
+
+    def test_ttl(self, r):
+        """Should compute the result again after it expires, serving stale one meanwhile."""
+        now = _counting(time.monotonic)
+        memoized = redis_memoize(r, 'now', ttl=0.05, stale_ttl=10, local_size=0)(now)
+        first = memoized()
+        time.sleep(0.1)
+        r.set('now:{0}:lock'.format(memoized.cache_key((), {})), 'other worker')
+        assert memoized() == first and memoized.stats.stale == 1
+        r.delete('now:{0}:lock'.format(memoized.cache_key((), {})))
+        assert memoized() != first and now.calls == 2
+
+    def test_local_lru(self, r):
+        """Should keep the given number of recent results locally."""
+        memoized = redis_memoize(r, 'identity', local_size=2)(lambda x: x)
+        for value in (1, 2, 1, 3):
+            memoized(value)
+        assert list(memoized._local.entries) == [memoized.cache_key((value,), {}) for value in (1, 3)]
+
+    def test_stampede(self, r):
+        """Should compute the result once while concurrent calls wait for it."""
+        started = threading.Event()
+
+        @_counting
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return 'result'
+
+        memoized = redis_memoize(r, 'slow', local_size=0, poll_interval=0.01)(slow)
+        other = redis_memoize(r, 'slow', poll_interval=0.01)(slow)
+        threads = [threading.Thread(target=memoized) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        started.wait(1)
+        assert other() == 'result'
+        for thread in threads:
+            thread.join()
+        assert slow.calls == 1
+        assert memoized.stats.waits == 2 and other.stats.waits == 1
+
+    def test_waits_once(self, r):
+        """Should count a call waiting for a thread, then for a process, as one wait."""
+        started = threading.Event()
+
+        @_counting
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return 'result'
+
+        memoized = redis_memoize(
+            r, 'slow', local_size=0, wait_timeout=0.05, poll_interval=0.01,
+        )(slow)
+        r.set('slow:{0}:lock'.format(memoized.cache_key((), {})), 'other worker')
+        leader = threading.Thread(target=memoized)
+        leader.start()
+        started.wait(1)
+        assert memoized() == 'result'
+        leader.join()
+        assert slow.calls == 2 and memoized.stats.waits == 2
+
+    def test_not_encoded(self, r):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            redis_memoize(r, pickling=False)(abs)
@@ -0,0 +1,97 @@
+from array import array
+
+import pytest
+
+from redistypes import NumericCodec, RedisDict, RedisList
+from tests.conftest import REDIS_TEST_KEY_NAME
+
+FLOATS = [0.5, -1.25, 3.0]
+
+
+@pytest.fixture
+def codec():
+    """Codec of 8-byte floats."""
+    return NumericCodec('d')
+
+
+@pytest.fixture
+def redis_list(r, codec):
+    """RedisList of FLOATS stored by the numeric codec."""
+    return RedisList(r, REDIS_TEST_KEY_NAME, FLOATS, pickling=codec)
+
+
+class TestNumericCodec(object):
+    """Test NumericCodec class."""
+
+    @pytest.mark.skipif(array('l').itemsize == 4, reason='long is 4 bytes on this platform')
+    def test_platform_dependent_typecode(self):
+        """Should raise ValueError for 'l', which has native size."""
+        with pytest.raises(ValueError):
+            NumericCodec('l')
+
+    def test_fixed_width(self, codec):
+        """Should pack numbers to 8 bytes."""
+        assert codec.dumps(1.5) == b'\x00\x00\x00\x00\x00\x00\xf8?'
+        assert codec.loads(codec.dumps(1.5)) == 1.5
+
+    def test_wrong_size(self, codec):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            codec.loads(b'1')
+        with pytest.raises(ValueError):
+            codec.loads_array([b'1' * 4, b'1' * 12])
+
+    def test_arrays(self, codec):
+        """Should pack and unpack arrays of numbers at once."""
+        values = codec.dumps_array(array('i', [1, 2]))
+        assert values == [codec.dumps(1), codec.dumps(2)]
+        assert codec.loads_array(values) == array('d', [1, 2])
+
+
+class TestRedisList(object):
+    """Test RedisList with the numeric codec."""
+
+    def test_items(self, r, redis_list):
+        """Should store fixed-width items."""
+        assert list(redis_list) == FLOATS and redis_list[1] == FLOATS[1]
+        assert {len(item) for item in r.lrange(REDIS_TEST_KEY_NAME, 0, -1)} == {8}
+
+    def test_to_array(self, redis_list):
+        """Should return items as array fetched by chunks."""
+        assert redis_list.to_array(chunk_size=2) == array('d', FLOATS)
+
+    def test_to_array_of_empty_list(self, r, codec):
+        """Should return an empty array."""
+        assert RedisList(r, REDIS_TEST_KEY_NAME, pickling=codec).to_array() == array('d')
+
+    def test_extend_from_array(self, redis_list):
+        """Should append numbers of the array."""
+        redis_list.extend_from_array(array('d', [4.5]))
+        redis_list.extend_from_array([])
+        assert list(redis_list) == FLOATS + [4.5]
+
+    def test_extend_capped_from_array(self, r, codec):
+        """Should keep ``maxlen`` last numbers."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, FLOATS, pickling=codec, maxlen=2)
+        redis_list.extend_from_array(array('d', [4.5]))
+        assert list(redis_list) == [FLOATS[-1], 4.5]
+
+    def test_pickling(self, r):
+        """Should raise TypeError."""
+        with pytest.raises(TypeError):
+            RedisList(r, REDIS_TEST_KEY_NAME).to_array()
+
+    def test_numpy(self, redis_list):
+        """Should return and accept NumPy arrays."""
+        numpy = pytest.importorskip('numpy')
+        redis_list.extend_from_array(numpy.arange(2, dtype='int32'))
+        result = redis_list.to_numpy(dtype='float32', chunk_size=2)
+        assert result.dtype == numpy.float32
+        assert result.tolist() == FLOATS + [0, 1]
+
+
+def test_redis_dict(r, codec):
+    """Should store both keys and values as numbers."""
+    redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, {1: 0.5}, pickling=codec)
+    redis_dict[2] = 1.5
+    assert dict(redis_dict.items()) == {1.0: 0.5, 2.0: 1.5}
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+import redistypes
+
+
+class TestLazyImport(object):
+    """Test lazy loading of the package attributes."""
+
+    def test_import_without_redis(self):
+        """Should not import redis-py until a binding is accessed."""
+        code = (
+            'import sys, redistypes; '
+            'assert "redis" not in sys.modules and "redistypes.bindings" not in sys.modules; '
+            'redistypes.NumericCodec; assert "redis" not in sys.modules; '
+            'redistypes.RedisList; assert "redis" in sys.modules'
+        )
+        subprocess.check_call([sys.executable, '-c', code])
+
+    def test_attributes(self):
+        """Should return public classes and list them by ``dir``."""
+        from redistypes.bindings import RedisDict
+        assert redistypes.RedisDict is RedisDict
+        assert set(redistypes.__all__) <= set(dir(redistypes))
+
+    def test_unknown_attribute(self):
+        """Should raise AttributeError."""
+        with pytest.raises(AttributeError):
+            redistypes.RedisSet
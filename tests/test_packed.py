@@ -0,0 +1,166 @@
+import pytest
+
+from redistypes import NumericCodec, RedisPackedList
+from redistypes.fake import FakeRedis
+from redistypes.packed import TAIL_SUFFIX
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2
+
+CHUNK_SIZE = 4
+ITEMS = ['item_{0}'.format(index) for index in range(10)]
+TAIL_KEY_NAME = REDIS_TEST_KEY_NAME + TAIL_SUFFIX
+
+
+@pytest.fixture
+def packed_list(r):
+    """RedisPackedList of ten items packed by four."""
+    return RedisPackedList(r, REDIS_TEST_KEY_NAME, ITEMS, chunk_size=CHUNK_SIZE)
+
+
+class TestInit(object):
+    """Test ``__init__`` method."""
+
+    def test_init_with_not_iterable_data_type(self, r):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            RedisPackedList(r, REDIS_TEST_KEY_NAME, 1)
+
+    def test_bind_to_wrong_type(self, r):
+        """Should raise TypeError if any of the keys is not a list."""
+        r.set(TAIL_KEY_NAME, 1)
+        with pytest.raises(TypeError):
+            RedisPackedList(r, REDIS_TEST_KEY_NAME)
+
+    def test_pack_iterable(self, r, packed_list):
+        """Should store full chunks in the list and the rest in the tail."""
+        assert r.llen(REDIS_TEST_KEY_NAME) == 2
+        assert r.llen(TAIL_KEY_NAME) == 2
+        assert list(packed_list) == ITEMS
+        assert list(RedisPackedList(r, REDIS_TEST_KEY_NAME, chunk_size=CHUNK_SIZE)) == ITEMS
+
+
+class TestAppend(object):
+    """Test appending items."""
+
+    def test_append(self, r, packed_list):
+        """Should pack the tail when it is full."""
+        packed_list.append(VAL_1)
+        assert r.llen(TAIL_KEY_NAME) == 3
+        packed_list.append(VAL_2)
+        assert r.llen(REDIS_TEST_KEY_NAME) == 3
+        assert r.llen(TAIL_KEY_NAME) == 0
+        assert list(packed_list) == ITEMS + [VAL_1, VAL_2]
+
+    def test_extend(self, r, packed_list):
+        """Should pack the tail with the new items."""
+        packed_list.extend([VAL_1])
+        packed_list.extend(ITEMS)
+        assert r.llen(REDIS_TEST_KEY_NAME) == 5
+        assert r.llen(TAIL_KEY_NAME) == 1
+        assert list(packed_list) == ITEMS + [VAL_1] + ITEMS
+        assert len(packed_list) == 21
+
+
+class TestGetItem(object):
+    """Test ``__getitem__`` method."""
+
+    def test_get_by_index(self, packed_list):
+        """Should get items of both chunks and the tail by any index."""
+        for index in range(-len(ITEMS), len(ITEMS)):
+            assert packed_list[index] == ITEMS[index]
+
+    def test_get_tail_in_one_round_trip(self):
+        """Should read an item of the tail by a non-negative index in one round trip."""
+        fake = FakeRedis()
+        packed_list = RedisPackedList(fake, REDIS_TEST_KEY_NAME, ITEMS, chunk_size=CHUNK_SIZE)
+        round_trips = fake.round_trips
+        assert packed_list[len(ITEMS) - 1] == ITEMS[-1]
+        assert packed_list[0] == ITEMS[0]
+        assert fake.round_trips == round_trips + 2
+
+    def test_get_from_long_tail(self, r):
+        """Should get items of the tail longer than a chunk."""
+        packed_list = RedisPackedList(
+            r, REDIS_TEST_KEY_NAME, ITEMS, pickling=False, chunk_size=CHUNK_SIZE,
+        )
+        r.rpush(TAIL_KEY_NAME, *ITEMS)
+        items = ITEMS + ITEMS
+        for index in range(-len(items), len(items)):
+            assert packed_list[index] == items[index].encode()
+
+    def test_index_out_of_range(self, packed_list):
+        """Should raise IndexError."""
+        with pytest.raises(IndexError):
+            packed_list[len(ITEMS)]
+        with pytest.raises(IndexError):
+            packed_list[-len(ITEMS) - 1]
+
+    def test_slice(self, packed_list):
+        """Should return a list."""
+        assert packed_list[3:9:2] == ITEMS[3:9:2]
+
+
+class TestModify(object):
+    """Test modifying items."""
+
+    def test_set_item(self, packed_list):
+        """Should replace items in chunks and in the tail."""
+        packed_list[5] = VAL_1
+        packed_list[-1] = VAL_2
+        assert list(packed_list) == ITEMS[:5] + [VAL_1] + ITEMS[6:-1] + [VAL_2]
+
+    def test_set_item_out_of_range(self, packed_list):
+        """Should raise IndexError."""
+        with pytest.raises(IndexError):
+            packed_list[len(ITEMS)] = VAL_1
+
+    def test_transform(self, packed_list):
+        """Should return the new item."""
+        assert packed_list.transform(1, str.upper).value == ITEMS[1].upper()
+        assert packed_list[1] == ITEMS[1].upper()
+
+    def test_pop(self, r, packed_list):
+        """Should pop items from the tail, then unpack the last chunk into the tail."""
+        assert [packed_list.pop() for _ in range(3)] == ITEMS[:-4:-1]
+        assert r.llen(REDIS_TEST_KEY_NAME) == 1
+        assert r.llen(TAIL_KEY_NAME) == 3
+        assert list(packed_list) == ITEMS[:-3]
+
+    def test_pop_from_empty_list(self, r):
+        """Should raise IndexError."""
+        with pytest.raises(IndexError):
+            RedisPackedList(r, REDIS_TEST_KEY_NAME).pop()
+
+    def test_remove(self, r, packed_list):
+        """Should repack the rest of items."""
+        packed_list.remove(ITEMS[0])
+        assert list(packed_list) == ITEMS[1:]
+        assert r.llen(TAIL_KEY_NAME) == 1
+        with pytest.raises(ValueError):
+            packed_list.remove(VAL_1)
+
+
+class TestCodecs(object):
+    """Test packing items without pickling or with codecs."""
+
+    def test_without_pickling(self, r):
+        """Should store items as bytes."""
+        packed_list = RedisPackedList(r, REDIS_TEST_KEY_NAME, ITEMS, pickling=False, chunk_size=4)
+        assert packed_list[0] == ITEMS[0].encode()
+        assert list(packed_list) == [item.encode() for item in ITEMS]
+
+    def test_numeric_codec(self, r):
+        """Should decode items of chunks with the codec."""
+        packed_list = RedisPackedList(
+            r, REDIS_TEST_KEY_NAME, [0.5] * 5, pickling=NumericCodec(), chunk_size=4,
+        )
+        packed_list[0] = 1.5
+        assert list(packed_list) == [1.5] + [0.5] * 4
+
+
+def test_eq(r, packed_list):
+    """Should compare items of packed lists."""
+    other = RedisPackedList(r, 'other', ITEMS, chunk_size=3)
+    assert packed_list == other
+    assert ITEMS[2] in packed_list
+    assert packed_list.copy() == ITEMS
+    assert repr(packed_list) == 'RedisPackedList: {0}'.format(ITEMS)
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from redistypes import NumericCodec, RedisDict, RedisList
+from redistypes import pickling
+from redistypes.pickling import decode_many, dumps, dumps_many, encode_many, loads_many
+from tests.conftest import REDIS_TEST_KEY_NAME
+
+BATCHES = (
+    [0.0, -1.5, 1 / 3, float('inf'), 1e300],
+    ['', 'a', 'é' * 127, 'x' * 255],
+    ['x' * 256, 'short'],
+    ['\ud800'],
+    [0, 255, 256, -1, 2 ** 70, True],
+    ['mixed', 1.5, None, b'bytes'],
+    [],
+)
+
+
+class PlainCodec(object):
+    """Codec without batch methods."""
+
+    def dumps(self, value):
+        """Encode a number."""
+        return str(value).encode()
+
+    def loads(self, value):
+        """Decode a number."""
+        return float(value)
+
+
+class TestDumpsMany(object):
+    """Test ``dumps_many`` and ``loads_many`` functions."""
+
+    @pytest.mark.parametrize('values', BATCHES)
+    def test_same_as_dumps(self, values):
+        """Should return the same pickles as ``dumps`` of every value."""
+        encoded = dumps_many(values)
+        assert encoded == [dumps(value) for value in values]
+        assert loads_many(encoded) == values
+
+    def test_loads_broken_value(self):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            loads_many([dumps(1), b'broken'])
+
+    def test_executor(self, monkeypatch):
+        """Should split large batches into chunks processed by the executor."""
+        monkeypatch.setattr(pickling, 'PARALLEL_MIN_SIZE', 10)
+        monkeypatch.setattr(pickling, 'PARALLEL_CHUNK_SIZE', 3)
+        values = [float(index) for index in range(10)]
+        with ThreadPoolExecutor(2) as executor:
+            encoded = dumps_many(values, executor)
+            assert encoded == dumps_many(values)
+            assert loads_many(encoded, executor) == values
+
+
+class TestCodecBatches(object):
+    """Test encoding batches by codecs."""
+
+    @pytest.mark.parametrize('codec', [NumericCodec(), PlainCodec()])
+    def test_encode_many(self, codec):
+        """Should use batch methods of the codec if any, else encode values one by one."""
+        encoded = encode_many(codec, [0.5, 1.5])
+        assert encoded == [codec.dumps(0.5), codec.dumps(1.5)]
+        assert decode_many(codec, encoded) == [0.5, 1.5]
+
+    def test_bindings(self, r):
+        """Should encode and decode items of bindings by batches."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, [0.5], pickling=PlainCodec())
+        redis_list.extend([1.5, 2.5])
+        assert list(redis_list) == [0.5, 1.5, 2.5]
+        redis_dict = RedisDict(r, 'dict', {'a': 1.5, 'b': 'text'})
+        redis_dict.update({'c': None})
+        assert dict(redis_dict.items()) == {'a': 1.5, 'b': 'text', 'c': None}
+        assert sorted(redis_dict.keys()) == ['a', 'b', 'c']
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from redistypes import RedisDict, RedisList
+from redistypes.prefetch import prefetch
+from tests.conftest import REDIS_TEST_KEY_NAME
+
+ITEMS = ['item_{0}'.format(index) for index in range(10)]
+
+
+class TestPrefetch(object):
+    """Test ``prefetch`` function."""
+
+    def test_decode(self):
+        """Should yield decoded chunks in order."""
+        chunks = iter([[1, 2], [3], [4, 5]])
+        assert list(prefetch(chunks, sum, depth=1)) == [3, 3, 9]
+
+    def test_executor(self):
+        """Should decode chunks by the executor, preserving the order."""
+        with ThreadPoolExecutor(2) as executor:
+            decoded = prefetch(iter([[1, 2], [3], [4, 5]]), sum, 2, executor)
+            assert list(decoded) == [3, 3, 9]
+
+    def test_fetch_error(self):
+        """Should raise the exception of the fetching thread."""
+        def chunks():
+            yield [1]
+            raise KeyError('fetch failed')
+
+        iterator = prefetch(chunks())
+        assert next(iterator) == [1]
+        with pytest.raises(KeyError):
+            next(iterator)
+
+    def test_stop_fetching(self):
+        """Should stop the fetching thread if the iteration is closed early."""
+        fetched = []
+
+        def chunks():
+            for index in range(100):
+                fetched.append(index)
+                yield [index]
+
+        threads = threading.active_count()
+        iterator = prefetch(chunks(), depth=1)
+        assert next(iterator) == [0]
+        iterator.close()
+        for thread in threading.enumerate():
+            if thread.daemon and thread is not threading.current_thread():
+                thread.join(1)
+        assert threading.active_count() == threads
+        assert len(fetched) < 100
+
+
+class TestIterPrefetch(object):
+    """Test ``iter_prefetch`` methods of bindings."""
+
+    @pytest.mark.parametrize('pickling', [True, False])
+    def test_list(self, r, pickling):
+        """Should return all items of the list."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, ITEMS, pickling)
+        items = list(redis_list.iter_prefetch(chunk_size=3))
+        assert items == (ITEMS if pickling else [item.encode() for item in ITEMS])
+
+    def test_dict(self, r):
+        """Should return all items of the hash."""
+        mapping = dict.fromkeys(ITEMS, 1)
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, mapping)
+        with ThreadPoolExecutor(2) as executor:
+            assert dict(redis_dict.iter_prefetch(3, executor=executor)) == mapping
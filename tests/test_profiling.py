@@ -0,0 +1,84 @@
+import logging
+import threading
+
+from redistypes import RedisList
+from redistypes.profiling import NPlusOneDetector
+from tests.conftest import VAL_1
+from tests.test_redis_field import RedisTestField
+
+
+class PkField(RedisTestField):
+    """IRedisField with the key name depending on the instance."""
+
+    def get_key_name(self, instance):
+        """Return Redis key name for the attribute of the instance."""
+        return 'Model:{0}:{1}'.format(instance.pk, self.name)
+
+
+def make_model(r):
+    """Return the model class with PkField attribute."""
+    class Model(object):
+        redis_field = PkField(r)
+
+        def __init__(self, pk):
+            self.pk = pk
+
+    return Model
+
+
+def test_descriptor_in_loop(r):
+    """Should report reading the field of every instance as the N+1 pattern."""
+    model = make_model(r)
+    instances = [model(pk) for pk in range(5)]
+    with NPlusOneDetector(logger=None) as detector:
+        values = [instance.redis_field for instance in instances]
+    pattern, = detector.report()
+    assert values == [None] * 5
+    assert (pattern.binding, pattern.method, pattern.command) == ('PkField', '__get__', 'GET')
+    assert (pattern.count, pattern.keys, pattern.key_pattern) == (5, 5, 'Model:*:redis_field')
+    assert __file__.rstrip('c') in pattern.location and 'MGET' in pattern.suggestion
+
+
+def test_below_threshold(r):
+    """Should not report operations repeated less than threshold times."""
+    model = make_model(r)
+    with NPlusOneDetector(threshold=3) as detector:
+        for pk in range(2):
+            model(pk).redis_field = VAL_1
+    assert detector.report() == []
+
+
+def test_multiple_round_trips(r):
+    """Should not report operations that are already batched."""
+    with NPlusOneDetector() as detector:
+        for _ in range(5):
+            RedisList(r, 'key_name', [VAL_1, VAL_1])
+    assert detector.report() == []
+
+
+def test_other_thread(r):
+    """Should ignore operations of other threads."""
+    model = make_model(r)
+
+    def read():
+        for pk in range(5):
+            model(pk).redis_field
+
+    with NPlusOneDetector() as detector:
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+    assert detector.report() == []
+
+
+def test_logging(r, caplog):
+    """Should log detected patterns on exit, also when used as decorator."""
+    model = make_model(r)
+
+    @NPlusOneDetector()
+    def read():
+        return [model(pk).redis_field for pk in range(3)]
+
+    with caplog.at_level(logging.WARNING, logger='redistypes.profiling'):
+        read()
+    assert 'N+1 pattern: PkField.__get__ sent GET 3 times' in caplog.text
@@ -1,8 +1,10 @@
+from collections.abc import MutableMapping
+
 import pytest
 
-from redistypes import RedisDict
+from redistypes import RedisDict, TransformConflictError
 from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_3
-from tests.test_redis_dict.conftest import KEY_1, KEY_3
+from tests.test_redis_dict.conftest import KEY_1, KEY_2, KEY_3
 
 
 class TestInit(object):
@@ -93,16 +95,16 @@ class TestKeys(object):
     """Test ``keys`` method."""
 
     def test_empty_hash(self, redis_empty_dict):
-        """Should return an empty list."""
-        assert redis_empty_dict.keys() == []
+        """Should return an empty view."""
+        assert redis_empty_dict.keys() == set() and len(redis_empty_dict.keys()) == 0
 
     def test_not_empty_hash(self, redis_dict, str_dict):
         """Should have the same keys as str_dict."""
-        assert redis_dict.keys() == list(str_dict.keys())
+        assert redis_dict.keys() == str_dict.keys()
 
     def test_not_empty_hash_without_pickling(self, redis_dict_without_pickling, bytes_dict):
         """Should have the same keys as bytes_dict."""
-        assert redis_dict_without_pickling.keys() == list(bytes_dict.keys())
+        assert redis_dict_without_pickling.keys() == bytes_dict.keys()
 
 
 class TestPop(object):
@@ -131,14 +133,24 @@ class TestPop(object):
         assert redis_dict_without_pickling.pop(KEY_1) == VAL_1.encode()
 
 
-def test_popitem(redis_dict):
-    """
-    Test ``popitem`` method.
+class TestPopitem(object):
+    """Test ``popitem`` method."""
 
-    Should raise NotImplementedError.
-    """
-    with pytest.raises(NotImplementedError):
-        redis_dict.popitem()
+    def test_not_empty_hash(self, redis_dict, str_dict):
+        """Should remove and return the pairs one by one."""
+        popped = dict([redis_dict.popitem(), redis_dict.popitem()])
+        assert popped == str_dict and not redis_dict
+
+    def test_empty_hash(self, redis_empty_dict):
+        """Should raise KeyError."""
+        with pytest.raises(KeyError):
+            redis_empty_dict.popitem()
+
+    def test_without_pickling(self, redis_dict_without_pickling):
+        """Should return the pair in bytes."""
+        assert redis_dict_without_pickling.popitem() in {
+            (b'KEY_1', b'VAL_1'), (b'KEY_2', b'VAL_2'),
+        }
 
 
 class TestUpdate(object):
@@ -173,21 +185,85 @@ class TestUpdate(object):
         with pytest.raises(ValueError):
             redis_dict.update(1)
 
+    def test_pairs_and_kwargs(self, redis_dict, str_dict):
+        """Should update with pairs, then with keyword arguments."""
+        redis_dict.update([(KEY_1, VAL_3), (KEY_3, VAL_1)], KEY_3=VAL_3)
+        assert redis_dict.copy() == dict(str_dict, KEY_1=VAL_3, KEY_3=VAL_3)
+
+    def test_redis_dict(self, r, redis_dict, str_dict, another_str_dict):
+        """Should update with items of another RedisDict."""
+        redis_dict.update(RedisDict(r, 'other_key_name', another_str_dict))
+        assert redis_dict.copy() == dict(str_dict, **another_str_dict)
+
+    def test_ior(self, redis_dict, str_dict, another_str_dict):
+        """Should update the hash in place."""
+        redis_dict_before = redis_dict
+        redis_dict |= another_str_dict
+        assert redis_dict is redis_dict_before
+        assert redis_dict.copy() == dict(str_dict, **another_str_dict)
+
+    def test_isinstance(self, redis_dict):
+        """Should be registered as MutableMapping."""
+        assert isinstance(redis_dict, MutableMapping)
+
+
+class TestTransform(object):
+    """Test ``transform`` method."""
+
+    def test_transform(self, redis_dict):
+        """Should set the item to the function result without conflicts."""
+        assert redis_dict.transform(KEY_1, str.lower) == (VAL_1.lower(), 0)
+        assert redis_dict[KEY_1] == VAL_1.lower()
+
+    def test_key_does_not_exist(self, redis_dict):
+        """Should raise KeyError."""
+        with pytest.raises(KeyError):
+            redis_dict.transform(KEY_3, str.lower)
+
+    def test_key_does_not_exist_with_default(self, redis_dict):
+        """Should apply the function to the default value."""
+        assert redis_dict.transform(KEY_3, str.lower, default=VAL_3).value == VAL_3.lower()
+        assert redis_dict[KEY_3] == VAL_3.lower()
+
+    def test_without_pickling(self, redis_dict_without_pickling):
+        """Should pass the stored bytes to the function."""
+        redis_dict_without_pickling.transform(KEY_1, bytes.lower)
+        assert redis_dict_without_pickling[KEY_1] == VAL_1.lower().encode()
+
+    def test_concurrent_modification(self, r, redis_dict):
+        """Should retry the transform after the hash was modified concurrently."""
+        def fn(item):
+            if item == VAL_1:
+                RedisDict(r, REDIS_TEST_KEY_NAME)[KEY_1] = VAL_3
+            return item.lower()
+
+        assert redis_dict.transform(KEY_1, fn) == (VAL_3.lower(), 1)
+
+    def test_retries_exhausted(self, r, redis_dict):
+        """Should raise TransformConflictError with the number of conflicts."""
+        def fn(item):
+            RedisDict(r, REDIS_TEST_KEY_NAME)[KEY_3] = VAL_3
+            return item
+
+        with pytest.raises(TransformConflictError) as exc_info:
+            redis_dict.transform(KEY_1, fn, retries=0)
+        assert exc_info.value.conflicts == 1
+
 
 class TestValues(object):
     """Test ``items`` method."""
 
     def test_empty_hash(self, redis_empty_dict):
-        """Should return an empty list."""
-        assert redis_empty_dict.values() == []
+        """Should return an empty view."""
+        assert list(redis_empty_dict.values()) == []
 
     def test_not_empty_hash(self, redis_dict, str_dict):
         """Should have the same values as str_dict."""
-        assert redis_dict.values() == list(str_dict.values())
+        assert list(redis_dict.values()) == list(str_dict.values())
 
     def test_not_empty_hash_without_pickling(self, redis_dict_without_pickling, bytes_dict):
         """Should have the same values as bytes_dict."""
-        assert redis_dict_without_pickling.values() == list(bytes_dict.values())
+        assert list(redis_dict_without_pickling.values()) == list(bytes_dict.values())
 
 
 class TestSetDefault(object):
@@ -327,7 +403,7 @@ def test_iter(redis_dict):
 
     Should return keys of redis_dict.
     """
-    assert list(redis_dict) == redis_dict.keys()
+    assert list(redis_dict) == list(redis_dict.keys())
 
 
 class TestEq(object):
@@ -355,7 +431,80 @@ class TestEq(object):
         assert redis_dict == other_redis_dict and redis_dict.items() == other_redis_dict.items() \
             and redis_dict.key_name != other_redis_dict.key_name
 
+    def test_order_independent(self, r, redis_dict, str_dict):
+        """Should return True for the same items stored in another order."""
+        reversed_dict = dict(reversed(list(str_dict.items())))
+        other_redis_dict = RedisDict(r, self.OTHER_HASH_NAME, reversed_dict)
+        assert redis_dict == other_redis_dict
+
+    def test_different_values(self, r, redis_dict, str_dict):
+        """Should return False."""
+        str_dict[KEY_1] = VAL_3
+        assert redis_dict != RedisDict(r, self.OTHER_HASH_NAME, str_dict)
+
+    def test_different_codecs(self, r, redis_dict, bytes_dict):
+        """Should compare decoded items."""
+        other_redis_dict = RedisDict(r, self.OTHER_HASH_NAME, bytes_dict, pickling=False)
+        assert redis_dict != other_redis_dict
+        assert other_redis_dict == RedisDict(r, 'copy', bytes_dict, pickling=False)
+
+
+class TestDiff(object):
+    """Test ``diff`` method."""
+
+    def test_diff(self, r, redis_dict, str_dict):
+        """Should return keys of different values and keys of one hash only."""
+        str_dict[KEY_1] = VAL_3
+        del str_dict[KEY_2]
+        str_dict[KEY_3] = VAL_3
+        other_redis_dict = RedisDict(r, 'other_key_name', str_dict)
+        assert redis_dict.diff(other_redis_dict) == {KEY_1, KEY_2, KEY_3}
+        assert other_redis_dict.diff(redis_dict, chunk_size=1) == {KEY_1, KEY_2, KEY_3}
+
+    def test_no_diff(self, r, redis_dict, str_dict):
+        """Should return an empty set."""
+        assert redis_dict.diff(RedisDict(r, 'other_key_name', str_dict)) == set()
+
+    def test_different_codecs(self, r, redis_dict, str_dict):
+        """Should compare decoded keys and values."""
+        other_redis_dict = RedisDict(r, 'other_key_name', {KEY_1.encode(): VAL_1.encode()}, False)
+        assert other_redis_dict.diff(redis_dict) == {KEY_1.encode(), KEY_1, KEY_2}
+
 
 def test_repr(redis_dict, str_dict):
     """Test ``__repr__`` method."""
     assert str(redis_dict) == '{0}: {1}'.format(type(redis_dict).__name__, str_dict)
+
+
+class TestBulkAccess(object):
+    """Test ``get_many``, ``set_many``, ``delete_many`` and ``contains_many`` methods."""
+
+    def test_get_many(self, redis_dict, str_dict):
+        """Should return values of keys, ``default`` for missing ones."""
+        redis_dict[KEY_3] = None
+        values = redis_dict.get_many([KEY_1, KEY_2, KEY_3, 'missing'], default=0)
+        assert values == dict(str_dict, **{KEY_3: None, 'missing': 0})
+        assert redis_dict.get_many([]) == {}
+
+    def test_set_many(self, redis_dict, str_dict):
+        """Should set all items, returning the number of new keys."""
+        assert redis_dict.set_many({KEY_1: VAL_3, KEY_3: VAL_3}) == 1
+        assert redis_dict.set_many({}) == 0
+        assert dict(redis_dict.items()) == dict(str_dict, **{KEY_1: VAL_3, KEY_3: VAL_3})
+
+    def test_delete_many(self, redis_dict):
+        """Should remove keys, returning the number of removed ones."""
+        assert redis_dict.delete_many([KEY_1, KEY_3]) == 1
+        assert redis_dict.delete_many([]) == 0
+        assert list(redis_dict.keys()) == [KEY_2]
+
+    def test_contains_many(self, redis_dict):
+        """Should map keys to True if they are in the hash."""
+        assert redis_dict.contains_many([KEY_1, KEY_3]) == {KEY_1: True, KEY_3: False}
+
+    def test_without_pickling(self, r, bytes_dict):
+        """Should return values as they are stored."""
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, bytes_dict, pickling=False)
+        redis_dict.set_many({KEY_3: 1})
+        values = redis_dict.get_many([KEY_1, KEY_3])
+        assert values == {KEY_1: VAL_1.encode(), KEY_3: b'1'}
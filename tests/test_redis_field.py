@@ -1,7 +1,7 @@
 import pytest
 
-from redistypes import IRedisField
-from tests.conftest import VAL_1
+from redistypes import IRedisField, IRedisListField
+from tests.conftest import VAL_1, VAL_2
 
 
 class RedisTestField(IRedisField):
@@ -71,3 +71,74 @@ def test_descriptor_without_pickling(model_with_redis_field_without_pickling):
     test_object = model_with_redis_field_without_pickling()
     test_object.redis_field = VAL_1
     assert test_object.redis_field == VAL_1.encode()
+
+
+def test_transform(r, model_with_redis_field):
+    """
+    Test ``transform`` method.
+
+    Should pass None to the function when the value is not set, then the stored value.
+
+    Should retry after the value was modified concurrently.
+    """
+    test_object = model_with_redis_field()
+    descriptor = model_with_redis_field.redis_field
+    assert isinstance(descriptor, RedisTestField)
+    assert descriptor.transform(test_object, lambda value: [value]) == ([None], 0)
+    assert test_object.redis_field == [None]
+
+    def fn(value):
+        if value == [None]:
+            test_object.redis_field = VAL_1
+        return [value, VAL_2]
+
+    assert descriptor.transform(test_object, fn) == ([VAL_1, VAL_2], 1)
+    assert test_object.redis_field == [VAL_1, VAL_2]
+
+
+class TestKeyTemplate(object):
+    """Test descriptors with ``key_template``."""
+
+    def test_template(self, r):
+        """Should make key names of the class, the field and attributes of the instance."""
+        class Student(object):
+            name = IRedisField(r, key_template='{cls}:{pk}:{group.pk:03d}:{field}{{x}}')
+            subjects = IRedisListField(r, key_template='{cls}:{pk}:{field}', maxlen=2)
+
+            def __init__(self, pk, group):
+                self.pk = pk
+                self.group = group
+
+        student = Student(1, Student(2, None))
+        student.name = VAL_1
+        student.subjects = [VAL_1, VAL_2, VAL_2]
+        assert r.get('Student:1:002:name{x}') is not None
+        assert r.llen('Student:1:subjects') == 2
+
+    def test_constant(self, r):
+        """Should use the key name without attributes of the instance."""
+        class Settings(object):
+            mode = IRedisField(r, pickling=False, key_template='{cls}:{field}')
+
+        Settings().mode = VAL_1
+        assert Settings().mode == VAL_1.encode()
+
+    def test_without_template(self, r):
+        """Should raise NotImplementedError."""
+        class Model(object):
+            field = IRedisField(r)
+
+        with pytest.raises(NotImplementedError):
+            Model().field
+
+    def test_cache_key_name(self, r):
+        """Should compute the key name once per instance."""
+        class Student(object):
+            name = IRedisField(r, key_template='{cls}:{pk}:{field}', cache_key_name=True)
+
+        student = Student()
+        student.pk = 1
+        student.name = VAL_1
+        assert student.__dict__['_name_key_name'] == b'Student:1:name'
+        student.pk = 2
+        assert student.name == VAL_1 and r.get('Student:2:name') is None
@@ -1,7 +1,12 @@
+import pickle
 import pytest
 import random
+from collections.abc import MutableSequence
 
-from redistypes import RedisList
+from redis import ResponseError
+
+from redistypes import RedisList, TransformConflictError
+from redistypes.fake import FakeRedis
 from tests.conftest import (
     REDIS_TEST_KEY_NAME,
     VAL_1,
@@ -10,6 +15,14 @@ from tests.conftest import (
 )
 
 
+class FakeRedisWithoutLpos(FakeRedis):
+    """FakeRedis replying as Redis before 6.0.6 to LPOS."""
+
+    def lpos(self, name, value, rank=None, count=None, maxlen=None):
+        """Raise the error of an unknown command."""
+        raise ResponseError("unknown command 'LPOS'")
+
+
 class TestInit(object):
     """Test ``__init__`` method."""
 
@@ -30,6 +43,17 @@ class TestInit(object):
         with pytest.raises(ValueError):
             list(RedisList(r, REDIS_TEST_KEY_NAME))
 
+    def test_bind_without_validation(self, r):
+        """Should not check the type of the stored value."""
+        r.set(REDIS_TEST_KEY_NAME, 1)
+        RedisList(r, REDIS_TEST_KEY_NAME, validate=False)
+
+    def test_slots(self, redis_list):
+        """Should keep attributes in slots, without ``__dict__``."""
+        assert not hasattr(redis_list, '__dict__')
+        with pytest.raises(AttributeError):
+            redis_list.other = 1
+
     def test_bind_to_none(self, r):
         """Should be equal to empty string."""
         redis_list = RedisList(r, REDIS_TEST_KEY_NAME)
@@ -114,6 +138,18 @@ class TestExtend(object):
         bytes_list.extend([item.encode() for item in another_str_list])
         assert list(redis_list_without_pickling) == bytes_list
 
+    def test_extend_by_nothing(self, r, redis_list, str_list):
+        """Should leave the list as is instead of sending RPUSH without values."""
+        redis_list.extend([])
+        redis_list += []
+        raw_list = RedisList(r, 'raw', str_list, pickling=False)
+        raw_list.extend(iter([]))
+        capped_list = RedisList(r, 'capped', str_list, maxlen=2)
+        capped_list.extend([])
+        assert list(redis_list) == str_list
+        assert len(raw_list) == len(str_list)
+        assert list(capped_list) == str_list[-2:]
+
 
 class TestRemove(object):
     """Test ``remove`` method."""
@@ -217,6 +253,46 @@ class TestSetItem(object):
             redis_list[len(redis_list)]
 
 
+class TestTransform(object):
+    """Test ``transform`` method."""
+
+    def test_transform(self, redis_list, str_list):
+        """Should replace the item with the function result without conflicts."""
+        result = redis_list.transform(0, str.lower)
+        str_list[0] = str_list[0].lower()
+        assert result == (str_list[0], 0)
+        assert list(redis_list) == str_list
+
+    def test_index_out_of_range(self, redis_list):
+        """Should raise IndexError."""
+        with pytest.raises(IndexError):
+            redis_list.transform(len(redis_list), str.lower)
+
+    def test_concurrent_modification(self, r, redis_list):
+        """Should retry the transform after the list was modified concurrently."""
+        calls = []
+
+        def fn(item):
+            if not calls:
+                RedisList(r, REDIS_TEST_KEY_NAME).append(VAL_3)
+            calls.append(item)
+            return item.lower()
+
+        result = redis_list.transform(0, fn)
+        assert result.conflicts == 1 and len(calls) == 2
+        assert list(redis_list) == [VAL_1.lower(), VAL_2, VAL_2, VAL_3]
+
+    def test_retries_exhausted(self, r, redis_list):
+        """Should raise TransformConflictError with the number of conflicts."""
+        def fn(item):
+            RedisList(r, REDIS_TEST_KEY_NAME).append(VAL_3)
+            return item
+
+        with pytest.raises(TransformConflictError) as exc_info:
+            redis_list.transform(0, fn, retries=2, backoff=0)
+        assert exc_info.value.conflicts == 3
+
+
 class TestLen(object):
     """Test ``__len__`` method."""
 
@@ -264,6 +340,129 @@ class TestEq(object):
         assert redis_list == other_redis_list and list(redis_list) == list(other_redis_list) \
             and redis_list.key_name != other_redis_list.key_name
 
+    def test_equal_items_stored_differently(self, r, redis_list, str_list):
+        """Should compare decoded items if stored ones differ."""
+        other_redis_list = RedisList(r, self.OTHER_HASH_NAME, str_list, pickling=False)
+        assert redis_list != other_redis_list
+        r.delete(self.OTHER_HASH_NAME)
+        r.rpush(self.OTHER_HASH_NAME, *(pickle.dumps(item, protocol=2) for item in str_list))
+        assert redis_list == RedisList(r, self.OTHER_HASH_NAME)
+
+    def test_different_lengths(self, r, redis_list, str_list):
+        """Should return False without fetching items."""
+        other_redis_list = RedisList(r, self.OTHER_HASH_NAME, str_list[:-1])
+        assert redis_list != other_redis_list
+
+
+class TestCapped(object):
+    """Test lists capped by ``maxlen``."""
+
+    def test_invalid_maxlen(self, r):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            RedisList(r, REDIS_TEST_KEY_NAME, maxlen=0)
+
+    def test_trim_on_init(self, r, str_list):
+        """Should keep the last items of the iterable."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, str_list, maxlen=2)
+        assert list(redis_list) == str_list[-2:]
+
+    def test_append_and_extend(self, r):
+        """Should keep the last items."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, maxlen=3)
+        redis_list.extend([VAL_1, VAL_2])
+        redis_list.append(VAL_3)
+        redis_list.append(VAL_1)
+        assert list(redis_list) == [VAL_2, VAL_3, VAL_1]
+        redis_list.extend(range(5))
+        assert list(redis_list) == [2, 3, 4]
+
+    def test_appendleft(self, r):
+        """Should keep the first items."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1, VAL_2], maxlen=2)
+        redis_list.appendleft(VAL_3)
+        assert list(redis_list) == [VAL_3, VAL_1]
+        RedisList(r, 'uncapped', [VAL_1]).appendleft(VAL_2)
+        assert list(RedisList(r, 'uncapped')) == [VAL_2, VAL_1]
+
+    def test_last(self, r, str_list):
+        """Should return the last items."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, str_list)
+        assert redis_list.last(2) == str_list[-2:]
+        assert redis_list.last(10) == str_list and redis_list.last(0) == []
+
+
+class TestMutableSequence(object):
+    """Test methods overriding ``MutableSequence`` mixins."""
+
+    def test_isinstance(self, redis_list):
+        """Should be registered as MutableSequence."""
+        assert isinstance(redis_list, MutableSequence)
+
+    def test_search(self, redis_list, str_list):
+        """Should find items as list does."""
+        assert VAL_2 in redis_list and VAL_3 not in redis_list
+        assert redis_list.count(VAL_2) == 2 and redis_list.count(VAL_3) == 0
+        assert redis_list.index(VAL_2) == 1
+        assert redis_list.index(VAL_2, 2) == 2
+        assert redis_list.index(VAL_2, -3, -1) == 1
+        with pytest.raises(ValueError):
+            redis_list.index(VAL_1, 1)
+        assert list(reversed(redis_list)) == str_list[::-1]
+
+    def test_search_without_lpos(self, str_list):
+        """Should find items among all items if the server has no LPOS."""
+        redis_list = RedisList(FakeRedisWithoutLpos(), REDIS_TEST_KEY_NAME, str_list)
+        assert VAL_2 in redis_list and VAL_3 not in redis_list
+        assert redis_list.count(VAL_2) == 2 and redis_list.index(VAL_2) == 1
+
+    @pytest.mark.parametrize('index', [0, 1, -1, 3, 10, -10])
+    def test_insert(self, redis_list, str_list, index):
+        """Should insert the item as list does."""
+        redis_list.insert(index, VAL_3)
+        str_list.insert(index, VAL_3)
+        assert list(redis_list) == str_list
+
+    @pytest.mark.parametrize('index', [0, 1, -1, -2])
+    def test_pop_and_delete(self, redis_list, str_list, index):
+        """Should remove the item by index as list does."""
+        redis_list.append(VAL_3)
+        str_list.append(VAL_3)
+        assert redis_list.pop(index) == str_list.pop(index)
+        del redis_list[index]
+        del str_list[index]
+        assert list(redis_list) == str_list
+
+    def test_index_out_of_range(self, r, redis_list):
+        """Should raise IndexError."""
+        with pytest.raises(IndexError):
+            redis_list.pop(5)
+        with pytest.raises(IndexError):
+            del redis_list[-5]
+        with pytest.raises(IndexError):
+            del RedisList(r, 'empty_key_name')[1]
+
+    def test_reverse_and_clear(self, redis_list, str_list):
+        """Should reverse and clear the list in place."""
+        redis_list.reverse()
+        assert list(redis_list) == str_list[::-1]
+        redis_list.clear()
+        assert len(redis_list) == 0
+
+
+class TestDiff(object):
+    """Test ``diff`` method."""
+
+    def test_diff(self, r):
+        """Should return indices of different items, including the longer list ones."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, list(range(10)))
+        other = list(range(12))
+        other[3] = other[8] = None
+        other_redis_list = RedisList(r, 'other_key_name', other)
+        assert redis_list.diff(other_redis_list, chunk_size=4) == [3, 8, 10, 11]
+        assert other_redis_list.diff(redis_list, chunk_size=4) == [3, 8, 10, 11]
+        assert redis_list.diff(RedisList(r, 'copy', list(range(10)))) == []
+
 
 def test_repr(redis_list, str_list):
     """Test ``__repr__`` method."""
@@ -1,3 +1,9 @@
+import pytest
+
+from tests.conftest import VAL_3
+from tests.test_redis_list.conftest import RedisTestListField
+
+
 def test_set_empty_list(r, redis_list, model_with_redis_field):
     """Should remove existing key in Redis."""
     test_object = model_with_redis_field()
@@ -25,3 +31,46 @@ def test_set_new_value_without_pickling(
     test_object = model_with_redis_field_without_pickling()
     test_object.redis_field = str_list
     assert list(test_object.redis_field) == bytes_list
+
+
+def test_capped_list(r, str_list):
+    """Should bind capped lists."""
+    class Model(object):
+        redis_field = RedisTestListField(r, maxlen=2)
+
+    test_object = Model()
+    test_object.redis_field = str_list
+    test_object.redis_field.append(VAL_3)
+    assert list(Model().redis_field) == [str_list[-1], VAL_3]
+
+
+def test_positional_cache(r):
+    """Should take ``cache`` at the same position as other descriptors, ``maxlen`` by keyword."""
+    field = RedisTestListField(r, True, False)
+    assert field.cache is False and 'maxlen' not in field.binding_kwargs
+    with pytest.raises(TypeError):
+        RedisTestListField(r, True, True, 2)
+
+
+def test_transform(str_list, model_with_redis_field):
+    """Should transform the item of the bound list."""
+    test_object = model_with_redis_field()
+    test_object.redis_field = str_list
+    assert model_with_redis_field.redis_field.transform(test_object, 0, str.lower) == (
+        str_list[0].lower(), 0,
+    )
+    assert test_object.redis_field[0] == str_list[0].lower()
+
+
+def test_uncached(r, str_list, another_str_list):
+    """Should create a binding on every access, keeping none per instance."""
+    class Model(object):
+        redis_field = RedisTestListField(r, cache=False)
+
+    test_object = Model()
+    test_object.redis_field = str_list
+    assert list(test_object.redis_field) == str_list
+    assert test_object.redis_field is not test_object.redis_field
+    test_object.redis_field.extend(another_str_list)
+    assert list(test_object.redis_field) == str_list + another_str_list
+    assert Model.redis_field.ds_references is None
@@ -0,0 +1,50 @@
+import pytest
+
+from redistypes import RedisObject, IRedisObjectField
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2
+
+ATTR_1 = 'name'
+ATTR_2 = 'surname'
+STR_ATTRIBUTES = {ATTR_1: VAL_1, ATTR_2: VAL_2}
+
+
+class Person(object):
+    """Plain object to be stored as a hash."""
+
+    def __init__(self, name, surname):
+        """Set attributes."""
+        self.name = name
+        self.surname = surname
+
+
+@pytest.fixture
+def str_attributes():
+    """Copy of STR_ATTRIBUTES."""
+    return STR_ATTRIBUTES.copy()
+
+
+@pytest.fixture
+def redis_object(r):
+    """
+    RedisObject bonded to the hash with the attributes of Person.
+
+    RedisObject: {'name': 'VAL_1', 'surname': 'VAL_2'}
+    """
+    return RedisObject(r, REDIS_TEST_KEY_NAME, Person(**STR_ATTRIBUTES))
+
+
+class RedisTestObjectField(IRedisObjectField):
+    """IRedisObjectField implementation."""
+
+    def get_key_name(self, instance):
+        """Return Redis key name for the attribute."""
+        return REDIS_TEST_KEY_NAME
+
+
+@pytest.fixture
+def model_with_redis_object_field(r):
+    """Class with RedisObjectField attribute."""
+    class Model(object):
+        redis_field = RedisTestObjectField(r)
+
+    return Model
@@ -0,0 +1,127 @@
+from dataclasses import InitVar, dataclass
+from typing import ClassVar
+
+import pytest
+
+from redistypes import RedisDict, RedisObject
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_3
+from tests.test_redis_object.conftest import ATTR_1, ATTR_2, Person
+
+
+class TestInit(object):
+    """Test ``__init__`` method."""
+
+    def test_init_with_object(self, r, redis_object, str_attributes):
+        """Should store attributes as fields of the hash."""
+        assert RedisDict(r, REDIS_TEST_KEY_NAME).copy() == str_attributes
+
+    def test_init_with_mapping(self, r, str_attributes):
+        """Should store items of the mapping as attributes."""
+        assert RedisObject(r, REDIS_TEST_KEY_NAME, str_attributes).to_dict() == str_attributes
+
+    def test_init_with_dataclass(self, r, str_attributes):
+        """Should store fields of the dataclass, but not its ClassVar and InitVar ones."""
+        @dataclass
+        class Dataclass(object):
+            kind: ClassVar[str] = 'cls'
+            name: str
+            surname: str
+            seed: InitVar[int] = 0
+
+        redis_object = RedisObject(r, REDIS_TEST_KEY_NAME, Dataclass(**str_attributes))
+        assert redis_object.to_dict() == str_attributes
+
+    def test_init_with_object_without_attributes(self, r):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            RedisObject(r, REDIS_TEST_KEY_NAME, 1)
+
+    def test_bind_to_wrong_type(self, r):
+        """Should raise TypeError."""
+        r.set(REDIS_TEST_KEY_NAME, 1)
+        with pytest.raises(TypeError):
+            RedisObject(r, REDIS_TEST_KEY_NAME)
+
+
+class TestGetAttr(object):
+    """Test ``__getattr__`` method."""
+
+    def test_saved_attribute(self, redis_object):
+        """Should return the stored value."""
+        assert redis_object.name == VAL_1
+
+    def test_missing_attribute(self, redis_object):
+        """Should raise AttributeError."""
+        with pytest.raises(AttributeError):
+            redis_object.age
+
+    def test_dunder_attribute(self, redis_object):
+        """Should raise AttributeError without querying Redis."""
+        assert not hasattr(redis_object, '__length_hint__')
+
+
+class TestSetAttr(object):
+    """Test ``__setattr__`` and ``save`` methods."""
+
+    def test_unsaved_attribute(self, r, redis_object):
+        """Should return the changed value, while Redis keeps the stored one."""
+        redis_object.name = VAL_3
+        assert redis_object.name == VAL_3
+        assert redis_object.dirty_fields == {ATTR_1}
+        assert RedisObject(r, REDIS_TEST_KEY_NAME).name == VAL_1
+
+    def test_save(self, r, redis_object):
+        """Should write only changed fields."""
+        redis_object.name = VAL_3
+        r.hdel(REDIS_TEST_KEY_NAME, *r.hkeys(REDIS_TEST_KEY_NAME))
+        redis_object.save()
+        assert redis_object.dirty_fields == set()
+        assert RedisObject(r, REDIS_TEST_KEY_NAME).to_dict() == {ATTR_1: VAL_3}
+
+    def test_discard(self, redis_object):
+        """Should return the stored value after changes are discarded."""
+        redis_object.name = VAL_3
+        redis_object.discard()
+        assert redis_object.name == VAL_1
+
+
+class TestDelAttr(object):
+    """Test ``__delattr__`` method."""
+
+    def test_saved_attribute(self, redis_object):
+        """Should remove the field from Redis."""
+        del redis_object.name
+        assert not hasattr(redis_object, ATTR_1)
+
+    def test_unsaved_attribute(self, redis_object):
+        """Should discard the change without raising."""
+        redis_object.age = 1
+        del redis_object.age
+        assert redis_object.dirty_fields == set()
+
+    def test_missing_attribute(self, redis_object):
+        """Should raise AttributeError."""
+        with pytest.raises(AttributeError):
+            del redis_object.age
+
+
+def test_fetch(redis_object):
+    """
+    Test ``fetch`` method.
+
+    Should return existing attributes only, preferring unsaved changes.
+    """
+    redis_object.surname = VAL_3
+    assert redis_object.fetch(ATTR_1, ATTR_2, 'age') == {ATTR_1: VAL_1, ATTR_2: VAL_3}
+    assert redis_object.fetch() == {}
+
+
+def test_eq(r, redis_object, str_attributes):
+    """Test ``__eq__`` method."""
+    assert redis_object == RedisObject(r, 'other_key_name', Person(**str_attributes))
+    assert redis_object != str_attributes
+
+
+def test_repr(redis_object, str_attributes):
+    """Test ``__repr__`` method."""
+    assert str(redis_object) == 'RedisObject: {0}'.format(str_attributes)
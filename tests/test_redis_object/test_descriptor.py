@@ -0,0 +1,27 @@
+import pytest
+
+from tests.conftest import VAL_3
+from tests.test_redis_object.conftest import ATTR_1, Person
+
+
+def test_set_object(str_attributes, model_with_redis_object_field):
+    """Should store attributes of the object."""
+    test_object = model_with_redis_object_field()
+    test_object.redis_field = Person(**str_attributes)
+    assert test_object.redis_field.to_dict() == str_attributes
+
+
+def test_partial_update(r, redis_object, model_with_redis_object_field):
+    """Should keep unsaved changes between lookups and save only changed fields."""
+    test_object = model_with_redis_object_field()
+    test_object.redis_field.name = VAL_3
+    assert test_object.redis_field.dirty_fields == {ATTR_1}
+
+    test_object.redis_field.save()
+    assert redis_object.name == VAL_3
+
+
+def test_transform(model_with_redis_object_field):
+    """Should raise TypeError."""
+    with pytest.raises(TypeError):
+        model_with_redis_object_field.redis_field.transform(model_with_redis_object_field(), str)
@@ -0,0 +1,91 @@
+import pytest
+import redis
+from redis.lock import Lock
+
+from redistypes import RedisDict, RedisList
+from redistypes.fake import FakeRedis
+from redistypes.routing import ReadWriteRouter
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2
+
+
+@pytest.fixture
+def replica(request):
+    """Redis client of another database standing for the replica."""
+    if request.config.getoption('--fake-redis'):
+        yield FakeRedis()
+        return
+    client = redis.Redis(host='localhost', port=6379, db=10)
+    client.flushdb()
+    yield client
+    client.flushdb()
+    client.connection_pool.disconnect()
+
+
+class TestReadWriteRouter(object):
+    """Test ReadWriteRouter class."""
+
+    def test_unknown_consistency(self, r, replica):
+        """Should raise ValueError."""
+        with pytest.raises(ValueError):
+            ReadWriteRouter(r, replica, consistency='strong')
+
+    def test_route_reads(self, r, replica):
+        """Should read from the replica and write to the primary."""
+        router = ReadWriteRouter(r, replica)
+        redis_list = RedisList(router, REDIS_TEST_KEY_NAME, [VAL_1])
+        redis_list.append(VAL_2)
+        assert r.llen(REDIS_TEST_KEY_NAME) == 2
+        assert list(redis_list) == [] and len(redis_list) == 0
+        RedisList(replica, REDIS_TEST_KEY_NAME, [VAL_2])
+        assert redis_list[0] == VAL_2
+
+    def test_read_from_primary_after_write(self, r, replica):
+        """Should read from the primary during the window after a write."""
+        router = ReadWriteRouter(r, replica, consistency='primary', window=60)
+        redis_dict = RedisDict(router, REDIS_TEST_KEY_NAME, {})
+        assert list(redis_dict.keys()) == []
+        redis_dict[VAL_1] = VAL_2
+        assert redis_dict[VAL_1] == VAL_2 and list(redis_dict.keys()) == [VAL_1]
+        router.window = 0
+        assert list(redis_dict.keys()) == []
+
+    def test_pipeline_writes(self, r, replica):
+        """Should remember the time of executing the pipeline only if it has writes."""
+        router = ReadWriteRouter(r, replica, consistency='primary', window=60)
+        pipe = router.pipeline()
+        pipe.llen(REDIS_TEST_KEY_NAME).execute()
+        assert router._written_at is None
+        pipe.rpush(REDIS_TEST_KEY_NAME, VAL_1).llen(REDIS_TEST_KEY_NAME)
+        assert router._written_at is None
+        assert pipe.execute() == [1, 1]
+        assert router._written_at is not None
+
+    @pytest.mark.server
+    def test_other_methods(self, r, replica):
+        """Should return methods other than write commands as they are."""
+        router = ReadWriteRouter(r, replica, consistency='wait')
+        assert isinstance(router.lock(REDIS_TEST_KEY_NAME), Lock)
+        assert router.ping() is True
+        assert router._written_at is None
+
+    def test_wait(self, r, replica):
+        """Should return the result of the write command followed by WAIT."""
+        router = ReadWriteRouter(r, replica, consistency='wait', replicas=0, wait_timeout=10)
+        try:
+            assert router.rpush(REDIS_TEST_KEY_NAME, VAL_1) == 1
+        except redis.ResponseError as e:
+            pytest.skip('WAIT is not supported: {0}'.format(e))
+        assert r.lrange(REDIS_TEST_KEY_NAME, 0, -1) == [VAL_1.encode()]
+
+    def test_wait_errors(self, r, replica):
+        """Should raise errors of the write command as they are, e.g. IndexError of lists."""
+        try:
+            r.wait(0, 10)
+        except redis.ResponseError as e:
+            pytest.skip('WAIT is not supported: {0}'.format(e))
+        router = ReadWriteRouter(r, replica, consistency='wait', replicas=0, wait_timeout=10)
+        redis_list = RedisList(router, REDIS_TEST_KEY_NAME, [VAL_1])
+        with pytest.raises(IndexError):
+            redis_list[1] = VAL_2
+        with pytest.raises(redis.ResponseError, match='^WRONGTYPE'):
+            router.hset(REDIS_TEST_KEY_NAME, VAL_1, VAL_2)
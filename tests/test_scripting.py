@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from redistypes import RedisDict, RedisList
+from redistypes.scripting import FILTER_LIST
+from redistypes.fake import FakeRedis
+from tests.conftest import REDIS_TEST_KEY_NAME
+
+USERS = [
+    {'name': 'anna', 'tags': ['admin', 'dev']},
+    {'name': 'bob', 'tags': []},
+    {'name': 'annette', 'address': {'city': 'Oslo'}},
+]
+DOCUMENTS = [
+    '{"id": 1234567890123456789, "tags": [], "meta": {}, "price": 0.12345678901234567}',
+    ' { "id" : 2 , "tags" : [ "a\\"]b" , [1, {"x": "}"}] ], "n\\u0061me": "x", "id": 3 } ',
+    '{"0": "zero", "tags": ["only"]}',
+    '[10, [20, 21], {"id": 30}]',
+    'not json',
+]
+PATHS = ['id', 'tags', 'tags.0', 'tags.1.1.x', 'meta', 'price', 'name', '0', '1.0', '2.id', '5']
+
+
+@pytest.fixture
+def json_list(r):
+    """RedisList of users stored as JSON."""
+    return RedisList(r, REDIS_TEST_KEY_NAME, [json.dumps(user) for user in USERS], False)
+
+
+class TestFilterList(object):
+    """Test ``RedisList.filter`` method."""
+
+    def test_prefix_and_substring(self, r):
+        """Should return items matching both conditions in all chunks."""
+        items = ['user:{0}'.format(index) for index in range(25)] + ['group:1']
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, items, pickling=False)
+        assert redis_list.filter(prefix='user:', substring='1', chunk_size=4) == [
+            b'user:1', b'user:10', b'user:11', b'user:12', b'user:13', b'user:14',
+            b'user:15', b'user:16', b'user:17', b'user:18', b'user:19', b'user:21',
+        ]
+        assert redis_list.filter(substring='group') == [b'group:1']
+        assert len(redis_list.filter()) == len(items)
+
+    def test_projection(self, json_list):
+        """Should return decoded values at the path, skipping items without it."""
+        assert json_list.filter(path='name') == ['anna', 'bob', 'annette']
+        assert json_list.filter(substring='"ann', path='name') == ['anna', 'annette']
+        assert json_list.filter(path='tags.0') == ['admin']
+        assert json_list.filter(path='address') == [{'city': 'Oslo'}]
+
+    @pytest.mark.server
+    def test_script_cached(self, r, json_list):
+        """Should load the script once, then call it by the digest."""
+        r.script_flush()
+        json_list.filter(path='name')
+        assert r.script_exists(FILTER_LIST.sha) == [True]
+
+    @pytest.mark.server
+    def test_same_as_fallback(self, r):
+        """Should project values as sent, as the fallback does, keeping big numbers and []."""
+        redis_list = RedisList(r, REDIS_TEST_KEY_NAME, DOCUMENTS, pickling=False)
+        fake_list = RedisList(FakeRedis(), REDIS_TEST_KEY_NAME, DOCUMENTS, pickling=False)
+        for path in PATHS:
+            assert redis_list.filter(path=path) == fake_list.filter(path=path)
+        assert redis_list.filter(path='id') == [1234567890123456789, 3]
+        assert redis_list.filter(path='tags') == [[], ['a"]b', [1, {'x': '}'}]], ['only']]
+
+    def test_pickled_items(self, r):
+        """Should raise TypeError."""
+        with pytest.raises(TypeError):
+            RedisList(r, REDIS_TEST_KEY_NAME, ['item']).filter(prefix='i')
+
+
+class TestFilterDict(object):
+    """Test ``RedisDict.filter`` method."""
+
+    def test_prefix(self, r):
+        """Should return items with matching keys in all chunks."""
+        mapping = {'user:{0}'.format(index): index for index in range(25)}
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, dict(mapping, other=1), pickling=False)
+        assert redis_dict.filter(prefix='user:', chunk_size=4) == {
+            key.encode(): str(value).encode() for key, value in mapping.items()
+        }
+        assert redis_dict.filter(substring=':2') == {
+            b'user:2': b'2', b'user:20': b'20', b'user:21': b'21', b'user:22': b'22',
+            b'user:23': b'23', b'user:24': b'24',
+        }
+
+    def test_projection(self, r):
+        """Should return decoded values at the path."""
+        mapping = {user['name']: json.dumps(user) for user in USERS}
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, mapping, pickling=False)
+        assert redis_dict.filter(prefix='ann', path='address.city') == {b'annette': 'Oslo'}
+
+    @pytest.mark.server
+    def test_same_as_fallback(self, r):
+        """Should project values as sent, as the fallback does."""
+        mapping = {str(index): document for index, document in enumerate(DOCUMENTS)}
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, mapping, pickling=False)
+        fake_dict = RedisDict(FakeRedis(), REDIS_TEST_KEY_NAME, mapping, pickling=False)
+        for path in PATHS:
+            assert redis_dict.filter(path=path) == fake_dict.filter(path=path)
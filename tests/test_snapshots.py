@@ -0,0 +1,82 @@
+import pytest
+
+from redistypes import RedisDict, RedisList
+from redistypes.snapshots import RedisDictSnapshot, RedisListSnapshot
+from tests.conftest import REDIS_TEST_KEY_NAME, VAL_1, VAL_2, VAL_3
+
+ITEMS = ['item_{0}'.format(index) for index in range(10)]
+
+
+@pytest.fixture
+def redis_list(r):
+    """RedisList of ten items."""
+    return RedisList(r, REDIS_TEST_KEY_NAME, ITEMS)
+
+
+class TestRedisListSnapshot(object):
+    """Test RedisListSnapshot class."""
+
+    def test_read_locally(self, r, redis_list):
+        """Should serve reads from the snapshot, ignoring changes in Redis."""
+        snapshot = redis_list.snapshot(chunk_size=3)
+        r.delete(REDIS_TEST_KEY_NAME)
+        assert isinstance(snapshot, RedisListSnapshot)
+        assert list(snapshot) == ITEMS and len(snapshot) == len(ITEMS)
+        assert snapshot[-1] == ITEMS[-1] and snapshot[2:5] == ITEMS[2:5]
+        assert ITEMS[4] in snapshot and snapshot.index(ITEMS[4]) == 4
+        assert snapshot == ITEMS
+
+    def test_without_pickling(self, r):
+        """Should keep items as bytes."""
+        snapshot = RedisList(r, REDIS_TEST_KEY_NAME, [VAL_1], pickling=False).snapshot()
+        assert list(snapshot) == [VAL_1.encode()]
+
+    def test_refresh_appended(self, r, redis_list):
+        """Should fetch only items appended since the snapshot was taken."""
+        snapshot = redis_list.snapshot(chunk_size=4)
+        redis_list.extend([VAL_1, VAL_2])
+        r.lset(REDIS_TEST_KEY_NAME, 0, redis_list[1])
+        snapshot.refresh()
+        assert list(snapshot) == ITEMS + [VAL_1, VAL_2]
+
+    def test_refresh_shortened(self, redis_list):
+        """Should fetch the whole list if it got shorter."""
+        snapshot = redis_list.snapshot()
+        redis_list.pop()
+        redis_list[0] = VAL_3
+        snapshot.refresh()
+        assert list(snapshot) == [VAL_3] + ITEMS[1:-1]
+
+    def test_refresh_full(self, redis_list):
+        """Should fetch the whole list."""
+        snapshot = redis_list.snapshot()
+        redis_list[0] = VAL_3
+        snapshot.refresh(full=True)
+        assert list(snapshot) == [VAL_3] + ITEMS[1:]
+
+    def test_empty_list(self, r):
+        """Should be empty."""
+        assert list(RedisList(r, REDIS_TEST_KEY_NAME).snapshot()) == []
+
+
+class TestRedisDictSnapshot(object):
+    """Test RedisDictSnapshot class."""
+
+    def test_read_locally(self, r):
+        """Should serve reads from the snapshot, ignoring changes in Redis."""
+        mapping = dict(zip(ITEMS, range(len(ITEMS))))
+        snapshot = RedisDict(r, REDIS_TEST_KEY_NAME, mapping).snapshot(chunk_size=3)
+        r.delete(REDIS_TEST_KEY_NAME)
+        assert isinstance(snapshot, RedisDictSnapshot)
+        assert dict(snapshot) == mapping and len(snapshot) == len(mapping)
+        assert snapshot[ITEMS[0]] == 0 and ITEMS[1] in snapshot
+        assert snapshot.get(VAL_1) is None and snapshot == mapping
+
+    def test_refresh(self, r):
+        """Should fetch the hash again."""
+        redis_dict = RedisDict(r, REDIS_TEST_KEY_NAME, {VAL_1: VAL_2}, pickling=False)
+        snapshot = redis_dict.snapshot()
+        redis_dict.clear()
+        redis_dict[VAL_2] = VAL_3
+        snapshot.refresh()
+        assert dict(snapshot) == {VAL_2.encode(): VAL_3.encode()}
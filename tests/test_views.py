@@ -0,0 +1,86 @@
+import pytest
+
+from redistypes import RedisDict, views
+from redistypes.views import RedisDictItemsView, RedisDictKeysView, RedisDictValuesView
+from tests.conftest import REDIS_TEST_KEY_NAME
+
+MAPPING = {'key_{0}'.format(index): index for index in range(10)}
+
+
+@pytest.fixture
+def redis_dict(r):
+    """RedisDict bound to MAPPING."""
+    return RedisDict(r, REDIS_TEST_KEY_NAME, MAPPING)
+
+
+@pytest.fixture
+def unscannable(redis_dict, monkeypatch):
+    """RedisDict failing if the whole hash is fetched."""
+    def fail(binding, chunk_size):
+        raise AssertionError('the hash is fetched')
+
+    monkeypatch.setattr(views, 'iter_hash_chunks', fail)
+    return redis_dict
+
+
+class TestKeysView(object):
+    """Test ``RedisDictKeysView``."""
+
+    def test_lazy(self, unscannable):
+        """Should make lookups without fetching the hash."""
+        keys = unscannable.keys()
+        assert isinstance(keys, RedisDictKeysView)
+        assert len(keys) == len(MAPPING)
+        assert 'key_1' in keys and 'other' not in keys
+        assert keys & {'key_1', 'other'} == {'key_1'}
+        assert ['key_1', 'other'] - keys == {'other'}
+        assert iter(['key_1', 'other']) - keys == {'other'}
+        assert iter(['key_1', 'other']) & keys == {'key_1'}
+        assert keys.isdisjoint(['other']) and not keys.isdisjoint(['key_1'])
+        assert keys >= {'key_1', 'key_2'} and not keys >= {'other'}
+
+    def test_iterate(self, redis_dict):
+        """Should return all keys."""
+        assert sorted(redis_dict.keys()) == sorted(MAPPING)
+
+    def test_set_operations(self, r, redis_dict):
+        """Should return the same sets as dict views."""
+        keys = redis_dict.keys()
+        other = {'key_1': 1, 'other': 2}
+        assert keys == MAPPING.keys() and keys != other.keys()
+        assert keys | other.keys() == MAPPING.keys() | other.keys()
+        assert keys ^ other.keys() == MAPPING.keys() ^ other.keys()
+        assert keys - other.keys() == MAPPING.keys() - other.keys()
+        assert keys > {'key_1'} and {'key_1'} < keys and keys <= MAPPING.keys()
+        assert keys == RedisDict(r, 'other_key_name', MAPPING).keys()
+        assert keys <= RedisDict(r, 'bigger_key_name', dict(MAPPING, other=1)).keys()
+
+
+class TestItemsView(object):
+    """Test ``RedisDictItemsView``."""
+
+    def test_lazy(self, unscannable):
+        """Should make lookups without fetching the hash."""
+        items = unscannable.items()
+        assert isinstance(items, RedisDictItemsView)
+        assert len(items) == len(MAPPING)
+        assert ('key_1', 1) in items and ('key_1', 2) not in items and 'key_1' not in items
+        assert items & {('key_1', 1), ('key_2', 0), ('other', 0)} == {('key_1', 1)}
+        assert iter([('key_1', 1), ('key_2', 0)]) - items == {('key_2', 0)}
+
+    def test_iterate(self, redis_dict):
+        """Should return all items."""
+        assert dict(redis_dict.items()) == MAPPING
+        assert redis_dict.items() == MAPPING.items()
+
+
+class TestValuesView(object):
+    """Test ``RedisDictValuesView``."""
+
+    def test_values(self, redis_dict):
+        """Should return all values."""
+        values = redis_dict.values()
+        assert isinstance(values, RedisDictValuesView)
+        assert len(values) == len(MAPPING)
+        assert sorted(values) == sorted(MAPPING.values())
+        assert 1 in values and 'other' not in values